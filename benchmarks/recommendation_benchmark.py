@@ -0,0 +1,230 @@
+"""
+쿠폰 추천(infer / GRPORecommendationAgent) 벤치마크.
+
+쿠폰 수와 고정 일정 수를 바꿔 가며 가상의 사용자를 만들고, 단계별 시간(feature 추출, 모델 추론,
+빈 시간대 배정)과 전체 시간(infer, infer_many)을 따로 잰다. 지명 사전은 임시 파일로 만든 가상 지명을,
+모델은 seed 로 초기화한 GRPOModel 을 쓰므로 체크포인트/네트워크 없이 실행된다.
+
+    python -m benchmarks.recommendation_benchmark --coupons 10 100 1000 --events 10 100 --output bench.json
+    python -m benchmarks.recommendation_benchmark --runtime torch --users 50 --repeat 10
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+
+FIXED_CATEGORIES = ["엔터테인먼트", "교통", "약속"]
+BRANDS = ["스타벅스", "배스킨라빈스", "CU", "GS25", "메가커피", "투썸플레이스", "올리브영", "버거킹"]
+COUPON_TYPES = ["기프티콘", "교환권", "금액권", "할인권"]
+WORDS = ["아메리카노", "라떼", "케이크", "파인트", "버거", "세트", "콘서트", "뮤지컬", "기차", "고속버스", "저녁", "회의"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark coupon recommendation stages with synthetic calendars")
+    parser.add_argument("--coupons", type=int, nargs="+", default=[10, 100, 1000], help="사용자당 쿠폰 수")
+    parser.add_argument("--events", type=int, nargs="+", default=[10, 100], help="사용자당 고정 일정 수")
+    parser.add_argument("--users", type=int, default=20, help="infer_many 에 한 번에 넣는 사용자 수")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--places", type=int, default=1000, help="가상 지명 사전 크기")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--runtime", choices=["numpy", "torch"], default="numpy")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 을 저장할 경로")
+    return parser.parse_args()
+
+
+def make_places(count: int, rng: np.random.Generator) -> list[tuple[str, float, float]]:
+    """ 한반도 범위의 가상 지명 (이름, 위도, 경도) """
+    lats = rng.uniform(33.0, 38.5, size=count)
+    lons = rng.uniform(124.5, 131.0, size=count)
+    return [(f"장소{i}역", float(lat), float(lon)) for i, (lat, lon) in enumerate(zip(lats, lons))]
+
+
+def write_gazetteer(places: list[tuple[str, float, float]], directory: str) -> str:
+    path = os.path.join(directory, "gazetteer.tsv")
+    with open(path, "w", encoding="utf-8") as f:
+        for name, lat, lon in places:
+            f.write(f"{name}\t{lat}\t{lon}\t{name[:-1]}\n")
+    return path
+
+
+def make_user(
+        index: int,
+        coupons: int,
+        events: int,
+        days: int,
+        places: list[tuple[str, float, float]],
+        rng: np.random.Generator,
+) -> dict:
+    """ infer 에 넣는 형식({카테고리: [일정, ...]}) 의 가상 사용자. 날짜는 오늘부터 days 일 안에 고르게 퍼진다 """
+    today = datetime.date.today()
+
+    def date() -> str:
+        return (today + datetime.timedelta(days=int(rng.integers(1, days + 1)))).isoformat()
+
+    def time_of_day() -> str:
+        return f"{int(rng.integers(8, 23)):02d}:{int(rng.choice([0, 15, 30, 45])):02d}"
+
+    def text(size: int) -> str:
+        return " ".join(rng.choice(WORDS, size=size))
+
+    def place() -> str:
+        return places[int(rng.integers(len(places)))][0]
+
+    data = {"쿠폰": [
+        {
+            "id": f"u{index}-c{i}",
+            "category": "쿠폰",
+            "title": f"{text(2)} {i}",
+            "brand": str(rng.choice(BRANDS)),
+            "type": str(rng.choice(COUPON_TYPES)),
+            "code": str(rng.integers(10 ** 11, 10 ** 12)),
+            "description": text(4),
+            "date": date(),
+            "time": "",
+        }
+        for i in range(coupons)
+    ]}
+    for i in range(events):
+        category = FIXED_CATEGORIES[i % len(FIXED_CATEGORIES)]
+        event = {
+            "id": f"u{index}-e{i}",
+            "category": category,
+            "title": text(2),
+            "description": text(3),
+            "date": date(),
+            "time": time_of_day(),
+        }
+        if category == "교통":
+            event.update(from_location=place(), to_location=place())
+        else:
+            event["location"] = place()
+        data.setdefault(category, []).append(event)
+    return data
+
+
+class StaticModel:
+    """ RecommendationModel 대신 infer 에 넘기는 고정 모델 (파일 확인/다시 읽기 없음) """
+
+    def __init__(self, model, feature_extractor):
+        self.model = model
+        self.feature_extractor = feature_extractor
+
+    def get(self):
+        return self.model
+
+
+def build_model(runtime: str, seed: int):
+    import torch
+    from utils.reco3 import GRPOModel
+    from utils.reco_runtime import NumpyGRPOModel
+
+    torch.manual_seed(seed)
+    model = GRPOModel(total_input_dim=57, hidden_dim=32).eval()
+    if runtime == "numpy":
+        return NumpyGRPOModel({name: tensor.numpy() for name, tensor in model.state_dict().items()})
+    return model
+
+
+def measure(fn, repeat: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return {
+        "mean_ms": round(statistics.mean(timings) * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+        "max_ms": round(max(timings) * 1000, 3),
+    }
+
+
+def run_case(args, coupons: int, events: int, places, holder) -> dict:
+    from utils.infer import build_agent, build_events, infer, infer_many
+
+    rng = np.random.default_rng([args.seed, coupons, events])
+    users = [make_user(i, coupons, events, args.days, places, rng) for i in range(args.users)]
+    base_date = datetime.date.today()
+    end_date = base_date + datetime.timedelta(days=args.days)
+
+    # 단계별 시간은 첫 사용자 한 명 기준 (infer 한 번에 해당)
+    valid_coupons, fixed_events = build_events(users[0], base_date, end_date)
+    agent = build_agent(holder)
+    selected = agent._select_coupons(valid_coupons, base_date, set())
+    features = agent.feature_extractor.extract_features_batch(selected)
+
+    return {
+        "coupons": coupons,
+        "events": events,
+        "users": args.users,
+        "recommended": len(selected),
+        "stages": {
+            "feature_extraction": measure(
+                lambda: agent.feature_extractor.extract_features_batch(selected), args.repeat, args.warmup),
+            "inference": measure(lambda: agent._forward(features), args.repeat, args.warmup),
+            "slot_assignment": measure(
+                lambda: agent._recommended_times(selected, fixed_events), args.repeat, args.warmup),
+        },
+        "infer": measure(lambda: infer(users[0], args.days, holder), args.repeat, args.warmup),
+        "infer_many": measure(lambda: infer_many(users, args.days, holder), args.repeat, args.warmup),
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run(args) -> dict:
+    import torch
+    from utils.gazetteer import Gazetteer
+    from utils.reco3 import FeatureExtractor
+
+    places = make_places(args.places, np.random.default_rng(args.seed))
+    with tempfile.TemporaryDirectory(prefix="recommendation_benchmark_") as directory:
+        feature_extractor = FeatureExtractor()
+        feature_extractor.gazetteer = Gazetteer(path=write_gazetteer(places, directory))
+    holder = StaticModel(build_model(args.runtime, args.seed), feature_extractor)
+
+    cases = [run_case(args, coupons, events, places, holder) for coupons in args.coupons for events in args.events]
+    return {
+        "timestamp": datetime.datetime.now().isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "torch": torch.__version__,
+        "runtime": args.runtime,
+        "days": args.days,
+        "places": args.places,
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "cases": cases,
+    }
+
+
+def main():
+    args = parse_args()
+    result = run(args)
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    main()
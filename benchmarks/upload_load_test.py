@@ -0,0 +1,161 @@
+"""
+POST /screenshot/upload 부하 테스트.
+
+기본은 프로세스 안에서 앱을 띄우고 ReplayAIBackend(녹화된 분석 결과)와 로컬 저장소를 사용하므로
+Azure OpenAI / Blob Storage / DB 없이 실행된다. 카테고리 조회만 메모리 구현으로 바꾼다.
+
+    python -m benchmarks.upload_load_test --requests 200 --concurrency 20 --latency 2 --jitter 0.5
+    python -m benchmarks.upload_load_test --base-url http://localhost:8000 --token <JWT>   # 실행 중인 서버
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+DEFAULT_IMAGES = sorted(glob.glob("capture/*.jpg")) + sorted(
+    glob.glob("testdata/*.webp") + glob.glob("testdata/*.jpeg")
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load test for POST /screenshot/upload")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--images", nargs="*", default=DEFAULT_IMAGES)
+    parser.add_argument("--latency", type=float, default=1.0, help="replay 백엔드의 모델 응답 시간 (초)")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--with-cache", action="store_true", help="분석 결과 캐시(DB)를 거치도록 한다")
+    parser.add_argument("--base-url", help="실행 중인 서버에 요청한다 (이 경우 replay 옵션은 서버 설정을 따른다)")
+    parser.add_argument("--token", help="--base-url 사용 시 Bearer 토큰")
+    parser.add_argument("--output", help="결과 JSON 을 저장할 경로")
+    return parser.parse_args()
+
+
+def build_local_app(args):
+    """ replay 백엔드와 로컬 저장소로 screenshot 라우터만 띄운다 """
+    os.environ.update({
+        "AI_BACKEND": "replay",
+        "AI_REPLAY_LATENCY_SECONDS": str(args.latency),
+        "AI_REPLAY_LATENCY_JITTER_SECONDS": str(args.jitter),
+        "AI_REPLAY_ERROR_RATE": str(args.error_rate),
+        "AI_REPLAY_SEED": str(args.seed),
+        "STORAGE_BACKEND": "local",
+        "LOCAL_STORAGE_ROOT": tempfile.mkdtemp(prefix="upload_load_test_blobs_"),
+    })
+
+    from dependency_injector import providers
+    from fastapi import FastAPI
+    from category.domain.category import Category
+    from common.auth import CurrentUser, Role, get_current_user
+    from containers import Container
+    from screenshot.interface.controllers.screenshot_controller import router
+
+    class InMemoryCategoryRepository:
+        def find_by_name(self, category_name):
+            if not category_name:
+                return None
+            return Category(id=category_name, name=category_name, created_at=None, updated_at=None, screenshot=[])
+
+    container = Container()
+    container.category_repo.override(providers.Factory(InMemoryCategoryRepository))
+    if not args.with_cache:
+        container.ai_module.override(container.ai_backend)
+
+    os.makedirs("temp", exist_ok=True)
+    app = FastAPI()
+    app.container = container
+    app.include_router(router)
+    app.dependency_overrides[get_current_user] = lambda: CurrentUser(id="load-test-user", role=Role.USER)
+    return app
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+
+async def run(args) -> dict:
+    import httpx
+
+    if args.base_url:
+        headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+        client = httpx.AsyncClient(base_url=args.base_url, headers=headers, timeout=120)
+        mode = "remote"
+    else:
+        transport = httpx.ASGITransport(app=build_local_app(args), raise_app_exceptions=False)
+        client = httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=120)
+        mode = "in-process"
+
+    images = [(os.path.basename(path), open(path, "rb").read()) for path in args.images]
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies, errors = [], {}
+
+    async def upload(i: int):
+        filename, content = images[i % len(images)]
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await client.post("/screenshot/upload", files={"file": (filename, content)})
+                status = response.status_code
+            except Exception as e:
+                status = type(e).__name__
+            elapsed = time.perf_counter() - started
+        if status == 200:
+            latencies.append(elapsed)
+        else:
+            errors[str(status)] = errors.get(str(status), 0) + 1
+
+    async with client:
+        started = time.perf_counter()
+        await asyncio.gather(*(upload(i) for i in range(args.requests)))
+        wall = time.perf_counter() - started
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "mode": mode,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "images": len(images),
+        "replay": None if args.base_url else {
+            "latency_seconds": args.latency,
+            "jitter_seconds": args.jitter,
+            "error_rate": args.error_rate,
+            "seed": args.seed,
+            "analysis_cache": args.with_cache,
+        },
+        "ok": len(latencies),
+        "errors": errors,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "latency_ms": {
+            "mean": round(statistics.mean(latencies) * 1000, 1) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50) * 1000, 1),
+            "p90": round(percentile(latencies, 90) * 1000, 1),
+            "p99": round(percentile(latencies, 99) * 1000, 1),
+            "max": round(max(latencies, default=0.0) * 1000, 1),
+        },
+    }
+
+
+def main():
+    args = parse_args()
+    result = asyncio.run(run(args))
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
+import socket
 from functools import lru_cache
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -22,6 +24,59 @@ class Settings(BaseSettings):
     gpt_audio_key: str
     gpt_audio_api: str
 
+    ai_backend: str = "azure"  # azure, replay(오프라인 fixture), record(azure 호출 결과를 fixture 로 기록)
+    ai_replay_fixtures: str = "testdata/ai_fixtures.json"
+    ai_replay_latency_seconds: float = 0.0
+    ai_replay_latency_jitter_seconds: float = 0.0
+    ai_replay_error_rate: float = 0.0
+    ai_replay_seed: int | None = None
+    storage_backend: str = "azure"  # azure, local
+    local_storage_root: str = "local_blobs"
+
+    openai_max_connections: int = 64
+    openai_max_keepalive_connections: int = 32
+    openai_keepalive_expiry_seconds: float = 60
+    openai_connect_timeout_seconds: float = 5
+    openai_timeout_seconds: float = 60
+
+    scratch_root: str = "temp"  # tmpfs 경로(/dev/shm/...)로 바꿀 수 있다
+    scratch_max_bytes: int = 100 * 1024 * 1024  # 요청 하나가 저장할 수 있는 업로드 용량
+    scratch_max_age_seconds: int = 60 * 60
+
+    upload_pipeline_workers: int = 16
+    upload_timeout_seconds: int = 60  # 작업(blob 저장, 분석)마다 실행을 시작한 뒤부터
+    upload_queue_timeout_seconds: int = 30  # 풀이 꽉 차서 작업이 시작하지 못하고 기다릴 수 있는 시간
+    upload_batch_concurrency: int = 8
+    upload_batch_max_files: int = 50
+    analysis_job_workers: int = 8
+    # 분석 작업을 실행하는 인스턴스 이름. 재시작해도 같고 동시에 떠 있는 프로세스끼리는 달라야 한다
+    # (기본은 호스트 이름. 한 호스트에서 여러 프로세스를 띄우면 INSTANCE_ID 를 따로 지정한다)
+    instance_id: str = Field(default_factory=socket.gethostname)
+    analysis_cache_ttl_hours: int = 24 * 30
+    vision_image_max_edge: int = 2048
+    vision_image_min_edge: int = 1280
+    vision_image_max_bytes: int = 1_000_000
+    audio_sample_rate: int = 16000
+
+    recommendation_model_path: str = "models/grpo_recommendation_model.pth"
+    recommendation_model_check_interval_seconds: float = 5  # 체크포인트 파일 변경을 확인하는 주기
+    recommendation_runtime: str = "numpy"  # numpy(.npz, utils.reco_runtime), torch(.pth)
+    gazetteer_path: str = "models/gazetteer.tsv"
+    recommendation_cache_max_entries: int = 10000
+    recommendation_precompute_days: int = 30
+    recommendation_precompute_chunk_size: int = 100
+    recommendation_precompute_hour: int = 4  # 워커가 매일 이 시각(서버 기준)에 미리 계산한다
+
+    notification_batch_size: int = 500
+    notification_max_concurrency: int = 16
+    notification_max_attempts: int = 5
+    notification_retry_base_seconds: int = 30
+    notification_retry_max_seconds: int = 3600
+    notification_coalesce_window_seconds: int = 600
+    notification_coalesce_categories: list[str] = ["쿠폰"]
+    notification_archive_after_days: int = 30
+    notification_archive_batch_size: int = 1000
+
 
 @lru_cache
 def get_settings():
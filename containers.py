@@ -4,13 +4,24 @@ from user.infra.repository.user_repo import UserRepository
 from user.application.user_service import UserService
 from screenshot.infra.repository.screenshot_repo import ScreenshotRepository
 from screenshot.application.screenshot_service import ScreenshotService
+from screenshot.infra.repository.image_analysis_cache_repo import ImageAnalysisCacheRepository
+from screenshot.application.image_analysis_cache import ImageAnalysisCache
+from screenshot.infra.repository.analysis_job_repo import AnalysisJobRepository
+from screenshot.application.analysis_job_service import AnalysisJobService
 from notification.infra.repository.notification_repo import NotificationRepository
 from notification.application.notification_service import NotificationService
 from category.infra.repository.category_repo import CategoryRepository
 from category.application.category_service import CategoryService
 from recommendation.application.recommendation_service import RecommendationService
+from recommendation.application.recommendation_cache import RecommendationCache
+from recommendation.infra.repository.recommendation_repo import RecommendationRepository
 
+from screenshot.infra.storage.azure_blob import AzureBlobStorage
+from screenshot.infra.storage.local_storage import LocalBlobStorage
+from config import get_settings
 from utils.ai import AImodule
+from utils.ai_replay import ReplayAIBackend, RecordingAIBackend
+from utils.reco_model import RecommendationModel
 
 
 
@@ -28,14 +39,48 @@ class Container(containers.DeclarativeContainer):
     category_repo = providers.Factory(CategoryRepository)
     category_service = providers.Factory(CategoryService, category_repo=category_repo)
     
-    ai_module = providers.Factory(AImodule)
+    ai_backend = providers.Selector(
+        lambda: get_settings().ai_backend,
+        azure=providers.Factory(AImodule),
+        replay=providers.Singleton(ReplayAIBackend),
+        record=providers.Singleton(RecordingAIBackend, ai_module=providers.Factory(AImodule)),
+    )
+    image_analysis_cache_repo = providers.Factory(ImageAnalysisCacheRepository)
+    ai_module = providers.Factory(
+        ImageAnalysisCache,
+        ai_module=ai_backend,
+        cache_repo=image_analysis_cache_repo,
+    )
+    storage = providers.Selector(
+        lambda: get_settings().storage_backend,
+        azure=providers.Factory(AzureBlobStorage),
+        local=providers.Factory(LocalBlobStorage),
+    )
+    recommendation_cache = providers.Singleton(RecommendationCache)
     screenshot_repo = providers.Factory(ScreenshotRepository)
     screenshot_service = providers.Factory(
         ScreenshotService,
         notification_repo=notification_repo,
         screenshot_repo=screenshot_repo,
         category_repo=category_repo,
-        ai_module=ai_module
+        ai_module=ai_module,
+        storage=storage,
+        recommendation_cache=recommendation_cache,
+    )
+    analysis_job_repo = providers.Factory(AnalysisJobRepository)
+    analysis_job_service = providers.Factory(
+        AnalysisJobService,
+        job_repo=analysis_job_repo,
+        screenshot_service=screenshot_service,
+        user_repo=user_repo,
     )
 
-    recommendation_service = providers.Factory(RecommendationService, screenshot_repo=screenshot_repo)
+    recommendation_repo = providers.Factory(RecommendationRepository)
+    recommendation_model = providers.Singleton(RecommendationModel)
+    recommendation_service = providers.Factory(
+        RecommendationService,
+        screenshot_repo=screenshot_repo,
+        recommendation_repo=recommendation_repo,
+        recommendation_model=recommendation_model,
+        recommendation_cache=recommendation_cache,
+    )
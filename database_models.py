@@ -1,4 +1,9 @@
 import user.infra.db_models.user
 import screenshot.infra.db_models.screenshot
+import screenshot.infra.db_models.image_analysis_cache
+import screenshot.infra.db_models.analysis_job
 import notification.infra.db_models.notification
-import category.infra.db_models.category
\ No newline at end of file
+import notification.infra.db_models.notification_dead_letter
+import notification.infra.db_models.notification_history
+import category.infra.db_models.category
+import recommendation.infra.db_models.recommendation
\ No newline at end of file
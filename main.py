@@ -5,13 +5,18 @@ from containers import Container
 from user.interface.controllers.user_controller import router as user_router
 from screenshot.interface.controllers.screenshot_controller import router as screenshot_router
 from notification.interface.controllers.notification_controller import router as notification_router
+from notification.interface.controllers.metrics_controller import router as notification_metrics_router
+from screenshot.interface.controllers.metrics_controller import router as screenshot_metrics_router
 from category.interface.controllers.category_controller import router as category_router
 from recommendation.interface.controllers.recommendation_controller import router as recommendation_router
 
 from contextlib import asynccontextmanager
 
-from notification_worker import check_and_send_notifications
+from notification_worker import check_and_send_notifications, archive_sent_notifications
+from screenshot.application.image_analysis_cache import purge_expired_analysis_cache
 from utils.logger import logger
+from utils.openai_clients import close_openai_clients
+from utils.scratch import sweep_scratch_space
 
 
 
@@ -24,8 +29,14 @@ create_temp_directory()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    app.container.analysis_job_service().fail_unfinished_jobs()
+    app.container.recommendation_model().get()
     await check_and_send_notifications()
+    await archive_sent_notifications()
+    await purge_expired_analysis_cache()
+    await sweep_scratch_space()
     yield
+    await close_openai_clients()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -33,6 +44,8 @@ app.container = Container()
 app.include_router(user_router)
 app.include_router(screenshot_router)
 app.include_router(notification_router)
+app.include_router(notification_metrics_router)
+app.include_router(screenshot_metrics_router)
 app.include_router(category_router)
 app.include_router(recommendation_router)
 
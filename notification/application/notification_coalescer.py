@@ -0,0 +1,63 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import timedelta
+from notification.application.notification_service import get_digest_message
+
+
+@dataclass
+class Delivery:
+    """ 한 번의 푸시로 전송할 알림 묶음 """
+    fcm_token: str
+    message: str
+    notifications: list = field(default_factory=list)
+
+
+def coalesce_notifications(
+        pending: list,
+        window_seconds: int,
+        categories: list[str],
+) -> list[Delivery]:
+    """
+    같은 사용자의 알림 중 categories 에 속하고 알림 시간이 window_seconds 안에 모여 있는 알림을
+    하나의 요약 메시지로 묶는다. 나머지 알림은 하나씩 전송한다.
+
+    pending: (알림, FCM 토큰, 카테고리 이름, 스크린샷 제목) 목록
+    """
+    deliveries = []
+    groups = defaultdict(list)
+    for notification, fcm_token, category_name, title in pending:
+        if window_seconds > 0 and category_name in categories:
+            groups[(notification.user_id, fcm_token)].append((notification, category_name, title))
+        else:
+            deliveries.append(Delivery(fcm_token, notification.message, [notification]))
+
+    window = timedelta(seconds=window_seconds)
+    for (user_id, fcm_token), items in groups.items():
+        items.sort(key=lambda item: item[0].notification_time)
+        cluster = []
+        for item in items:
+            if cluster and item[0].notification_time - cluster[0][0].notification_time > window:
+                deliveries.append(_build_delivery(fcm_token, cluster))
+                cluster = []
+            cluster.append(item)
+        if cluster:
+            deliveries.append(_build_delivery(fcm_token, cluster))
+
+    return deliveries
+
+
+def _build_delivery(fcm_token: str, cluster: list) -> Delivery:
+    notifications = [notification for notification, _, _ in cluster]
+    if len(cluster) == 1:
+        return Delivery(fcm_token, notifications[0].message, notifications)
+
+    titles_by_category = defaultdict(list)
+    for notification, category_name, title in cluster:
+        titles_by_category[category_name].append(title)
+
+    notification_time = notifications[0].notification_time
+    message = "\n".join(
+        get_digest_message(category_name, titles, notification_time)
+        for category_name, titles in titles_by_category.items()
+    )
+    return Delivery(fcm_token, message, notifications)
@@ -0,0 +1,121 @@
+import asyncio
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable
+from notification.application.notification_service import NotificationService
+from notification.application.notification_coalescer import Delivery
+from notification.application.notification_metrics import NotificationMetrics
+from utils.logger import logger
+
+
+@dataclass
+class DispatchResult:
+    pushes: int = 0
+    sent: int = 0
+    retried: int = 0
+    dead_lettered: int = 0
+
+
+class NotificationDispatcher:
+    """
+    대기 중인 알림을 동시에 전송하는 비동기 디스패처.
+
+    - 동시에 전송하는 알림 수는 max_concurrency 로 제한한다.
+    - 일시적인 실패는 시도 횟수를 늘리고 지수 백오프(지터 포함) 후 다시 시도한다.
+    - 영구적인 실패(등록 해제된 토큰 등)나 최대 시도 횟수를 넘긴 알림은 dead-letter 로 옮긴다.
+      영구적인 실패라면 해당 FCM 토큰도 사용자에게서 제거한다.
+    """
+
+    def __init__(
+            self,
+            notification_service: NotificationService,
+            send: Callable[[str, str], object],
+            is_permanent_error: Callable[[Exception], bool],
+            max_concurrency: int = 16,
+            max_attempts: int = 5,
+            retry_base_seconds: int = 30,
+            retry_max_seconds: int = 3600,
+            metrics: NotificationMetrics | None = None,
+    ):
+        self.notification_service = notification_service
+        self.send = send
+        self.is_permanent_error = is_permanent_error
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.metrics = metrics
+
+    def backoff(self, attempts: int) -> timedelta:
+        """ attempts 번 실패한 뒤 기다릴 시간. 동시에 몰리지 않도록 [delay/2, delay] 에서 무작위로 고른다 """
+        delay = min(self.retry_max_seconds, self.retry_base_seconds * 2 ** (attempts - 1))
+        return timedelta(seconds=random.uniform(delay / 2, delay))
+
+    async def dispatch(self, deliveries: list[Delivery]) -> DispatchResult:
+        """ 알림 묶음을 전송하고 결과를 알림 단위로 집계 """
+        result = DispatchResult()
+        if not deliveries:
+            return result
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        outcomes = await asyncio.gather(
+            *(self._deliver(semaphore, delivery) for delivery in deliveries),
+            return_exceptions=True,
+        )
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                logger.error(f"Notification dispatch failed: {outcome}")
+                continue
+            result.pushes += 1
+            for status in outcome:
+                if status == "sent":
+                    result.sent += 1
+                elif status == "retried":
+                    result.retried += 1
+                elif status == "dead_lettered":
+                    result.dead_lettered += 1
+        return result
+
+    async def _deliver(self, semaphore: asyncio.Semaphore, delivery: Delivery) -> list[str]:
+        async with semaphore:
+            try:
+                await asyncio.to_thread(self.send, delivery.fcm_token, delivery.message)
+            except Exception as e:
+                if self.metrics:
+                    self.metrics.observe_push(success=False)
+                return await asyncio.to_thread(self._handle_failure, delivery, e)
+
+        await asyncio.to_thread(
+            self.notification_service.mark_notifications_as_sent,
+            [notification.id for notification in delivery.notifications],
+        )
+        if self.metrics:
+            self.metrics.observe_push(success=True)
+            for notification in delivery.notifications:
+                self.metrics.observe_sent(notification.notification_time)
+        return ["sent"] * len(delivery.notifications)
+
+    def _handle_failure(self, delivery: Delivery, error: Exception) -> list[str]:
+        reason = f"{type(error).__name__}: {error}"
+        permanent = self.is_permanent_error(error)
+        statuses = []
+        for notification in delivery.notifications:
+            attempts = (notification.attempts or 0) + 1
+            if permanent or attempts >= self.max_attempts:
+                logger.warning(f"Notification {notification.id} moved to dead-letter after {attempts} attempts: {reason}")
+                self.notification_service.move_to_dead_letter(
+                    notification.id,
+                    delivery.fcm_token,
+                    attempts,
+                    reason,
+                    prune_token=permanent,
+                )
+                statuses.append("dead_lettered")
+                continue
+
+            next_attempt_at = datetime.now() + self.backoff(attempts)
+            logger.info(f"Notification {notification.id} failed (attempt {attempts}), retry at {next_attempt_at}: {reason}")
+            self.notification_service.schedule_retry(notification.id, attempts, next_attempt_at, reason)
+            statuses.append("retried")
+        return statuses
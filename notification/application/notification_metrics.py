@@ -0,0 +1,87 @@
+import threading
+from datetime import datetime
+
+
+class Histogram:
+    """ 누적이 아닌 구간별 카운트를 가지는 단순 히스토그램 """
+
+    def __init__(self, bounds: list[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # 마지막 칸은 +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        index = len(self.bounds)
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        labels = [f"le_{bound:g}" for bound in self.bounds] + ["le_inf"]
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "count": self.count,
+            "sum": round(self.sum, 3),
+        }
+
+
+class NotificationMetrics:
+    """
+    알림 워커의 전송 지표 (프로세스 단위).
+    워커가 API 프로세스 안에서 돌기 때문에 같은 프로세스의 admin 엔드포인트에서 조회할 수 있다.
+    """
+
+    LATENCY_BOUNDS = [1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600]
+    BATCH_SIZE_BOUNDS = [0, 1, 5, 10, 50, 100, 500, 1000]
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.latency = Histogram(self.LATENCY_BOUNDS)  # notification_time -> 전송 완료 (초)
+        self.batch_size = Histogram(self.BATCH_SIZE_BOUNDS)  # 한 번의 폴링에서 가져온 알림 수
+        self.fcm_success = 0
+        self.fcm_failure = 0
+        self.queue_depth = 0  # 시간이 지났지만 아직 전송되지 않은 알림 수
+        self.ticks = 0
+        self.last_tick_at = None
+
+    def observe_tick(self, batch_size: int, queue_depth: int):
+        with self.lock:
+            self.ticks += 1
+            self.last_tick_at = datetime.now()
+            self.batch_size.observe(batch_size)
+            self.queue_depth = queue_depth
+
+    def observe_push(self, success: bool):
+        with self.lock:
+            if success:
+                self.fcm_success += 1
+            else:
+                self.fcm_failure += 1
+
+    def observe_sent(self, notification_time: datetime):
+        now = datetime.now(notification_time.tzinfo) if notification_time.tzinfo else datetime.now()
+        with self.lock:
+            self.latency.observe(max(0.0, (now - notification_time).total_seconds()))
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {
+                "ticks": self.ticks,
+                "last_tick_at": self.last_tick_at,
+                "queue_depth": self.queue_depth,
+                "fcm_success": self.fcm_success,
+                "fcm_failure": self.fcm_failure,
+                "batch_size": self.batch_size.snapshot(),
+                "latency_seconds": self.latency.snapshot(),
+            }
+
+
+notification_metrics = NotificationMetrics()
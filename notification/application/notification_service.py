@@ -1,10 +1,44 @@
 from notification.domain.repository.notification_repo import INotificationRepository
-from datetime import datetime
+from datetime import datetime, timedelta
 from notification.domain.notification import Notification
 from ulid import ULID
 from dependency_injector.wiring import inject
 from fastapi.exceptions import HTTPException
 from utils.common import get_time_description
+import pytz
+import base64
+
+
+def get_digest_message(category_name: str, titles: list[str], notification: datetime) -> str:
+    """ 같은 카테고리의 여러 알림을 하나로 묶은 메시지 """
+    notification_with_tz = notification.astimezone(pytz.timezone('Asia/Seoul'))
+    noti_date = datetime.strftime(notification_with_tz, '%m-%d %H:%M')
+    names = ", ".join(title for title in titles[:3] if title)
+    rest = f" 외 {len(titles) - 3}건" if len(titles) > 3 else ""
+    summary = f": {names}{rest}" if names else ""
+    if category_name == '쿠폰':
+        res = f"쿠폰 {len(titles)}개 {noti_date} 만료{summary}"
+    elif category_name == '교통':
+        res = f"교통 일정 {len(titles)}건 {noti_date} 탑승{summary}"
+    elif category_name == '엔터테인먼트':
+        res = f"관람 일정 {len(titles)}건 {noti_date} 시작{summary}"
+    else:
+        res = f"특별한 일정 {len(titles)}건이 {noti_date}에 있습니다{summary}"
+    return res
+
+
+def encode_cursor(notification: Notification) -> str:
+    """ 다음 페이지를 가리키는 커서 ((notification_time, id) 기준) """
+    raw = f"{notification.notification_time.isoformat()}|{notification.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        notification_time, notification_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(notification_time), notification_id
+    except Exception:
+        raise HTTPException(status_code=422, detail="Invalid cursor")
 
 
 class NotificationService:
@@ -29,13 +63,22 @@ class NotificationService:
         self.repo.save(user_id, notification)
         return notification
 
-    def get_notifications(self, user_id: str, page: int, items_per_page: int):
-        """ 사용자의 모든 알림 조회 (페이징) """
-        return self.repo.get_notifications(user_id, page, items_per_page)
+    def get_notifications(
+            self,
+            user_id: str,
+            page: int,
+            items_per_page: int,
+            include_history: bool = False,
+            cursor: str | None = None,
+            with_count: bool = True,
+    ):
+        """ 사용자의 모든 알림 조회 (페이징). cursor 가 있으면 page 대신 커서 다음부터 조회 """
+        after = decode_cursor(cursor) if cursor else None
+        return self.repo.get_notifications(user_id, page, items_per_page, include_history, after, with_count)
 
-    def get_notification(self, user_id: str, notification_id: str):
+    def get_notification(self, user_id: str, notification_id: str, include_history: bool = False):
         """ 특정 알림 조회 """
-        notification = self.repo.find_by_id(user_id, notification_id)
+        notification = self.repo.find_by_id(user_id, notification_id, include_history)
         if not notification:
             raise HTTPException(status_code=422, detail="Notification not found")
         return notification
@@ -51,6 +94,27 @@ class NotificationService:
             raise HTTPException(status_code=422, detail="Notification not found")
         return noti
 
-    def get_pending_notifications(self):
+    def mark_notifications_as_sent(self, notification_ids: list[str]):
+        """ 여러 알림을 한 번에 '보낸 상태'로 변경 """
+        self.repo.mark_all_as_sent(notification_ids)
+
+    def get_pending_notifications(self, limit: int | None = None):
         """ 전송되지 않은 알림 조회 """
-        return self.repo.get_pending_notifications()
\ No newline at end of file
+        return self.repo.get_pending_notifications(limit)
+
+    def count_pending_notifications(self) -> int:
+        """ 전송이 밀려 있는 알림 수 """
+        return self.repo.count_pending_notifications()
+
+    def schedule_retry(self, notification_id: str, attempts: int, next_attempt_at: datetime, error: str):
+        """ 전송 실패한 알림을 다음 시도 시간까지 보류 """
+        self.repo.schedule_retry(notification_id, attempts, next_attempt_at, error)
+
+    def move_to_dead_letter(self, notification_id: str, fcm_token: str, attempts: int, error: str, prune_token: bool = False):
+        """ 더 이상 재시도하지 않을 알림을 dead-letter 로 이동 """
+        self.repo.move_to_dead_letter(notification_id, fcm_token, attempts, error, prune_token)
+
+    def archive_sent_notifications(self, max_age_days: int, batch_size: int) -> int:
+        """ 전송된 지 max_age_days 가 지난 알림을 보관 테이블로 이동 """
+        sent_before = datetime.now() - timedelta(days=max_age_days)
+        return self.repo.archive_sent_notifications(sent_before, batch_size)
\ No newline at end of file
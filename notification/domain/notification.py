@@ -13,6 +13,9 @@ class Notification:
     is_sent: bool
     created_at: datetime
     updated_at: datetime
+    attempts: int = 0
+    next_attempt_at: datetime | None = None
+    last_error: str | None = None
 
     user: "User" = None
     screenshot: "Screenshot" = None
\ No newline at end of file
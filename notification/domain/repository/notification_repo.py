@@ -10,11 +10,19 @@ class INotificationRepository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def get_notifications(self, user_id: str, page: int, items_per_page: int):
+    def get_notifications(
+        self,
+        user_id: str,
+        page: int,
+        items_per_page: int,
+        include_history: bool = False,
+        after: tuple[datetime, str] | None = None,
+        with_count: bool = True,
+    ):
         raise NotImplementedError
 
     @abstractmethod
-    def find_by_id(self, user_id: str, screenshot_id: str) -> Notification:
+    def find_by_id(self, user_id: str, notification_id: str, include_history: bool = False) -> Notification:
         raise NotImplementedError
 
     @abstractmethod
@@ -38,7 +46,27 @@ class INotificationRepository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def get_pending_notifications(self):
+    def get_pending_notifications(self, limit: int | None = None):
+        raise NotImplementedError
+
+    @abstractmethod
+    def count_pending_notifications(self) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def mark_all_as_sent(self, notification_ids: list[str]):
+        raise NotImplementedError
+
+    @abstractmethod
+    def schedule_retry(self, notification_id: str, attempts: int, next_attempt_at: datetime, error: str):
+        raise NotImplementedError
+
+    @abstractmethod
+    def move_to_dead_letter(self, notification_id: str, fcm_token: str, attempts: int, error: str, prune_token: bool):
+        raise NotImplementedError
+
+    @abstractmethod
+    def archive_sent_notifications(self, sent_before: datetime, batch_size: int) -> int:
         raise NotImplementedError
 
     @abstractmethod
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, func, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Integer, Index, func, Text
 from sqlalchemy.orm import relationship
 from database import Base
 from screenshot.infra.db_models.screenshot import Screenshot
@@ -12,6 +12,9 @@ class Notification(Base):
     notification_time = Column(DateTime, nullable=False)  # 알림을 보낼 시간
     is_sent = Column(Boolean, default=False)  # 알림 전송 여부
     message = Column(Text, nullable=True)  # 알림 메시지
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")  # 전송 시도 횟수
+    next_attempt_at = Column(DateTime, nullable=True)  # 다음 재시도 시간 (None 이면 즉시)
+    last_error = Column(Text, nullable=True)  # 마지막 전송 실패 사유
     created_at = Column(DateTime, nullable=False, default=func.now())
     updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
 
@@ -19,5 +22,10 @@ class Notification(Base):
     user = relationship("User", back_populates="notifications")
     screenshot = relationship("Screenshot", back_populates="notifications")
 
+    __table_args__ = (
+        # GET /notification 의 (notification_time, id) keyset 페이징용
+        Index("ix_notification_user_id_notification_time_id", "user_id", "notification_time", "id"),
+    )
+
     def __repr__(self):
         return f"<Notification(id={self.id}, user_id={self.user_id}, screenshot_id={self.screenshot_id}, notification_time={self.notification_time}, is_sent={self.is_sent})>"
\ No newline at end of file
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, DateTime, Integer, func, Text
+from database import Base
+
+
+class NotificationDeadLetter(Base):
+    """ 영구적으로 전송에 실패한 알림 (재시도하지 않음) """
+    __tablename__ = "notification_dead_letter"
+
+    id = Column(String(36), primary_key=True)  # 원래 알림 id
+    user_id = Column(String(36), nullable=False, index=True)
+    screenshot_id = Column(String(36), nullable=False)
+    notification_time = Column(DateTime, nullable=False)
+    message = Column(Text, nullable=True)
+    fcm_token = Column(String(4096), nullable=True)  # 실패 당시 사용한 토큰
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)  # 실패 사유
+    created_at = Column(DateTime, nullable=False, default=func.now())
+
+    def __repr__(self):
+        return f"<NotificationDeadLetter(id={self.id}, user_id={self.user_id}, attempts={self.attempts}, error={self.error})>"
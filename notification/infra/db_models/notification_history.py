@@ -0,0 +1,26 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Integer, Index, func, Text
+from database import Base
+
+
+class NotificationHistory(Base):
+    """ 전송이 끝나고 일정 기간이 지난 알림 (notification 테이블에서 옮겨온다) """
+    __tablename__ = "notification_history"
+
+    id = Column(String(36), primary_key=True)
+    user_id = Column(String(36), ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    screenshot_id = Column(String(36), ForeignKey("screenshot.id", ondelete="CASCADE"), nullable=False, index=True)
+    notification_time = Column(DateTime, nullable=False)
+    is_sent = Column(Boolean, default=True)
+    message = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    archived_at = Column(DateTime, nullable=False, default=func.now())  # 보관 테이블로 옮겨진 시간
+
+    __table_args__ = (
+        Index("ix_notification_history_user_id_notification_time", "user_id", "notification_time"),
+    )
+
+    def __repr__(self):
+        return f"<NotificationHistory(id={self.id}, user_id={self.user_id}, screenshot_id={self.screenshot_id}, notification_time={self.notification_time})>"
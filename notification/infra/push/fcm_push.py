@@ -0,0 +1,35 @@
+from firebase_admin import messaging
+from firebase_admin import exceptions as firebase_exceptions
+
+
+# 재시도해도 성공할 수 없는 FCM 오류. 해당 토큰은 User.fcm_token 에서 제거된다
+PERMANENT_FCM_ERRORS = (
+    messaging.UnregisteredError,
+    messaging.SenderIdMismatchError,
+    firebase_exceptions.InvalidArgumentError,
+)
+
+
+def deliver_push_notification(fcm_token: str, message: str):
+    """ 푸시 알림 전송. 실패하면 예외를 그대로 올린다 """
+    return messaging.send(
+        messaging.Message(
+            notification=messaging.Notification(
+                title="RememberMe 알림",
+                body=message
+            ),
+            token=fcm_token
+        )
+    )
+
+
+def send_push_notification(fcm_token, notification: dict):
+    try:
+        response = deliver_push_notification(fcm_token, notification.get("message"))
+        print("Successfully sent message:", response)
+    except Exception as e:
+        print("Failed to send push notification:", e)
+
+
+def is_permanent_fcm_error(error: Exception) -> bool:
+    return isinstance(error, PERMANENT_FCM_ERRORS)
@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import or_, and_, func, select, insert, union_all, literal
 from notification.infra.db_models.notification import Notification
+from notification.infra.db_models.notification_dead_letter import NotificationDeadLetter
+from notification.infra.db_models.notification_history import NotificationHistory
 from notification.domain.repository.notification_repo import INotificationRepository
 from notification.domain.notification import Notification as NotificationVO
 from user.infra.db_models.user import User
@@ -10,8 +12,15 @@ from datetime import datetime
 from database import SessionLocal
 from utils.common import get_time_description
 from screenshot.infra.db_models.screenshot import Screenshot
+from category.infra.db_models.category import Category
 
 
+# notification 과 notification_history 가 공유하는 컬럼
+HISTORY_COLUMNS = [
+    "id", "user_id", "screenshot_id", "notification_time", "is_sent", "message",
+    "attempts", "last_error", "created_at", "updated_at",
+]
+
 
 class NotificationRepository(INotificationRepository):  
     def save(self, user_id: str, notification_vo: NotificationVO) -> Notification:
@@ -30,32 +39,65 @@ class NotificationRepository(INotificationRepository):
             db.refresh(notification)
             
 
-    def get_notifications(self, user_id: str, page: int, items_per_page: int):
-        """ 사용자의 모든 알림 조회 (페이징) """
-        with SessionLocal() as db:
-            query = (
-                db.query(Notification)
-                .filter(Notification.user_id == user_id)
-                .join(Screenshot, Notification.screenshot_id == Screenshot.id)
-            )
+    def get_notifications(
+            self,
+            user_id: str,
+            page: int,
+            items_per_page: int,
+            include_history: bool = False,
+            after: tuple[datetime, str] | None = None,
+            with_count: bool = True,
+    ):
+        """ 사용자의 모든 알림 조회 (페이징)
+
+        after 가 주어지면 (notification_time, id) 기준 keyset 페이징을 하고, 아니면 page 로 OFFSET 페이징을 한다.
+        with_count 가 False 이면 전체 개수를 세지 않고 None 을 반환한다.
+        """
+        def columns(model):
+            return [getattr(model, column) for column in HISTORY_COLUMNS]
 
-            total_count = query.count()
-            notifications = (
-                query.order_by(Notification.notification_time.asc())
-                .offset((page - 1) * items_per_page)
-                .limit(items_per_page)
-                .all()
+        def after_cursor(model):
+            after_time, after_id = after
+            return or_(
+                model.notification_time > after_time,
+                and_(model.notification_time == after_time, model.id > after_id),
             )
 
+        models = [Notification, NotificationHistory] if include_history else [Notification]
+        with SessionLocal() as db:
+            total_count = None
+            if with_count:
+                total_count = sum(
+                    db.scalar(select(func.count(model.id)).where(model.user_id == user_id))
+                    for model in models
+                )
+
+            selects = []
+            for model in models:
+                query = select(*columns(model)).where(model.user_id == user_id)
+                if after:
+                    query = query.where(after_cursor(model))
+                selects.append(query)
+
+            if include_history:
+                notifications = union_all(*selects).subquery()
+                query = select(notifications).order_by(notifications.c.notification_time.asc(), notifications.c.id.asc())
+            else:
+                query = selects[0].order_by(Notification.notification_time.asc(), Notification.id.asc())
+
+            if not after:
+                query = query.offset((page - 1) * items_per_page)
+            rows = db.execute(query.limit(items_per_page)).mappings().all()
+
             notification_vos = []
-            for notification in notifications:
-                noti = row_to_dict(notification)
-                noti['time_description'] = get_time_description(notification.notification_time)
+            for row in rows:
+                noti = dict(row)
+                noti['time_description'] = get_time_description(row['notification_time'])
                 notification_vos.append(NotificationVO(**noti))
 
             return total_count, notification_vos
 
-    def find_by_id(self, user_id: str, notification_id: str) -> dict:
+    def find_by_id(self, user_id: str, notification_id: str, include_history: bool = False) -> dict:
         """ 특정 알림 조회 """
         with SessionLocal() as db:
             notification = db.query(Notification).filter(
@@ -67,6 +109,16 @@ class NotificationRepository(INotificationRepository):
                 notification_vo = row_to_dict(notification)
                 notification_vo['time_description'] = get_time_description(notification.notification_time)
                 return NotificationVO(**notification_vo)
+
+            if include_history:
+                history = db.query(NotificationHistory).filter(
+                    NotificationHistory.id == notification_id,
+                    NotificationHistory.user_id == user_id
+                ).first()
+                if history:
+                    notification_vo = row_to_dict(history, exception={"archived_at"})
+                    notification_vo['time_description'] = get_time_description(history.notification_time)
+                    return NotificationVO(**notification_vo)
             return None
         
     def update(self, user_id: str, notification_vo: NotificationVO) -> Notification:
@@ -90,7 +142,7 @@ class NotificationRepository(INotificationRepository):
             return None
 
     def delete(self, user_id: str, notification_id: str):
-        """ 특정 알림 삭제 """
+        """ 특정 알림 삭제 (보관된 알림 포함) """
         with SessionLocal() as db:
             notification = db.query(Notification).filter(
                 Notification.id == notification_id,
@@ -99,7 +151,12 @@ class NotificationRepository(INotificationRepository):
 
             if notification:
                 db.delete(notification)
-                db.commit()
+            else:
+                db.query(NotificationHistory).filter(
+                    NotificationHistory.id == notification_id,
+                    NotificationHistory.user_id == user_id
+                ).delete(synchronize_session=False)
+            db.commit()
 
     def delete_all(self, user_id: str, screenshot_id: str):
         """ 사용자의 모든 알림 삭제 """
@@ -129,18 +186,134 @@ class NotificationRepository(INotificationRepository):
 
             return None
 
-    def get_pending_notifications(self):
-        """ 전송되지 않은 알림 조회 (현재 시각을 기준) """
+    def get_pending_notifications(self, limit: int | None = None):
+        """ 전송되지 않은 알림 조회 (현재 시각을 기준, 재시도 대기 중인 알림 제외)
+
+        (알림, FCM 토큰, 카테고리 이름, 스크린샷 제목) 목록을 반환한다.
+        """
+        now = datetime.now()
         with SessionLocal() as db:
-            return (
-                db.query(Notification, User.fcm_token)
+            query = (
+                db.query(Notification, User.fcm_token, Category.name, Screenshot.title)
                     .join(User, Notification.user_id == User.id)
+                    .outerjoin(Screenshot, Notification.screenshot_id == Screenshot.id)
+                    .outerjoin(Category, Screenshot.category_id == Category.id)
+                    .filter(
+                        Notification.is_sent == False,
+                        Notification.notification_time <= now,
+                        Notification.message.isnot(None),
+                        User.fcm_token.isnot(None),
+                        or_(Notification.next_attempt_at.is_(None), Notification.next_attempt_at <= now),
+                    )
+                    .order_by(Notification.notification_time.asc())
+            )
+            if limit:
+                query = query.limit(limit)
+            return query.all()
+
+    def count_pending_notifications(self) -> int:
+        """ 알림 시간이 지났지만 아직 전송되지 않은 알림 수 """
+        with SessionLocal() as db:
+            return (
+                db.query(func.count(Notification.id))
                     .filter(
                         Notification.is_sent == False,
-                        Notification.notification_time <= datetime.now()
-                ).all()
+                        Notification.notification_time <= datetime.now(),
+                    )
+                    .scalar()
+            )
+
+    def mark_all_as_sent(self, notification_ids: list[str]):
+        """ 여러 알림을 한 번에 '보낸 상태'로 변경 """
+        if not notification_ids:
+            return
+        with SessionLocal() as db:
+            db.query(Notification).filter(Notification.id.in_(notification_ids)).update(
+                {
+                    Notification.is_sent: True,
+                    Notification.updated_at: datetime.now(),
+                },
+                synchronize_session=False,
+            )
+            db.commit()
+
+    def schedule_retry(self, notification_id: str, attempts: int, next_attempt_at: datetime, error: str):
+        """ 전송 실패한 알림의 시도 횟수와 다음 재시도 시간 기록 """
+        with SessionLocal() as db:
+            db.query(Notification).filter(Notification.id == notification_id).update(
+                {
+                    Notification.attempts: attempts,
+                    Notification.next_attempt_at: next_attempt_at,
+                    Notification.last_error: error,
+                },
+                synchronize_session=False,
             )
+            db.commit()
+
+    def move_to_dead_letter(self, notification_id: str, fcm_token: str, attempts: int, error: str, prune_token: bool):
+        """ 영구 실패한 알림을 dead-letter 테이블로 옮기고, 필요하면 사용자의 FCM 토큰 제거 """
+        with SessionLocal() as db:
+            notification = db.query(Notification).filter(Notification.id == notification_id).first()
+            if not notification:
+                return
+            db.add(NotificationDeadLetter(
+                id=notification.id,
+                user_id=notification.user_id,
+                screenshot_id=notification.screenshot_id,
+                notification_time=notification.notification_time,
+                message=notification.message,
+                fcm_token=fcm_token,
+                attempts=attempts,
+                error=error,
+                created_at=datetime.now(),
+            ))
+            if prune_token:
+                # 그 사이에 토큰이 갱신되었다면 새 토큰은 지우지 않는다
+                db.query(User).filter(
+                    User.id == notification.user_id,
+                    User.fcm_token == fcm_token,
+                ).update({User.fcm_token: None}, synchronize_session=False)
+            db.delete(notification)
+            db.commit()
         
+    def archive_sent_notifications(self, sent_before: datetime, batch_size: int) -> int:
+        """ 전송된 지 오래된 알림을 notification_history 로 옮긴다. 배치마다 커밋하여 잠금을 짧게 유지한다 """
+        archived = 0
+        while True:
+            with SessionLocal() as db:
+                notification_ids = [
+                    notification_id for (notification_id,) in (
+                        db.query(Notification.id)
+                        .filter(
+                            Notification.is_sent == True,
+                            Notification.notification_time < sent_before,
+                        )
+                        .limit(batch_size)
+                        .all()
+                    )
+                ]
+                if not notification_ids:
+                    break
+
+                db.execute(
+                    insert(NotificationHistory).from_select(
+                        HISTORY_COLUMNS + ["archived_at"],
+                        select(
+                            *[getattr(Notification, column) for column in HISTORY_COLUMNS],
+                            literal(datetime.now()),
+                        ).where(Notification.id.in_(notification_ids)),
+                    )
+                )
+                db.query(Notification).filter(
+                    Notification.id.in_(notification_ids)
+                ).delete(synchronize_session=False)
+                db.commit()
+
+            archived += len(notification_ids)
+            if len(notification_ids) < batch_size:
+                break
+        return archived
+
     def save_all(self, notification_vos: list[NotificationVO]):
         """ 여러 알림 생성 """
         with SessionLocal() as db:
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel
+from datetime import datetime
+from common.auth import CurrentUser, get_admin_user
+from notification.application.notification_metrics import notification_metrics
+
+router = APIRouter(prefix="/admin/metrics")
+
+
+class HistogramResponse(BaseModel):
+    buckets: dict[str, int]
+    count: int
+    sum: float
+
+
+class NotificationMetricsResponse(BaseModel):
+    ticks: int
+    last_tick_at: datetime | None
+    queue_depth: int
+    fcm_success: int
+    fcm_failure: int
+    batch_size: HistogramResponse
+    latency_seconds: HistogramResponse
+
+
+@router.get("/notification", response_model=NotificationMetricsResponse)
+def get_notification_metrics(
+        current_user: CurrentUser = Depends(get_admin_user),
+) -> NotificationMetricsResponse:
+    """ 알림 워커의 전송 지연, 배치 크기, FCM 성공/실패, 대기열 길이 (현재 프로세스 기준) """
+    return notification_metrics.snapshot()
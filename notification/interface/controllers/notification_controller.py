@@ -5,7 +5,7 @@ from dependency_injector.wiring import inject, Provide
 from typing import Annotated
 from common.auth import CurrentUser, get_current_user
 from containers import Container
-from notification.application.notification_service import NotificationService
+from notification.application.notification_service import NotificationService, encode_cursor
 from datetime import datetime
 
 router = APIRouter(prefix="/notification")
@@ -47,9 +47,10 @@ def create_notification(
 
 
 class GetNotificationsResponse(BaseModel):
-    total_count: int
+    total_count: int | None
     page: int
     notifications: list[NotificationResponse]
+    next_cursor: str | None = None
 
 
 @router.get("", response_model=GetNotificationsResponse)
@@ -58,18 +59,31 @@ def get_notifications(
         current_user: Annotated[CurrentUser, Depends(get_current_user)],
         page: int = 1,
         items_per_page: int = 10,
+        include_history: bool = False,
+        cursor: str | None = None,
+        with_count: bool = True,
         notification_service: NotificationService = Depends(Provide[Container.notification_service])
 ) -> GetNotificationsResponse:
-    """ 사용자의 모든 알림 조회 """
+    """ 사용자의 모든 알림 조회
+
+    - include_history: 보관된 알림 포함
+    - cursor: 이전 응답의 next_cursor. 주어지면 page 대신 커서 다음부터 조회 (무한 스크롤용)
+    - with_count: False 이면 total_count 를 계산하지 않음
+    """
     total_count, notifications = notification_service.get_notifications(
         user_id=current_user.id,
         page=page,
-        items_per_page=items_per_page
+        items_per_page=items_per_page,
+        include_history=include_history,
+        cursor=cursor,
+        with_count=with_count,
     )
+    next_cursor = encode_cursor(notifications[-1]) if len(notifications) == items_per_page else None
     response = GetNotificationsResponse(
         total_count=total_count,
         page=page,
-        notifications=[asdict(notification) for notification in notifications]
+        notifications=[asdict(notification) for notification in notifications],
+        next_cursor=next_cursor,
     )
     return response
 
@@ -79,12 +93,14 @@ def get_notifications(
 def get_notification(
         current_user: Annotated[CurrentUser, Depends(get_current_user)],
         notification_id: str,
+        include_history: bool = False,
         notification_service: NotificationService = Depends(Provide[Container.notification_service])
 ) -> NotificationResponse:
     """ 특정 알림 조회 """
     notification = notification_service.get_notification(
         user_id=current_user.id,
-        notification_id=notification_id
+        notification_id=notification_id,
+        include_history=include_history,
     )
     response = asdict(notification)
     return response
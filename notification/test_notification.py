@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 
 from notification.domain.notification import Notification
@@ -9,7 +10,10 @@ from category.application.category_service import CategoryService
 from category.infra.repository.category_repo import CategoryRepository
 from screenshot.domain.screenshot import Screenshot
 from notification.infra.repository.notification_repo import NotificationRepository
-from notification.application.notification_service import NotificationService
+from notification.application.notification_service import NotificationService, encode_cursor
+from notification.application.notification_dispatcher import NotificationDispatcher
+from notification.application.notification_coalescer import coalesce_notifications
+from notification.application.notification_metrics import NotificationMetrics
 from datetime import datetime, timedelta
 from utils import ai
 
@@ -134,4 +138,128 @@ def test_mark_as_sent(testuser, testscreenshot, notification_service):
     assert notification.is_sent is False
     notification_service.mark_notification_as_sent(user.id, notification.id)
     notification = notification_service.get_notification(user.id, notification_id=noti.id)
-    assert notification.is_sent is True
\ No newline at end of file
+    assert notification.is_sent is True
+
+
+def test_archive_sent_notifications(testuser, testscreenshot, notification_service):
+    user = testuser
+    screenshot = testscreenshot
+
+    noti = notification_service.create_notification(
+        user_id=user.id,
+        screenshot_id=screenshot.id,
+        notification_time=datetime.now() - timedelta(days=40),
+        message="Old Notification",
+    )
+    notification_service.mark_notification_as_sent(user.id, noti.id)
+    notification_service.archive_sent_notifications(max_age_days=30, batch_size=10)
+
+    total, notifications = notification_service.get_notifications(user.id, 1, 10)
+    assert noti.id not in [notification.id for notification in notifications]
+    total, notifications = notification_service.get_notifications(user.id, 1, 10, include_history=True)
+    assert noti.id in [notification.id for notification in notifications]
+    assert notification_service.get_notification(user.id, noti.id, include_history=True).is_sent is True
+
+
+def test_get_notifications_with_cursor(testuser, testscreenshot, notification_service):
+    user = testuser
+
+    total, first_page = notification_service.get_notifications(user.id, 1, 1)
+    assert total == 2
+    cursor = encode_cursor(first_page[-1])
+    total, second_page = notification_service.get_notifications(user.id, 1, 1, cursor=cursor, with_count=False)
+    assert total is None
+    assert [n.id for n in first_page + second_page] == [n.id for n in notification_service.get_notifications(user.id, 1, 10)[1]]
+
+class FakeNotificationService:
+    def __init__(self):
+        self.sent = []
+        self.retried = []
+        self.dead_lettered = []
+
+    def mark_notifications_as_sent(self, notification_ids):
+        self.sent.extend(notification_ids)
+
+    def schedule_retry(self, notification_id, attempts, next_attempt_at, error):
+        self.retried.append((notification_id, attempts, next_attempt_at))
+
+    def move_to_dead_letter(self, notification_id, fcm_token, attempts, error, prune_token=False):
+        self.dead_lettered.append((notification_id, prune_token))
+
+
+class PermanentError(Exception):
+    pass
+
+
+def test_dispatcher_retries_and_dead_letters():
+    service = FakeNotificationService()
+
+    def send(fcm_token, message):
+        if fcm_token == "flaky":
+            raise ConnectionError("unavailable")
+        if fcm_token == "unregistered":
+            raise PermanentError("unregistered")
+
+    dispatcher = NotificationDispatcher(
+        notification_service=service,
+        send=send,
+        is_permanent_error=lambda e: isinstance(e, PermanentError),
+        max_concurrency=2,
+        max_attempts=3,
+        retry_base_seconds=10,
+    )
+    pending = [
+        (Notification("n1", "u1", "s1", datetime.now(), "", "m1", False, None, None), "ok", "교통", None),
+        (Notification("n2", "u1", "s1", datetime.now(), "", "m2", False, None, None), "flaky", "교통", None),
+        (Notification("n3", "u2", "s2", datetime.now(), "", "m3", False, None, None, attempts=2), "flaky", "교통", None),
+        (Notification("n4", "u3", "s3", datetime.now(), "", "m4", False, None, None), "unregistered", "교통", None),
+    ]
+    deliveries = coalesce_notifications(pending, window_seconds=600, categories=["쿠폰"])
+    result = asyncio.run(dispatcher.dispatch(deliveries))
+
+    assert (result.sent, result.retried, result.dead_lettered) == (1, 1, 2)
+    assert service.sent == ["n1"]
+    notification_id, attempts, next_attempt_at = service.retried[0]
+    assert notification_id == "n2" and attempts == 1
+    assert next_attempt_at > datetime.now() + timedelta(seconds=4)
+    assert sorted(service.dead_lettered) == [("n3", False), ("n4", True)]
+
+
+def test_coalesce_notifications_per_user():
+    now = datetime.now()
+    pending = [
+        (Notification("n1", "u1", "s1", now, "", "쿠폰 아메리카노 만료", False, None, None), "t1", "쿠폰", "아메리카노"),
+        (Notification("n2", "u1", "s2", now + timedelta(minutes=5), "", "쿠폰 라떼 만료", False, None, None), "t1", "쿠폰", "라떼"),
+        (Notification("n3", "u1", "s3", now + timedelta(hours=1), "", "쿠폰 케이크 만료", False, None, None), "t1", "쿠폰", "케이크"),
+        (Notification("n4", "u1", "s4", now, "", "부산 행 기차 탑승", False, None, None), "t1", "교통", None),
+        (Notification("n5", "u2", "s5", now, "", "쿠폰 치킨 만료", False, None, None), "t2", "쿠폰", "치킨"),
+    ]
+    deliveries = coalesce_notifications(pending, window_seconds=600, categories=["쿠폰"])
+
+    by_ids = {tuple(n.id for n in delivery.notifications): delivery for delivery in deliveries}
+    assert set(by_ids) == {("n1", "n2"), ("n3",), ("n4",), ("n5",)}
+    assert "쿠폰 2개" in by_ids[("n1", "n2")].message
+    assert "아메리카노, 라떼" in by_ids[("n1", "n2")].message
+    assert by_ids[("n4",)].message == "부산 행 기차 탑승"
+
+    appointments = [
+        (Notification("n6", "u1", "s6", now, "", "특별한 일정", False, None, None), "t1", "약속", "저녁 약속"),
+        (Notification("n7", "u1", "s7", now, "", "특별한 일정", False, None, None), "t1", "약속", "회의"),
+    ]
+    [delivery] = coalesce_notifications(appointments, window_seconds=600, categories=["약속"])
+    assert "특별한 일정 2건" in delivery.message
+    assert delivery.message.endswith(": 저녁 약속, 회의")
+
+
+def test_notification_metrics():
+    metrics = NotificationMetrics()
+    metrics.observe_tick(batch_size=3, queue_depth=7)
+    metrics.observe_push(success=True)
+    metrics.observe_push(success=False)
+    metrics.observe_sent(datetime.now() - timedelta(seconds=20))
+
+    snapshot = metrics.snapshot()
+    assert snapshot["queue_depth"] == 7
+    assert (snapshot["fcm_success"], snapshot["fcm_failure"]) == (1, 1)
+    assert snapshot["batch_size"]["buckets"]["le_5"] == 1
+    assert snapshot["latency_seconds"]["buckets"]["le_30"] == 1
@@ -1,53 +1,73 @@
+import asyncio
 from notification.application.notification_service import NotificationService
+from notification.application.notification_dispatcher import NotificationDispatcher
+from notification.application.notification_coalescer import coalesce_notifications
+from notification.application.notification_metrics import notification_metrics
 from notification.infra.repository.notification_repo import NotificationRepository
+from notification.infra.push.fcm_push import deliver_push_notification, is_permanent_fcm_error
 from screenshot.infra.storage.azure_blob import AzureBlobStorage
 from fastapi_utilities import repeat_every
+from recommendation_batch import precompute_recommendations
+from config import get_settings
+from utils.logger import logger
 
 import firebase_admin
 from firebase_admin import credentials
-from firebase_admin import messaging
 
 
+settings = get_settings()
+
 
 def download_fcm():
     storage = AzureBlobStorage()
     storage.download_image("rememberme_fcm.json", "./rememberme_fcm.json")
 
 
-def send_push_notification(fcm_token, notification: dict):
-    try:
-        message = messaging.Message(
-            notification=messaging.Notification(
-                title="RememberMe 알림",
-                body=notification.get("message")
-            ),
-            token=fcm_token
-        )
-
-        response = messaging.send(message)
-        print("Successfully sent message:", response)
-    except Exception as e:
-        print("Failed to send push notification:", e)
-
-
-@repeat_every(seconds=30)
-def check_and_send_notifications():
+@repeat_every(seconds=30, logger=logger)
+async def check_and_send_notifications():
     print("🔔 Checking for pending notifications...")
     notification_repo = NotificationRepository()
     notification_service = NotificationService(notification_repo=notification_repo)
-    pending_notifications = notification_service.get_pending_notifications()
+    pending_notifications = await asyncio.to_thread(
+        notification_service.get_pending_notifications,
+        settings.notification_batch_size,
+    )
+    queue_depth = await asyncio.to_thread(notification_service.count_pending_notifications)
+    notification_metrics.observe_tick(batch_size=len(pending_notifications), queue_depth=queue_depth)
 
-    if pending_notifications:
-        print(f"🔔 Found {len(pending_notifications)} pending notifications.")
-    
-    for notification, fcm_token in pending_notifications:
-        print(f"fcm: {fcm_token}, notification message: {notification.message}")
-        if not fcm_token or notification.message is None:
-            continue
-        send_push_notification(fcm_token, { "message": notification.message })
+    if not pending_notifications:
+        return
+    print(f"🔔 Found {len(pending_notifications)} pending notifications.")
 
-        # 알림을 보낸 것으로 업데이트
-        notification_service.mark_notification_as_sent(notification.user_id, notification.id)
+    dispatcher = NotificationDispatcher(
+        notification_service=notification_service,
+        send=deliver_push_notification,
+        is_permanent_error=is_permanent_fcm_error,
+        max_concurrency=settings.notification_max_concurrency,
+        max_attempts=settings.notification_max_attempts,
+        retry_base_seconds=settings.notification_retry_base_seconds,
+        retry_max_seconds=settings.notification_retry_max_seconds,
+        metrics=notification_metrics,
+    )
+    deliveries = coalesce_notifications(
+        pending_notifications,
+        window_seconds=settings.notification_coalesce_window_seconds,
+        categories=settings.notification_coalesce_categories,
+    )
+    result = await dispatcher.dispatch(deliveries)
+    print(f"🔔 Sent {result.sent} in {result.pushes} pushes, retry scheduled {result.retried}, dead-lettered {result.dead_lettered}")
+
+
+@repeat_every(seconds=60 * 60, logger=logger)
+async def archive_sent_notifications():
+    notification_service = NotificationService(notification_repo=NotificationRepository())
+    archived = await asyncio.to_thread(
+        notification_service.archive_sent_notifications,
+        settings.notification_archive_after_days,
+        settings.notification_archive_batch_size,
+    )
+    if archived:
+        print(f"🔔 Archived {archived} sent notifications.")
 
 
 def fcm_startup():
@@ -60,5 +80,13 @@ def fcm_startup():
 
 fcm_startup()
 
+
+async def run_worker():
+    await check_and_send_notifications()
+    await archive_sent_notifications()
+    await precompute_recommendations()
+    await asyncio.Event().wait()
+
+
 if __name__ == "__main__":
-    check_and_send_notifications()
\ No newline at end of file
+    asyncio.run(run_worker())
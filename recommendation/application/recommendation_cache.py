@@ -0,0 +1,77 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from typing import Callable
+from config import get_settings
+
+
+settings = get_settings()
+
+
+@dataclass
+class CacheEntry:
+    version: int
+    expires_at: datetime
+    coupons: list
+
+
+class RecommendationCache:
+    """
+    사용자별 추천 결과 캐시 (프로세스 메모리).
+
+    키는 (user_id, days) 이다. version() 은 캐시 전체에서 무효화할 때마다 올라가는 번호이고,
+    항목은 사용자가 마지막으로 무효화된 뒤에 읽은 번호로 계산된 것만 쓴다.
+    무효화 기록은 최근 max_entries 명만 남기고, 밀려난 기록은 floor 하나로 합친다
+    (floor 보다 먼저 계산된 항목은 모두 버리므로 캐시를 덜 쓸 뿐 오래된 결과를 돌려주지는 않는다).
+    날짜가 바뀌면 추천 기간도 달라지므로 항목은 다음 자정에 만료된다.
+    """
+
+    def __init__(self, max_entries: int | None = None, clock: Callable[[], datetime] = datetime.now):
+        self.max_entries = max_entries or settings.recommendation_cache_max_entries
+        self.clock = clock
+        self.generation = 0
+        self.floor = 0
+        self.invalidated: OrderedDict[str, int] = OrderedDict()
+        self.entries: OrderedDict[tuple[str, int], CacheEntry] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def version(self, user_id: str) -> int:
+        with self.lock:
+            return self.generation
+
+    def _is_stale(self, user_id: str, version: int) -> bool:
+        return version < self.invalidated.get(user_id, self.floor)
+
+    def get(self, user_id: str, days: int) -> list | None:
+        key = (user_id, days)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if self._is_stale(user_id, entry.version) or self.clock() >= entry.expires_at:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return [dict(coupon) for coupon in entry.coupons]
+
+    def set(self, user_id: str, days: int, version: int, coupons: list):
+        """ version 은 계산을 시작하기 전에 읽은 값. 그 사이에 무효화됐으면 저장하지 않는다 """
+        now = self.clock()
+        expires_at = datetime.combine(now.date() + timedelta(days=1), time.min)
+        with self.lock:
+            if self._is_stale(user_id, version):
+                return
+            self.entries[(user_id, days)] = CacheEntry(version, expires_at, [dict(coupon) for coupon in coupons])
+            self.entries.move_to_end((user_id, days))
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, user_id: str):
+        with self.lock:
+            self.generation += 1
+            self.invalidated[user_id] = self.generation
+            self.invalidated.move_to_end(user_id)
+            while len(self.invalidated) > self.max_entries:
+                _, generation = self.invalidated.popitem(last=False)
+                self.floor = max(self.floor, generation)
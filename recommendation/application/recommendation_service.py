@@ -1,9 +1,19 @@
 from screenshot.domain.repository.screenshot_repo import IScreenshotRepository
 from dependency_injector.wiring import inject
 from utils.ai import extract_data_from_screenshots
-from utils.infer import infer
+from utils.infer import infer, infer_many
+from utils.reco_model import RecommendationModel
+from recommendation.application.recommendation_cache import RecommendationCache
+from recommendation.domain.recommendation import RecommendationSnapshot, screenshot_fingerprint
+from recommendation.domain.repository.recommendation_repo import IRecommendationRepository
+from screenshot.domain.screenshot import Screenshot
+from datetime import date, datetime
+from config import get_settings
 from dataclasses import asdict, dataclass
 
+
+settings = get_settings()
+
 @dataclass
 class Recommendation:
     id: str # screenshot_id
@@ -15,16 +25,72 @@ class Recommendation:
 
 class RecommendationService:
     @inject
-    def __init__(self, screenshot_repo: IScreenshotRepository):
+    def __init__(
+            self,
+            screenshot_repo: IScreenshotRepository,
+            recommendation_repo: IRecommendationRepository,
+            recommendation_model: RecommendationModel,
+            recommendation_cache: RecommendationCache,
+    ):
         self.screenshot_repo = screenshot_repo
+        self.recommendation_repo = recommendation_repo
+        self.recommendation_model = recommendation_model
+        self.recommendation_cache = recommendation_cache
 
     def recommend_coupons(self, user_id: str, days: int) -> list:
-        total, screenshots = self.screenshot_repo.get_screenshots(user_id=user_id, keywords=None, unused_only=True)
-        data = extract_data_from_screenshots([asdict(screenshot) for screenshot in screenshots])
-        results = infer(data, days)
+        # 계산 중에 스크린샷이 바뀌면 결과를 캐시에 넣지 않도록 먼저 버전을 읽는다
+        version = self.recommendation_cache.version(user_id)
+        cached = self.recommendation_cache.get(user_id, days)
+        if cached is not None:
+            return cached
+
+        # 배치로 미리 계산해 둔 결과가 오늘 것이고 스크린샷도 그대로면 그대로 쓴다
+        snapshot = self.recommendation_repo.find(user_id, days, date.today())
+        if snapshot and snapshot.fingerprint == self.recommendation_repo.get_screenshot_fingerprint(user_id):
+            coupons = snapshot.coupons
+        else:
+            total, screenshots = self.screenshot_repo.get_screenshots(user_id=user_id, keywords=None, unused_only=True)
+            data = extract_data_from_screenshots([asdict(screenshot) for screenshot in screenshots])
+            results = infer(data, days, model=self.recommendation_model)
+            coupons = self._to_coupons(results, screenshots)
+            self._save_snapshot(user_id, days, screenshots, coupons)
+
+        self.recommendation_cache.set(user_id, days, version, coupons)
+        return coupons
 
+    def precompute_recommendations(self, days: int | None = None, chunk_size: int | None = None) -> int:
+        """ 미사용 쿠폰이 있는 사용자들의 추천을 chunk_size 명씩 한 번의 조회/추론으로 계산해서 저장한다 """
+        days = days or settings.recommendation_precompute_days
+        chunk_size = chunk_size or settings.recommendation_precompute_chunk_size
+
+        computed = 0
+        after_user_id = None
+        while user_ids := self.recommendation_repo.find_user_ids_with_unused_coupons(after_user_id, chunk_size):
+            users = list(self.screenshot_repo.get_unused_screenshots_by_user_ids(user_ids).items())
+            datas = [
+                extract_data_from_screenshots([asdict(screenshot) for screenshot in screenshots])
+                for _, screenshots in users
+            ]
+            for (user_id, screenshots), results in zip(users, infer_many(datas, days, model=self.recommendation_model)):
+                self._save_snapshot(user_id, days, screenshots, self._to_coupons(results, screenshots))
+            computed += len(user_ids)
+            after_user_id = user_ids[-1]
+        return computed
+
+    def _save_snapshot(self, user_id: str, days: int, screenshots: list[Screenshot], coupons: list):
+        self.recommendation_repo.save(RecommendationSnapshot(
+            user_id=user_id,
+            days=days,
+            base_date=date.today(),
+            fingerprint=screenshot_fingerprint((screenshot.id, screenshot.updated_at) for screenshot in screenshots),
+            coupons=coupons,
+            created_at=datetime.now(),
+        ))
+
+    @staticmethod
+    def _to_coupons(results: list, screenshots: list[Screenshot]) -> list:
         screenshot_dict = {screenshot.id: screenshot for screenshot in screenshots}
-        coupons = [ {
+        return [ {
             "screenshot_id": result["id"],
             "brand": screenshot_dict[result["id"]].brand,
             "is_reco": result["is_reco"],
@@ -33,5 +99,3 @@ class RecommendationService:
             "item": result.get('item', None),
             "description": result.get("description", None)
         } for result in results]
-        return coupons
-
@@ -0,0 +1,162 @@
+import glob
+import math
+import os
+import shutil
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import torch
+
+from recommendation.domain.recommendation import CouponOutcome
+from recommendation.domain.repository.recommendation_repo import IRecommendationRepository
+from utils.reco3 import Event, GRPORecommendationAgent
+from utils.reco_runtime import export_numpy
+from utils.logger import logger
+
+
+def outcome_target(outcome: CouponOutcome, today: date) -> list[float] | None:
+    """
+    쿠폰 이력을 모델의 네 가지 출력(date, time, schedule, weekday)에 대한 목표값으로 바꾼다.
+
+    사용한 쿠폰: [1, 사용 시각/24시간, 만료일 이전 사용 여부, 사용 요일/6]
+    사용하지 않고 만료된 쿠폰: [0, 0, 0, 0]
+    아직 만료되지 않은 미사용 쿠폰은 결과를 모르므로 None.
+    """
+    try:
+        expires_on = datetime.strptime(outcome.date or "", "%Y-%m-%d").date()
+    except ValueError:
+        expires_on = None
+
+    if not outcome.is_used:
+        if expires_on is None or expires_on >= today:
+            return None
+        return [0.0, 0.0, 0.0, 0.0]
+
+    used_at = outcome.updated_at
+    return [
+        1.0,
+        (used_at.hour * 60 + used_at.minute) / (24 * 60),
+        1.0 if expires_on is None or used_at.date() <= expires_on else 0.0,
+        used_at.weekday() / 6,
+    ]
+
+
+class RecommendationTrainer:
+    """
+    DB 의 쿠폰 이력을 chunk 단위로 읽어 replay buffer 에 넣고 mini-batch 로 학습한다.
+
+    epoch 마다 checkpoint_dir 에 (모델, optimizer, epoch) 를 저장하고,
+    publish 하면 버전이 붙은 모델 파일을 만든 뒤 서빙 경로를 os.replace 로 교체한다.
+    서빙 중인 RecommendationModel 은 파일이 바뀐 것을 보고 다시 읽는다.
+    """
+
+    def __init__(
+            self,
+            recommendation_repo: IRecommendationRepository,
+            agent: GRPORecommendationAgent,
+            checkpoint_dir: str,
+            version: str | None = None,
+    ):
+        self.recommendation_repo = recommendation_repo
+        self.agent = agent
+        self.checkpoint_dir = checkpoint_dir
+        self.version = version or datetime.now().strftime("%Y%m%d%H%M%S")
+        self.resumed_from = None
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
+    def iter_samples(self, chunk_size: int) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        today = date.today()
+        after_id = None
+        while outcomes := self.recommendation_repo.find_coupon_outcomes(after_id, chunk_size):
+            after_id = outcomes[-1].id
+            events, targets = [], []
+            for outcome in outcomes:
+                target = outcome_target(outcome, today)
+                if target is None:
+                    continue
+                events.append(Event({
+                    "category": "쿠폰",
+                    "title": outcome.title,
+                    "brand": outcome.brand,
+                    "type": outcome.type,
+                    "code": outcome.code,
+                    "description": outcome.description,
+                    "date": outcome.date,
+                    "time": outcome.time,
+                }))
+                targets.append(target)
+            if events:
+                features = self.agent.feature_extractor.extract_features_batch(events)
+                yield np.asarray(features, dtype=np.float32), np.asarray(targets, dtype=np.float32)
+
+    def train(self, epochs: int, chunk_size: int, batch_size: int, start_epoch: int = 0) -> list[float]:
+        """ epoch 별 평균 loss """
+        epoch_losses = []
+        for epoch in range(start_epoch, epochs):
+            losses, samples = [], 0
+            for features, targets in self.iter_samples(chunk_size):
+                self.agent.memory.add(features, targets)
+                samples += len(features)
+                if len(self.agent.memory) < batch_size:
+                    continue
+                for _ in range(math.ceil(len(features) / batch_size)):
+                    losses.append(self.agent.update(batch_size, verbose=False))
+            mean_loss = float(np.mean(losses)) if losses else float("nan")
+            epoch_losses.append(mean_loss)
+            path = self.save_checkpoint(epoch + 1, mean_loss)
+            logger.info(f"Epoch {epoch + 1}/{epochs}: samples={samples}, updates={len(losses)}, loss={mean_loss:.4f}, checkpoint={path}")
+        return epoch_losses
+
+    def save_checkpoint(self, epoch: int, loss: float) -> str:
+        path = os.path.join(self.checkpoint_dir, f"grpo-{self.version}-epoch{epoch:03d}.pth")
+        self._atomic_save({
+            "version": self.version,
+            "resumed_from": self.resumed_from,
+            "epoch": epoch,
+            "loss": loss,
+            "model": self.agent.model.state_dict(),
+            "optimizer": self.agent.optimizer.state_dict(),
+        }, path)
+        return path
+
+    def load_checkpoint(self, path: str) -> int:
+        """
+        이어서 학습할 epoch 번호. 이어서 학습한 결과는 새 버전(self.version)으로 저장/publish 하고,
+        원래 버전은 resumed_from 에 남긴다.
+        """
+        checkpoint = torch.load(path, map_location="cpu", weights_only=True)
+        self.agent.model.load_state_dict(checkpoint["model"])
+        self.agent.optimizer.load_state_dict(checkpoint["optimizer"])
+        self.resumed_from = checkpoint["version"]
+        return checkpoint["epoch"]
+
+    def publish(self, model_path: str, keep_versions: int = 5) -> str:
+        """ models/<이름>-<버전>.pth 를 만들고 서빙 경로를 교체한 뒤 NumPy 런타임용 .npz 도 다시 만든다 """
+        model_path = Path(model_path)
+        versioned_path = model_path.with_name(f"{model_path.stem}-{self.version}{model_path.suffix}")
+        self.agent.model.eval()
+        self._atomic_save(self.agent.model.state_dict(), str(versioned_path))
+
+        tmp_path = f"{model_path}.tmp"
+        shutil.copyfile(versioned_path, tmp_path)
+        os.replace(tmp_path, model_path)
+        export_numpy(str(model_path))
+
+        # 방금 만든 버전은 항상 남기고, 나머지는 최근에 만든 것부터 keep_versions - 1 개만 남긴다
+        if keep_versions > 0:
+            older = sorted(
+                (path for path in glob.glob(str(model_path.with_name(f"{model_path.stem}-*{model_path.suffix}")))
+                 if path != str(versioned_path)),
+                key=os.path.getmtime,
+            )
+            for old_path in older[:max(0, len(older) - (keep_versions - 1))]:
+                os.remove(old_path)
+        return str(versioned_path)
+
+    @staticmethod
+    def _atomic_save(obj, path: str):
+        tmp_path = f"{path}.tmp"
+        torch.save(obj, tmp_path)
+        os.replace(tmp_path, path)
@@ -0,0 +1,38 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Iterable
+
+
+@dataclass
+class RecommendationSnapshot:
+    """ 미리 계산해 둔 사용자의 추천 결과 """
+    user_id: str
+    days: int
+    base_date: date  # 추천 기간의 시작일
+    fingerprint: str  # 계산에 사용한 미사용 스크린샷 집합
+    coupons: list[dict]
+    created_at: datetime
+
+
+@dataclass
+class CouponOutcome:
+    """ 학습용 쿠폰 이력. is_used 이면 updated_at 이 사용 처리된 시각이다 """
+    id: str
+    title: str | None
+    brand: str | None
+    type: str | None
+    code: str | None
+    description: str | None
+    date: str | None
+    time: str | None
+    is_used: bool
+    updated_at: datetime
+
+
+def screenshot_fingerprint(screenshots: Iterable[tuple[str, datetime | None]]) -> str:
+    """ (id, updated_at) 목록으로 스크린샷 집합이 바뀌었는지 판단할 수 있는 해시 """
+    digest = hashlib.sha256()
+    for screenshot_id, updated_at in sorted(screenshots, key=lambda row: row[0]):
+        digest.update(f"{screenshot_id}|{updated_at.isoformat() if updated_at else ''}\n".encode("utf-8"))
+    return digest.hexdigest()
@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+from datetime import date
+
+from recommendation.domain.recommendation import CouponOutcome, RecommendationSnapshot
+
+
+class IRecommendationRepository(ABC):
+    @abstractmethod
+    def find(self, user_id: str, days: int, base_date: date) -> RecommendationSnapshot | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save(self, snapshot: RecommendationSnapshot) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_screenshot_fingerprint(self, user_id: str) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_user_ids_with_unused_coupons(self, after_user_id: str | None, limit: int) -> list[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_coupon_outcomes(self, after_id: str | None, limit: int) -> list[CouponOutcome]:
+        raise NotImplementedError
@@ -0,0 +1,18 @@
+from database import Base
+from sqlalchemy import Column, String, Integer, Date, DateTime, Text, ForeignKey
+from sqlalchemy.sql import func
+
+
+class Recommendation(Base):
+    """ 배치로 미리 계산한 쿠폰 추천 결과 """
+    __tablename__ = "recommendation"
+
+    user_id = Column(String(36), ForeignKey("user.id", ondelete="CASCADE"), primary_key=True)
+    days = Column(Integer, primary_key=True)
+    base_date = Column(Date, nullable=False)
+    fingerprint = Column(String(64), nullable=False)
+    coupons = Column(Text, nullable=False)  # 추천 결과 (JSON)
+    created_at = Column(DateTime, nullable=False, default=func.now())
+
+    def __repr__(self):
+        return f"<Recommendation(user_id={self.user_id}, days={self.days}, base_date={self.base_date})>"
@@ -0,0 +1,79 @@
+import json
+from datetime import date
+from database import SessionLocal
+from recommendation.domain.recommendation import CouponOutcome, RecommendationSnapshot, screenshot_fingerprint
+from recommendation.domain.repository.recommendation_repo import IRecommendationRepository
+from recommendation.infra.db_models.recommendation import Recommendation
+from screenshot.infra.db_models.screenshot import Screenshot
+from category.infra.db_models.category import Category
+from utils.db_utils import row_to_dict
+
+
+class RecommendationRepository(IRecommendationRepository):
+    def find(self, user_id: str, days: int, base_date: date) -> RecommendationSnapshot | None:
+        with SessionLocal() as db:
+            recommendation = (
+                db.query(Recommendation)
+                .filter(
+                    Recommendation.user_id == user_id,
+                    Recommendation.days == days,
+                    Recommendation.base_date == base_date,
+                )
+                .first()
+            )
+            if not recommendation:
+                return None
+
+            recommendation_dict = row_to_dict(recommendation)
+            recommendation_dict["coupons"] = json.loads(recommendation.coupons)
+            return RecommendationSnapshot(**recommendation_dict)
+
+    def save(self, snapshot: RecommendationSnapshot) -> None:
+        with SessionLocal() as db:
+            db.merge(Recommendation(
+                user_id=snapshot.user_id,
+                days=snapshot.days,
+                base_date=snapshot.base_date,
+                fingerprint=snapshot.fingerprint,
+                coupons=json.dumps(snapshot.coupons, ensure_ascii=False),
+                created_at=snapshot.created_at,
+            ))
+            db.commit()
+
+    def get_screenshot_fingerprint(self, user_id: str) -> str:
+        with SessionLocal() as db:
+            rows = (
+                db.query(Screenshot.id, Screenshot.updated_at)
+                .filter(Screenshot.user_id == user_id, Screenshot.is_used == False)
+                .all()
+            )
+            return screenshot_fingerprint((row.id, row.updated_at) for row in rows)
+
+    def find_user_ids_with_unused_coupons(self, after_user_id: str | None, limit: int) -> list[str]:
+        """ 미사용 쿠폰이 있는 사용자를 user_id 순으로 limit 명씩 (after_user_id 다음부터) """
+        with SessionLocal() as db:
+            query = (
+                db.query(Screenshot.user_id)
+                .join(Category, Screenshot.category_id == Category.id)
+                .filter(Category.name == "쿠폰", Screenshot.is_used == False)
+            )
+            if after_user_id is not None:
+                query = query.filter(Screenshot.user_id > after_user_id)
+            rows = query.distinct().order_by(Screenshot.user_id).limit(limit).all()
+            return [row.user_id for row in rows]
+
+    def find_coupon_outcomes(self, after_id: str | None, limit: int) -> list[CouponOutcome]:
+        """ 쿠폰 스크린샷을 id 순으로 limit 개씩 (after_id 다음부터). 필요한 컬럼만 읽는다 """
+        with SessionLocal() as db:
+            query = (
+                db.query(
+                    Screenshot.id, Screenshot.title, Screenshot.brand, Screenshot.type, Screenshot.code,
+                    Screenshot.description, Screenshot.date, Screenshot.time, Screenshot.is_used, Screenshot.updated_at,
+                )
+                .join(Category, Screenshot.category_id == Category.id)
+                .filter(Category.name == "쿠폰")
+            )
+            if after_id is not None:
+                query = query.filter(Screenshot.id > after_id)
+            rows = query.order_by(Screenshot.id).limit(limit).all()
+            return [CouponOutcome(**row._asdict()) for row in rows]
@@ -10,4 +10,453 @@ def recommendation_service():
 
 def test_get_recommendations(recommendation_service):
     # Assuming there are some books in the database that can be recommended
-    recommendations = recommendation_service.recommend_coupons()
\ No newline at end of file
+    recommendations = recommendation_service.recommend_coupons()
+
+def test_recommendation_model_loads_once_and_hot_reloads(tmp_path):
+    import os
+    import torch
+    from utils.infer import build_agent
+    from utils.reco3 import GRPOModel
+    from utils.reco_model import RecommendationModel
+
+    model_path = tmp_path / "model.pth"
+    torch.save(GRPOModel().state_dict(), model_path)
+    holder = RecommendationModel(model_path=str(model_path), check_interval_seconds=0)
+
+    model = holder.get()
+    assert not model.training
+    assert holder.get() is model  # 파일이 그대로면 다시 읽지 않는다
+
+    features = [[0.1] * 57, [0.2] * 57]
+    agent = build_agent(holder)
+    assert (agent._forward(features) == agent._forward(features)).all()  # eval 모드라 dropout 이 없다
+
+    torch.save(GRPOModel().state_dict(), model_path)
+    stat = os.stat(model_path)
+    os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert holder.get() is not model
+
+    model = holder.get()
+    model_path.write_bytes(b"broken")
+    os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000))
+    assert holder.get() is model  # 읽기에 실패하면 기존 모델을 유지한다
+
+    partial = GRPOModel().state_dict()
+    partial.pop("out_date.weight")
+    torch.save(partial, model_path)
+    os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 3_000_000))
+    assert holder.get() is model  # 키가 맞지 않는 체크포인트도 읽지 않는다
+
+
+def test_recommend_scores_coupons_in_one_batch():
+    import datetime
+    import torch
+    from utils.reco3 import Event, GRPOModel, GRPORecommendationAgent
+
+    torch.manual_seed(0)
+    model = GRPOModel().eval()
+    calls = []
+    model.register_forward_hook(lambda module, inputs, output: calls.append(inputs[0].shape))
+    agent = GRPORecommendationAgent(model=model)
+
+    base_date = datetime.date(2025, 1, 1)
+    coupons = [
+        Event({"title": f"쿠폰{i}", "brand": f"브랜드{i % 7}", "date": f"2025-01-{2 + i % 20:02d}"})
+        for i in range(40)
+    ]
+    coupons.append(Event({"title": "쿠폰0", "date": "2025-01-05"}))  # 같은 이름은 한 번만
+    coupons.append(Event({"title": "만료", "date": "2025-01-01"}))
+    fixed = [Event({"title": "공연", "date": "2025-01-02", "time": "12:00"})]
+
+    recommendations = agent.recommend(coupons, fixed, base_date, base_date + datetime.timedelta(days=30))
+
+    assert calls == [torch.Size([40, 57])]
+    assert len(recommendations) == 40
+    values = [rec["predicted_value"] for rec in recommendations]
+    assert values == sorted(values, reverse=True)
+    with torch.no_grad():
+        expected = model(torch.tensor([recommendations[0]["features"]])).mean().item()
+    assert abs(recommendations[0]["predicted_value"] - expected) < 1e-5
+    for rec in recommendations:
+        if rec["date"] == datetime.date(2025, 1, 2):
+            hour, minute = map(int, rec["time"].split(":"))
+            assert not 10 * 60 <= hour * 60 + minute <= 14 * 60
+
+
+def test_gazetteer_lookup(tmp_path):
+    from utils.gazetteer import Gazetteer, get_gazetteer
+
+    path = tmp_path / "gazetteer.tsv"
+    path.write_text(
+        "# name\tlat\tlon\taliases\n"
+        "부산\t35.1796\t129.0756\t부산광역시,busan\n"
+        "쿠알라룸푸르\t3.1390\t101.6869\tkuala lumpur\n",
+        encoding="utf-8",
+    )
+    gazetteer = Gazetteer(str(path))
+    assert gazetteer.lookup("BUSAN") == (35.1796, 129.0756)
+    assert gazetteer.lookup("부산광역시 해운대구") == (35.1796, 129.0756)  # 단어 묶음
+    assert gazetteer.lookup("부산역") == (35.1796, 129.0756)  # 접미사
+    assert gazetteer.lookup("쿠알라룸프르") == (3.1390, 101.6869)  # 오타
+    assert gazetteer.lookup("Kuala-Lumpur") == (3.1390, 101.6869)
+    assert gazetteer.lookup("알 수 없는 곳") is None
+
+    bundled = get_gazetteer()
+    assert bundled.lookup("서울대공원 주차장") is not None
+    assert bundled.lookup("볼로냐") is not None
+    assert bundled.lookup("도쿄 디즈니랜드") is not None
+    # 흔한 단어는 행정구역 접미사 없이는 지명으로 보지 않는다
+    for word in ["경기", "나라", "서면"]:
+        assert bundled.lookup(word) is None
+
+
+def test_word_vectors_are_deterministic_and_batched():
+    import os
+    import random
+    import subprocess
+    import sys
+    import numpy as np
+    from utils.reco3 import Event, FeatureExtractor, word_vector
+
+    extractor = FeatureExtractor()
+    state = random.getstate()
+    vector = extractor._get_word_vector("아메리카노")
+    assert random.getstate() == state  # 전역 random 을 건드리지 않는다
+    assert abs(np.linalg.norm(vector) - 1) < 1e-9
+
+    # PYTHONHASHSEED 가 달라도 같은 벡터
+    code = "from utils.reco3 import word_vector; print(word_vector('아메리카노').tolist())"
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+            env={**os.environ, "PYTHONHASHSEED": seed},
+        ).stdout.strip().splitlines()[-1]
+        for seed in ("1", "2")
+    }
+    assert outputs == {str(word_vector("아메리카노").tolist())}
+
+    events = [
+        Event({"title": "스타벅스 아메리카노", "brand": "스타벅스", "date": "2025-03-01", "location": "강남역"}),
+        Event({"title": "", "category": "쿠폰", "time": "12:30"}),
+    ]
+    batch = extractor.extract_features_batch(events)
+    assert batch == [extractor.extract_features(event) for event in events]
+    assert all(len(features) == 57 for features in batch)
+    expected_title = np.mean([word_vector("스타벅스"), word_vector("아메리카노")], axis=0)[:5]
+    title_offset = 3 * extractor.key_vector_size
+    assert np.allclose(batch[0][title_offset:title_offset + 5], expected_title)
+
+
+def test_free_slots_match_brute_force_and_choice_is_reproducible():
+    import datetime
+    import random
+    from utils.reco3 import Event, GRPOModel, GRPORecommendationAgent, free_slots, merge_intervals
+
+    assert merge_intervals([(600, 700), (650, 800), (900, 950), (960, 900)]) == [(600, 800), (900, 950)]
+
+    grid = list(range(9 * 60, 21 * 60 + 1, 15))
+    rng = random.Random(0)
+    for _ in range(200):
+        fixed = [rng.randrange(0, 24 * 60) for _ in range(rng.randrange(0, 5))]
+        expected = [
+            slot for slot in grid
+            if not any(max(540, m - 120) <= slot <= min(1260, m + 120) for m in fixed)
+        ] or grid
+        assert free_slots(fixed) == expected
+
+    base_date = datetime.date(2025, 1, 1)
+    coupons = [Event({"title": f"쿠폰{i}", "date": f"2025-0{1 + i % 3}-15"}) for i in range(30)]
+    fixed = [Event({"title": "회의", "date": "2025-01-15", "time": "13:00"})]
+    end_date = base_date + datetime.timedelta(days=90)
+
+    def times():
+        agent = GRPORecommendationAgent(model=GRPOModel().eval())
+        return {rec["coupon"]: rec["time"] for rec in agent.recommend(coupons, fixed, base_date, end_date)}
+
+    state = random.getstate()
+    assert times() == times()
+    assert random.getstate() == state
+
+
+
+class FakeCategory:
+    def __init__(self, name):
+        self.name = name
+
+
+def make_screenshot(screenshot_id, user_id, category, title, date, time=None):
+    from datetime import datetime
+    from screenshot.domain.screenshot import Screenshot
+
+    return Screenshot(
+        id=screenshot_id, user_id=user_id, title=title, category_id=category, description=None,
+        brand=f"{title} 브랜드", type=None, url="", date=date, time=time or "23:59", from_location=None,
+        to_location=None, location=None, details=None, start_date=None, end_date=None, price=None, code=None,
+        is_used=False, created_at=datetime(2025, 1, 1), updated_at=datetime(2025, 1, 1),
+        category=FakeCategory(category),
+    )
+
+
+class FakeScreenshotRepo:
+    def __init__(self, screenshots_by_user):
+        self.screenshots_by_user = screenshots_by_user
+        self.calls = 0
+        self.chunk_calls = 0
+
+    def get_screenshots(self, user_id, keywords, unused_only):
+        self.calls += 1
+        screenshots = self.screenshots_by_user.get(user_id, [])
+        return len(screenshots), list(screenshots)
+
+    def get_unused_screenshots_by_user_ids(self, user_ids):
+        self.chunk_calls += 1
+        return {user_id: list(self.screenshots_by_user.get(user_id, [])) for user_id in user_ids}
+
+
+class FakeRecommendationRepo:
+    def __init__(self, screenshot_repo):
+        self.screenshot_repo = screenshot_repo
+        self.snapshots = {}
+
+    def find(self, user_id, days, base_date):
+        snapshot = self.snapshots.get((user_id, days))
+        return snapshot if snapshot and snapshot.base_date == base_date else None
+
+    def save(self, snapshot):
+        self.snapshots[(snapshot.user_id, snapshot.days)] = snapshot
+
+    def get_screenshot_fingerprint(self, user_id):
+        from recommendation.domain.recommendation import screenshot_fingerprint
+
+        screenshots = self.screenshot_repo.screenshots_by_user.get(user_id, [])
+        return screenshot_fingerprint((screenshot.id, screenshot.updated_at) for screenshot in screenshots)
+
+    def find_user_ids_with_unused_coupons(self, after_user_id, limit):
+        user_ids = sorted(
+            user_id for user_id, screenshots in self.screenshot_repo.screenshots_by_user.items()
+            if any(screenshot.category.name == "쿠폰" for screenshot in screenshots)
+        )
+        return [user_id for user_id in user_ids if after_user_id is None or user_id > after_user_id][:limit]
+
+def test_recommendation_cache_versions_and_midnight_expiry():
+    from datetime import datetime
+    from recommendation.application.recommendation_cache import RecommendationCache
+    from recommendation.application.recommendation_service import RecommendationService
+    from utils.reco_model import RecommendationModel
+
+    now = [datetime(2025, 1, 1, 23, 0)]
+    cache = RecommendationCache(max_entries=2, clock=lambda: now[0])
+    coupons = [{"screenshot_id": "s1", "reco_time": "10:00"}]
+
+    cache.set("u1", 30, cache.version("u1"), coupons)
+    assert cache.get("u1", 30) == coupons
+    assert cache.get("u1", 7) is None
+
+    version = cache.version("u1")
+    cache.invalidate("u1")
+    assert cache.get("u1", 30) is None
+    cache.set("u1", 30, version, coupons)  # 계산 도중 무효화된 결과는 저장하지 않는다
+    assert cache.get("u1", 30) is None
+
+    cache.set("u1", 30, cache.version("u1"), coupons)
+    now[0] = datetime(2025, 1, 2, 0, 0)
+    assert cache.get("u1", 30) is None  # 자정에 만료
+
+    for user_id in ("u1", "u2", "u3"):
+        cache.set(user_id, 30, cache.version(user_id), coupons)
+    assert cache.get("u1", 30) is None and cache.get("u3", 30) == coupons
+
+    # 무효화 기록은 max_entries 명까지만 남고, 밀려난 사용자의 이전 결과도 쓰지 않는다
+    version = cache.version("u3")
+    for user_id in ("u3", "u4", "u5", "u6"):
+        cache.invalidate(user_id)
+    assert len(cache.invalidated) == 2
+    assert cache.get("u3", 30) is None
+    cache.set("u3", 30, version, coupons)
+    assert cache.get("u3", 30) is None
+    cache.set("u3", 30, cache.version("u3"), coupons)
+    assert cache.get("u3", 30) == coupons
+
+    repo = FakeScreenshotRepo({})
+    service = RecommendationService(repo, FakeRecommendationRepo(repo), RecommendationModel(), RecommendationCache())
+    assert service.recommend_coupons("u1", 30) == service.recommend_coupons("u1", 30)
+    assert repo.calls == 1
+    repo.screenshots_by_user["u1"] = [make_screenshot("s1", "u1", "쿠폰", "쿠폰", "2099-01-01")]
+    service.recommendation_cache.invalidate("u1")
+    service.recommend_coupons("u1", 30)
+    assert repo.calls == 2
+
+
+
+def test_precompute_recommendations_in_batches():
+    from datetime import date, timedelta
+    from recommendation.application.recommendation_cache import RecommendationCache
+    from recommendation.application.recommendation_service import RecommendationService
+    from utils.infer import infer, infer_many
+    from utils.reco_model import RecommendationModel
+
+    day = (date.today() + timedelta(days=3)).isoformat()
+    screenshots_by_user = {
+        f"u{i}": [
+            make_screenshot(f"s{i}-{j}", f"u{i}", "쿠폰", f"쿠폰 {i}-{j}", day) for j in range(i + 1)
+        ] + [make_screenshot(f"e{i}", f"u{i}", "약속", "약속", day, "12:00")]
+        for i in range(3)
+    }
+    screenshots_by_user["u3"] = []
+    screenshots_by_user["u4"] = [make_screenshot("e4", "u4", "약속", "약속", day, "12:00")]  # 쿠폰이 없는 사용자
+    screenshot_repo = FakeScreenshotRepo(screenshots_by_user)
+    recommendation_repo = FakeRecommendationRepo(screenshot_repo)
+    model = RecommendationModel(runtime="torch")
+    forwards = []
+    model.get().register_forward_hook(lambda module, inputs, output: forwards.append(inputs[0].shape[0]))
+    service = RecommendationService(screenshot_repo, recommendation_repo, model, RecommendationCache())
+
+    assert service.precompute_recommendations(days=30, chunk_size=2) == 3
+    assert forwards == [3, 3]  # 사용자 2명(쿠폰 1+2개), 1명(쿠폰 3개)
+    assert screenshot_repo.calls == 0 and screenshot_repo.chunk_calls == 2  # chunk 마다 한 번 조회
+    assert set(recommendation_repo.snapshots) == {("u0", 30), ("u1", 30), ("u2", 30)}
+
+    datas = [
+        {"쿠폰": [{"id": s.id, "title": s.title, "date": s.date} for s in screenshots_by_user[user_id][:-1]]}
+        for user_id in ("u0", "u1", "u2")
+    ]
+    assert infer_many(datas + [{}], 30, model) == [infer(data, 30, model) for data in datas] + [[]]
+
+    # 저장된 결과를 읽고, 스크린샷이 바뀌었으면 다시 계산한다
+    calls = screenshot_repo.calls
+    coupons = service.recommend_coupons("u1", 30)
+    assert screenshot_repo.calls == calls
+    assert coupons == recommendation_repo.snapshots[("u1", 30)].coupons
+    assert [c["screenshot_id"] for c in coupons if c["is_reco"]] == [
+        c["screenshot_id"] for c in coupons[:2]
+    ]
+
+    screenshots_by_user["u2"].pop(0)
+    service.recommend_coupons("u2", 30)
+    assert screenshot_repo.calls == calls + 1
+    assert len([c for c in recommendation_repo.snapshots[("u2", 30)].coupons if c["is_reco"]]) == 2
+
+
+
+def test_numpy_runtime_matches_torch_model(tmp_path):
+    import os
+    import numpy as np
+    import torch
+    from utils.infer import build_agent
+    from utils.reco3 import GRPOModel
+    from utils.reco_model import RecommendationModel
+    from utils.reco_runtime import NumpyGRPOModel, export_numpy, max_abs_difference
+
+    checkpoint = tmp_path / "model.pth"
+    torch.manual_seed(0)
+    model = GRPOModel()
+    for parameter in model.parameters():  # LayerNorm 의 기본값(1, 0) 이 아닌 값도 확인한다
+        torch.nn.init.normal_(parameter, std=0.5)
+    torch.save(model.state_dict(), checkpoint)
+
+    numpy_path = export_numpy(str(checkpoint))
+    assert numpy_path == str(tmp_path / "model.npz")
+    assert max_abs_difference(str(checkpoint), numpy_path) < 1e-4
+
+    features = np.random.default_rng(1).uniform(-1, 1, size=(8, 57)).astype(np.float32)
+    with torch.no_grad():
+        expected = model.eval()(torch.from_numpy(features)).numpy()
+    assert np.allclose(NumpyGRPOModel.load(numpy_path)(features), expected, atol=1e-4)
+
+    holder = RecommendationModel(model_path=str(checkpoint), check_interval_seconds=0, runtime="numpy")
+    assert isinstance(holder.get(), NumpyGRPOModel)
+    assert np.allclose(build_agent(holder)._forward(features.tolist()), expected, atol=1e-4)
+
+    # 체크포인트가 다시 학습되고 아직 export 되지 않았으면 체크포인트를 쓴다
+    torch.save(GRPOModel().state_dict(), checkpoint)
+    stat = os.stat(checkpoint)
+    os.utime(checkpoint, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert isinstance(holder.get(), GRPOModel)
+    export_numpy(str(checkpoint))
+    assert isinstance(holder.get(), NumpyGRPOModel)
+
+    assert np.allclose(max_abs_difference("models/grpo_recommendation_model.pth", "models/grpo_recommendation_model.npz"), 0, atol=1e-5)
+
+
+def test_replay_buffer_wraps_around():
+    import numpy as np
+    from utils.reco3 import ReplayBuffer
+
+    buffer = ReplayBuffer(4, feature_dim=1, target_dim=1)
+    buffer.add([[0], [1], [2]], [[0], [1], [2]])
+    buffer.add([[3], [4]], [[3], [4]])
+    assert len(buffer) == 4
+    assert sorted(buffer.features[:, 0].tolist()) == [1, 2, 3, 4]  # 가장 오래된 0 이 덮어써진다
+
+    features, targets = buffer.sample(3, np.random.default_rng(0))
+    assert features.shape == (3, 1) and np.array_equal(features, targets)
+    assert len(set(features[:, 0].tolist())) == 3
+
+
+def test_offline_training_checkpoints_and_publishes(tmp_path):
+    import os
+    from datetime import date, datetime
+    import torch
+    from recommendation.application.recommendation_trainer import RecommendationTrainer, outcome_target
+    from recommendation.domain.recommendation import CouponOutcome
+    from utils.reco3 import GRPORecommendationAgent, GRPOModel, ReplayBuffer
+    from utils.reco_runtime import checkpoint_digest, exported_checkpoint_digest
+
+    today = date(2025, 1, 10)
+
+    def outcome(id, is_used, expires_on, updated_at=datetime(2025, 1, 6, 18, 30)):
+        return CouponOutcome(
+            id=f"{id:04d}", title=f"쿠폰 {id}", brand="스타벅스", type="기프티콘", code=None,
+            description=None, date=expires_on, time=None, is_used=is_used, updated_at=updated_at,
+        )
+
+    assert outcome_target(outcome(1, True, "2025-01-08"), today) == [1.0, 18.5 / 24, 1.0, 0.0]
+    assert outcome_target(outcome(1, True, "2025-01-05"), today)[2] == 0.0
+    assert outcome_target(outcome(1, False, "2025-01-05"), today) == [0.0, 0.0, 0.0, 0.0]
+    assert outcome_target(outcome(1, False, "2099-01-01"), today) is None
+
+    class OutcomeRepo:
+        def __init__(self, outcomes):
+            self.outcomes = outcomes
+            self.calls = []
+
+        def find_coupon_outcomes(self, after_id, limit):
+            self.calls.append((after_id, limit))
+            rest = [o for o in self.outcomes if after_id is None or o.id > after_id]
+            return rest[:limit]
+
+    repo = OutcomeRepo([outcome(i, i % 3 != 0, "2025-01-05") for i in range(50)])
+    agent = GRPORecommendationAgent(window_days=30, seed=0)
+    agent.memory = ReplayBuffer(20)
+    trainer = RecommendationTrainer(repo, agent, str(tmp_path / "checkpoints"), version="20250110040000")
+
+    losses = trainer.train(epochs=2, chunk_size=16, batch_size=8)
+    assert len(losses) == 2 and all(loss == loss for loss in losses)
+    assert repo.calls[:4] == [(None, 16), ("0015", 16), ("0031", 16), ("0047", 16)]
+    assert sorted(os.listdir(tmp_path / "checkpoints")) == [
+        "grpo-20250110040000-epoch001.pth", "grpo-20250110040000-epoch002.pth",
+    ]
+
+    resumed = RecommendationTrainer(
+        repo, GRPORecommendationAgent(window_days=30, seed=0), str(tmp_path / "checkpoints"), version="20250109040000",
+    )
+    assert resumed.load_checkpoint(str(tmp_path / "checkpoints" / "grpo-20250110040000-epoch002.pth")) == 2
+    assert (resumed.version, resumed.resumed_from) == ("20250109040000", "20250110040000")
+
+    model_path = tmp_path / "model.pth"
+    torch.save(GRPOModel().state_dict(), model_path)
+    versioned_path = trainer.publish(str(model_path))
+    assert versioned_path == str(tmp_path / "model-20250110040000.pth")
+    assert model_path.read_bytes() == (tmp_path / "model-20250110040000.pth").read_bytes()
+    assert exported_checkpoint_digest(str(tmp_path / "model.npz")) == checkpoint_digest(str(model_path))
+
+    trainer.version = "20250111040000"
+    trainer.publish(str(model_path), keep_versions=1)
+    assert sorted(p.name for p in tmp_path.glob("model-*.pth")) == ["model-20250111040000.pth"]
+
+    # 이어서 학습한 모델은 원래 버전을 덮어쓰지 않고, 이름이 더 오래된 버전처럼 보여도 지워지지 않는다
+    resumed.train(epochs=3, chunk_size=16, batch_size=8, start_epoch=2)
+    assert (tmp_path / "checkpoints" / "grpo-20250109040000-epoch003.pth").exists()
+    assert resumed.publish(str(model_path), keep_versions=1) == str(tmp_path / "model-20250109040000.pth")
+    assert sorted(p.name for p in tmp_path.glob("model-*.pth")) == ["model-20250109040000.pth"]
+    assert model_path.read_bytes() == (tmp_path / "model-20250109040000.pth").read_bytes()
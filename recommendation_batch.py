@@ -0,0 +1,61 @@
+"""
+쿠폰 추천 사전 계산.
+
+미사용 스크린샷이 있는 사용자들의 추천을 묶음 단위로 계산해서 recommendation 테이블에 저장한다.
+notification_worker 가 매일 recommendation_precompute_hour 이후에 한 번 실행하고, 직접 실행할 수도 있다.
+
+    python recommendation_batch.py --days 30 --chunk-size 100
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from fastapi_utilities import repeat_every
+from recommendation.application.recommendation_cache import RecommendationCache
+from recommendation.application.recommendation_service import RecommendationService
+from recommendation.infra.repository.recommendation_repo import RecommendationRepository
+from screenshot.infra.repository.screenshot_repo import ScreenshotRepository
+from utils.reco_model import RecommendationModel
+from config import get_settings
+from utils.logger import logger
+
+
+settings = get_settings()
+
+last_precomputed_on = None
+
+
+def build_recommendation_service() -> RecommendationService:
+    return RecommendationService(
+        screenshot_repo=ScreenshotRepository(),
+        recommendation_repo=RecommendationRepository(),
+        recommendation_model=RecommendationModel(),
+        recommendation_cache=RecommendationCache(),
+    )
+
+
+@repeat_every(seconds=10 * 60, logger=logger)
+async def precompute_recommendations():
+    global last_precomputed_on
+    now = datetime.now()
+    if now.hour < settings.recommendation_precompute_hour or last_precomputed_on == now.date():
+        return
+    computed = await asyncio.to_thread(build_recommendation_service().precompute_recommendations)
+    # 실패하면(예외) 기록하지 않으므로 다음 주기에 다시 시도한다
+    last_precomputed_on = now.date()
+    print(f"🎯 Precomputed recommendations for {computed} users.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute coupon recommendations")
+    parser.add_argument("--days", type=int, default=settings.recommendation_precompute_days)
+    parser.add_argument("--chunk-size", type=int, default=settings.recommendation_precompute_chunk_size)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    computed = build_recommendation_service().precompute_recommendations(args.days, args.chunk_size)
+    print(f"🎯 Precomputed recommendations for {computed} users in {time.perf_counter() - started:.1f}s.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+GRPO 추천 모델 오프라인 학습.
+
+DB 의 쿠폰 사용 이력을 chunk 단위로 읽어 학습하고, epoch 마다 체크포인트를 남긴 뒤
+버전이 붙은 모델을 만들어 서빙 경로(recommendation_model_path)를 교체한다.
+API 서버는 파일 변경을 감지해서 새 모델을 읽으므로 멈출 필요가 없다.
+
+    python recommendation_train.py --epochs 3
+    python recommendation_train.py --resume models/checkpoints/grpo-20250101040000-epoch002.pth --epochs 5
+"""
+import argparse
+import os
+import time
+import torch
+from recommendation.application.recommendation_trainer import RecommendationTrainer
+from recommendation.infra.repository.recommendation_repo import RecommendationRepository
+from utils.reco3 import GRPORecommendationAgent, ReplayBuffer, load_config
+from config import get_settings
+
+
+settings = get_settings()
+CONFIG = load_config()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train the GRPO recommendation model from usage history")
+    parser.add_argument("--epochs", type=int, default=CONFIG["training_epochs"])
+    parser.add_argument("--chunk-size", type=int, default=1000, help="DB 에서 한 번에 읽을 쿠폰 수")
+    parser.add_argument("--batch-size", type=int, default=CONFIG["batch_size"])
+    parser.add_argument("--buffer-size", type=int, default=100_000, help="replay buffer 크기")
+    parser.add_argument("--checkpoint-dir", default=os.path.join(CONFIG["model_dir"], "checkpoints"))
+    parser.add_argument("--model-path", default=settings.recommendation_model_path)
+    parser.add_argument("--resume", help="이어서 학습할 체크포인트")
+    parser.add_argument("--from-scratch", action="store_true", help="현재 서빙 모델 대신 초기화된 모델에서 시작한다")
+    parser.add_argument("--keep-versions", type=int, default=5)
+    parser.add_argument("--no-publish", action="store_true", help="체크포인트만 남기고 서빙 모델은 바꾸지 않는다")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    torch.manual_seed(args.seed)
+
+    agent = GRPORecommendationAgent(window_days=CONFIG["window_days"], seed=args.seed)
+    agent.memory = ReplayBuffer(args.buffer_size)
+    trainer = RecommendationTrainer(RecommendationRepository(), agent, args.checkpoint_dir)
+
+    start_epoch = 0
+    if args.resume:
+        start_epoch = trainer.load_checkpoint(args.resume)
+    elif not args.from_scratch and os.path.exists(args.model_path):
+        agent.model.load_state_dict(torch.load(args.model_path, map_location="cpu", weights_only=True))
+
+    started = time.perf_counter()
+    losses = trainer.train(args.epochs, args.chunk_size, args.batch_size, start_epoch=start_epoch)
+    print(f"Trained {len(losses)} epochs in {time.perf_counter() - started:.1f}s, losses={losses}")
+
+    if not args.no_publish:
+        print(f"Published {trainer.publish(args.model_path, args.keep_versions)} -> {args.model_path}")
+
+
+if __name__ == "__main__":
+    main()
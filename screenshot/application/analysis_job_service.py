@@ -0,0 +1,116 @@
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable
+from dataclasses import asdict
+from datetime import datetime
+from fastapi import HTTPException
+from ulid import ULID
+from config import get_settings
+from screenshot.application.screenshot_service import ScreenshotService
+from screenshot.domain.analysis_job import AnalysisJob, JOB_PENDING, JOB_RUNNING, JOB_DONE, JOB_FAILED
+from screenshot.domain.repository.analysis_job_repo import IAnalysisJobRepository
+from user.domain.repository.user_repo import IUserRepository
+from notification.infra.push.fcm_push import send_push_notification
+from utils.scratch import ScratchSpace
+from utils.logger import logger
+
+
+settings = get_settings()
+
+# 분석 작업을 실행하는 로컬 워커 풀. 요청 스레드는 작업을 넣고 바로 반환된다
+analysis_executor = ThreadPoolExecutor(
+    max_workers=settings.analysis_job_workers,
+    thread_name_prefix="analysis-job",
+)
+# 작업마다 blob 저장/분석 두 개를 실행하므로 워커 수의 두 배. 단건 업로드 풀과 나눠서 서로 막지 않는다
+analysis_pipeline_executor = ThreadPoolExecutor(
+    max_workers=2 * settings.analysis_job_workers,
+    thread_name_prefix="analysis-pipeline",
+)
+
+
+class AnalysisJobService:
+    def __init__(
+            self,
+            job_repo: IAnalysisJobRepository,
+            screenshot_service: ScreenshotService,
+            user_repo: IUserRepository,
+            executor: Executor = analysis_executor,
+            pipeline_executor: Executor = analysis_pipeline_executor,
+            send_push: Callable[[str, dict], None] = send_push_notification,
+            instance_id: str | None = None,
+    ):
+        self.job_repo = job_repo
+        self.screenshot_service = screenshot_service
+        self.user_repo = user_repo
+        self.executor = executor
+        self.pipeline_executor = pipeline_executor
+        self.send_push = send_push
+        self.instance_id = instance_id or settings.instance_id
+        self.ulid = ULID()
+
+    def submit(
+            self,
+            user_id: str,
+            scratch: ScratchSpace,
+            file_path: str,
+            file_name: str | None = None,
+            notify: bool = False,
+    ) -> AnalysisJob:
+        """ 분석 작업을 등록하고 워커 풀에 넣는다. scratch 는 작업이 끝나면 정리된다 """
+        now = datetime.now()
+        job = AnalysisJob(
+            id=self.ulid.generate(),
+            user_id=user_id,
+            status=JOB_PENDING,
+            file_name=file_name,
+            notify=notify,
+            result=None,
+            error=None,
+            created_at=now,
+            updated_at=now,
+            owner=self.instance_id,
+        )
+        try:
+            self.job_repo.save(job)
+            self.executor.submit(self.run_job, job, scratch, file_path)
+        except Exception:
+            scratch.cleanup()
+            raise
+        return job
+
+    def get_job(self, user_id: str, job_id: str) -> AnalysisJob:
+        return self.job_repo.find_by_id(user_id, job_id)
+
+    def run_job(self, job: AnalysisJob, scratch: ScratchSpace, file_path: str):
+        try:
+            self.job_repo.update_status(job.id, JOB_RUNNING)
+            screenshot = self.screenshot_service.upload_screenshot_image(job.user_id, file_path, self.pipeline_executor)
+        except Exception as e:
+            logger.error(f"Analysis job {job.id} failed: {e}")
+            error = e.detail if isinstance(e, HTTPException) else str(e)
+            self.job_repo.update_status(job.id, JOB_FAILED, error=error)
+            return
+        finally:
+            scratch.cleanup()
+
+        self.job_repo.update_status(job.id, JOB_DONE, result=asdict(screenshot))
+        if job.notify:
+            self.notify_user(job, screenshot.title)
+
+    def notify_user(self, job: AnalysisJob, title: str | None):
+        try:
+            user = self.user_repo.find_by_id(job.user_id)
+        except Exception as e:
+            logger.error(f"Analysis job {job.id}: failed to load user for push: {e}")
+            return
+        if not user or not user.fcm_token:
+            return
+        message = f"'{title}' 스크린샷 분석이 완료되었습니다." if title else "스크린샷 분석이 완료되었습니다."
+        self.send_push(user.fcm_token, {"message": message})
+
+    def fail_unfinished_jobs(self) -> int:
+        """
+        이 인스턴스가 재시작 전에 끝내지 못한 작업은 실패로 표시한다 (작업은 프로세스 메모리의 워커 풀에서만 실행된다).
+        다른 인스턴스가 실행 중인 작업은 건드리지 않는다.
+        """
+        return self.job_repo.fail_unfinished(self.instance_id, "Interrupted by server restart")
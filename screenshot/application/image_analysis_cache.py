@@ -0,0 +1,187 @@
+import asyncio
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from typing import Iterator
+from fastapi_utilities import repeat_every
+from config import get_settings
+from screenshot.domain.repository.image_analysis_cache_repo import IImageAnalysisCacheRepository
+from screenshot.infra.repository.image_analysis_cache_repo import ImageAnalysisCacheRepository
+from utils.ai import PROMPT_VERSION
+from utils.ai_backend import AIBackend
+from utils.image import preprocess_version as current_preprocess_version
+from utils.logger import logger
+
+
+settings = get_settings()
+
+
+class AnalysisCacheStats:
+    """ 분석 결과 캐시 적중률 (프로세스 단위) """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0  # 캐시 조회/저장 실패. 분석은 그대로 진행된다
+        self.purged = 0
+
+    def observe(self, hit: bool):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def observe_error(self):
+        with self.lock:
+            self.errors += 1
+
+    def observe_purge(self, deleted: int):
+        with self.lock:
+            self.purged += deleted
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "purged": self.purged,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+analysis_cache_stats = AnalysisCacheStats()
+
+
+def is_cacheable(result) -> bool:
+    """ 분석에 성공한 결과([객체] 또는 [[객체, ...]])만 저장한다. JSON 파싱에 실패하면 [None] 이 온다 """
+    if not isinstance(result, list) or not result:
+        return False
+    items = result[0] if isinstance(result[0], list) else result
+    return bool(items) and all(isinstance(item, dict) for item in items)
+
+
+def hash_image(image: str) -> str:
+    """ 이미지 파일 내용의 SHA-256 """
+    digest = hashlib.sha256()
+    with open(image, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ImageAnalysisCache(AIBackend):
+    """
+    AImodule.analyze_image 앞에 두는 내용 기반 캐시.
+    같은 이미지(바이트 단위로 동일)와 같은 프롬프트/전처리 버전이면 Azure OpenAI 를 다시 호출하지 않는다.
+    캐시 오류는 분석을 막지 않는다.
+    """
+
+    def __init__(
+            self,
+            ai_module: AIBackend,
+            cache_repo: IImageAnalysisCacheRepository,
+            ttl_hours: int | None = None,
+            prompt_version: str = PROMPT_VERSION,
+            preprocess_version: str | None = None,
+            stats: AnalysisCacheStats = analysis_cache_stats,
+    ):
+        self.ai_module = ai_module
+        self.cache_repo = cache_repo
+        self.ttl_hours = settings.analysis_cache_ttl_hours if ttl_hours is None else ttl_hours
+        self.prompt_version = prompt_version
+        self.preprocess_version = preprocess_version or current_preprocess_version()
+        self.stats = stats
+
+    @property
+    def cache_version(self) -> str:
+        """ 캐시 테이블의 prompt_version 컬럼에 저장하는 값 (프롬프트 버전:전처리 버전) """
+        return f"{self.prompt_version}:{self.preprocess_version}"
+
+    def __getattr__(self, name):
+        # analyze_image 외의 호출(extract_json_from_string 등)은 감싼 AImodule 로 넘긴다
+        if name == "ai_module":
+            raise AttributeError(name)
+        return getattr(self.ai_module, name)
+
+    def transcribe_keywords(self, audio: bytes) -> list[str]:
+        return self.ai_module.transcribe_keywords(audio)
+
+    def analyze_image(self, image: str) -> list:
+        image_hash = hash_image(image)
+        try:
+            cached = self.cache_repo.find(image_hash, self.cache_version)
+        except Exception as e:
+            logger.warning(f"Image analysis cache lookup failed: {e}")
+            self.stats.observe_error()
+            cached = None
+
+        if cached is not None:
+            self.stats.observe(hit=True)
+            return cached
+
+        self.stats.observe(hit=False)
+        result = self.ai_module.analyze_image(image)
+        if not is_cacheable(result):
+            return result
+        try:
+            expires_at = datetime.now() + timedelta(hours=self.ttl_hours)
+            self.cache_repo.save(image_hash, self.cache_version, result, expires_at)
+        except Exception as e:
+            logger.warning(f"Image analysis cache save failed: {e}")
+            self.stats.observe_error()
+        return result
+
+    def stream_analyze_image(self, image: str) -> Iterator[tuple[str, dict]]:
+        """ 캐시에 있으면 저장된 결과를 이벤트로 재생하고, 없으면 스트리밍 결과를 모아서 저장한다 """
+        image_hash = hash_image(image)
+        try:
+            cached = self.cache_repo.find(image_hash, self.cache_version)
+        except Exception as e:
+            logger.warning(f"Image analysis cache lookup failed: {e}")
+            self.stats.observe_error()
+            cached = None
+
+        if cached is not None:
+            self.stats.observe(hit=True)
+            items = cached[0] if isinstance(cached[0], list) else cached
+            for index, item in enumerate(items):
+                for key, value in (item or {}).items():
+                    yield "field", {"index": index, "key": key, "value": value}
+                yield "item", {"index": index, "value": item}
+            return
+
+        self.stats.observe(hit=False)
+        items = []
+        failed = False
+        for event, data in self.ai_module.stream_analyze_image(image):
+            if event == "item":
+                items.append(data["value"])
+            elif event == "error":
+                failed = True
+            yield event, data
+
+        if failed or not items:
+            return
+        # analyze_image 와 같은 형태로 저장한다 (객체 하나면 [객체], 여러 개면 [[객체, ...]])
+        result = [items[0] if len(items) == 1 else items]
+        try:
+            expires_at = datetime.now() + timedelta(hours=self.ttl_hours)
+            self.cache_repo.save(image_hash, self.cache_version, result, expires_at)
+        except Exception as e:
+            logger.warning(f"Image analysis cache save failed: {e}")
+            self.stats.observe_error()
+
+
+@repeat_every(seconds=60 * 60, logger=logger)
+async def purge_expired_analysis_cache():
+    deleted = await asyncio.to_thread(ImageAnalysisCacheRepository().delete_expired)
+    analysis_cache_stats.observe_purge(deleted)
+    if deleted:
+        print(f"🗑️ Purged {deleted} expired image analysis cache entries.")
@@ -7,18 +7,109 @@ from notification.domain.notification import Notification
 from ulid import ULID
 from dependency_injector.wiring import inject
 from datetime import datetime
-from utils.ai import AImodule
+from utils.ai_backend import AIBackend
 from screenshot.infra.storage.azure_blob import AzureBlobStorage
+from recommendation.application.recommendation_cache import RecommendationCache
 import os
 from utils.logger import logger
 from utils.common import get_time_description
-from utils.gpt4audio import azure_audio_request
 from utils.vectorsearch4 import VectorSearchEngine
 from utils.ai import extract_data_from_screenshots
 from collections import defaultdict
 from dataclasses import asdict
-from pydub import AudioSegment
+from utils.audio import transcode_for_speech
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import BinaryIO, Callable, Iterator
+from fastapi import HTTPException
+from config import get_settings
 import pytz
+import time
+
+
+settings = get_settings()
+
+# 단건 업로드 파이프라인(blob 저장, 이미지 분석)의 스레드 풀. 일괄 업로드/분석 작업은 각자의 풀을 쓴다
+upload_executor = ThreadPoolExecutor(
+    max_workers=settings.upload_pipeline_workers,
+    thread_name_prefix="upload",
+)
+# 일괄 업로드 풀. 파일마다 작업이 두 개이므로 동시에 처리하는 파일 수의 두 배
+batch_upload_executor = ThreadPoolExecutor(
+    max_workers=2 * settings.upload_batch_concurrency,
+    thread_name_prefix="upload-batch",
+)
+
+QUEUE_POLL_SECONDS = 0.1
+
+
+class StartedTask:
+    """
+    풀에 넣은 시각과 실행을 시작한 시각을 기록하는 작업.
+    실행 제한 시간은 시작한 뒤부터 재고, 큐에서 기다리는 시간은 따로 제한한다.
+    """
+
+    def __init__(self, executor: Executor, fn: Callable, *args):
+        self.submitted_at = time.monotonic()
+        self.started_at = None
+        self.future: Future = executor.submit(self._run, fn, *args)
+
+    def _run(self, fn: Callable, *args):
+        self.started_at = time.monotonic()
+        return fn(*args)
+
+    def deadline(self, timeout: float, queue_timeout: float) -> float:
+        if self.started_at is None:
+            return self.submitted_at + queue_timeout
+        return self.started_at + timeout
+
+
+def check_tasks(tasks: list[StartedTask], timeout: float, queue_timeout: float) -> bool:
+    """
+    모두 끝났으면 True. 실패한 작업이 있으면 그 예외를 올리고, 실행을 시작한 뒤 timeout 안에 끝나지 않았거나
+    queue_timeout 동안 시작하지 못한 작업이 있으면 504 를 올린다.
+    """
+    now = time.monotonic()
+    for task in tasks:
+        if task.future.done():
+            if task.future.exception():
+                raise task.future.exception()
+        elif task.deadline(timeout, queue_timeout) <= now:
+            raise HTTPException(status_code=504, detail="Screenshot upload timed out")
+    return all(task.future.done() for task in tasks)
+
+
+def next_check_seconds(tasks: list[StartedTask], timeout: float, queue_timeout: float) -> float:
+    """ 다음 마감 시각까지 남은 시간. 아직 큐에 있는 작업이 있으면 시작했는지 주기적으로 확인한다 """
+    now = time.monotonic()
+    running = [task for task in tasks if not task.future.done()]
+    seconds = min((task.deadline(timeout, queue_timeout) for task in running), default=now) - now
+    if any(task.started_at is None for task in running):
+        seconds = min(seconds, QUEUE_POLL_SECONDS)
+    return max(seconds, 0.0)
+
+
+def wait_for_tasks(tasks: list[StartedTask], timeout: float, queue_timeout: float):
+    """ check_tasks 가 True 가 될 때까지 기다린다 """
+    while not check_tasks(tasks, timeout, queue_timeout):
+        wait(
+            [task.future for task in tasks if not task.future.done()],
+            timeout=next_check_seconds(tasks, timeout, queue_timeout),
+            return_when=FIRST_COMPLETED,
+        )
+
+
+def settle_tasks(tasks: list[StartedTask], timeout: float):
+    """
+    아직 큐에 있는 작업은 취소하고, 실행 중인 작업은 마감 시각까지 끝나기를 기다린다.
+    호출한 쪽이 scratch 디렉터리를 정리해도 작업이 읽던 파일이 사라지지 않도록 반환 전에 부른다.
+    (마감 시각을 넘긴 작업은 취소할 수 없으므로 기다리지 않는다)
+    """
+    for task in tasks:
+        task.future.cancel()
+    for task in tasks:
+        if task.future.done() or task.started_at is None:
+            continue
+        wait([task.future], timeout=max(task.started_at + timeout - time.monotonic(), 0.0))
 
 
 def get_notification_message(
@@ -47,15 +138,18 @@ class ScreenshotService:
     @inject
     def __init__(self,
                 screenshot_repo: IScreenshotRepository, 
-                ai_module: AImodule,
+                ai_module: AIBackend,
                 category_repo: ICategoryRepository,
                 notification_repo: INotificationRepository,
+                storage=None,
+                recommendation_cache: RecommendationCache | None = None,
             ):
         self.screenshot_repo = screenshot_repo
         self.category_repo = category_repo
         self.notification_repo = notification_repo
         self.ai_module = ai_module
-        self.storage = AzureBlobStorage()
+        self.storage = storage or AzureBlobStorage()
+        self.recommendation_cache = recommendation_cache
         self.ulid = ULID()
         self.vectorsearch = VectorSearchEngine(vector_dim=12, debug=False, advanced_embedding=True, base_threshold=0.6, match_threshold=0.5)
 
@@ -71,27 +165,18 @@ class ScreenshotService:
     def get_screenshots_with_audio(
             self,
             user_id: str,
-            file_path: str,
-            unused_only: bool = True
+            audio_file: BinaryIO | str,
+            unused_only: bool = True,
+            audio_format: str | None = "m4a",
     ) -> tuple[int, list[Screenshot]]:
-        audio = AudioSegment.from_file(file_path, format="m4a")
-        audio.export(f"temp/{user_id}.wav", format="wav")
-        audio_file_path = f"temp/{user_id}.wav"
-
-        keywords = azure_audio_request(audio_file_path)
+        """ audio_file: 업로드된 파일 객체 또는 경로. 16 kHz 모노 WAV 로 메모리에서 변환해서 보낸다 """
+        keywords = self.ai_module.transcribe_keywords(transcode_for_speech(audio_file, audio_format))
         total, screenshots = self.screenshot_repo.get_screenshots(user_id, None, unused_only)
         data = extract_data_from_screenshots([asdict(screenshot) for screenshot in screenshots])
         results = self.vectorsearch.vector_search(data, keywords)
 
         total = len(results)
         screenshots = [ self.screenshot_repo.find_by_id(user_id, screenshot['id']) for screenshot in results ]
-
-        try:
-            os.remove(file_path)
-            os.remove(audio_file_path)
-        except Exception as e:
-            logger.error(f"Failed to remove temp directory: {e}")
-
         return total, screenshots
     
     def get_screenshot(
@@ -173,6 +258,7 @@ class ScreenshotService:
 
         self.screenshot_repo.save(user_id, screenshot)
         self.notification_repo.save_all(notification_vos)
+        self._invalidate_recommendations(user_id)
         return screenshot
     
     def update_screenshot(
@@ -253,6 +339,7 @@ class ScreenshotService:
 
         self.screenshot_repo.update(user_id, screenshot)
         self.notification_repo.save_all(notification_vos)
+        self._invalidate_recommendations(user_id)
         return screenshot
     
     def delete_screenshot(
@@ -261,6 +348,7 @@ class ScreenshotService:
             screenshot_id: str
     ):
         self.screenshot_repo.delete(user_id, screenshot_id)
+        self._invalidate_recommendations(user_id)
 
     
     def get_screenshot_by_category(
@@ -281,15 +369,79 @@ class ScreenshotService:
             self,
             user_id: str,
             file_path: str,
+            executor: Executor | None = None,
     ) -> Screenshot:
-        url = self.storage.upload_image(file_path, f'{user_id}/{file_path}')
-        analyze_result = self.ai_module.analyze_image(file_path)[0]
+        """
+        executor 는 blob 저장/분석을 실행할 풀 (기본은 단건 업로드 풀).
+        file_path 는 호출한 쪽(ScratchSpace)이 정리한다. 반환하기 전에 파일을 읽는 작업을 모두 정리한다.
+        """
+        upload_task, analyze_task, blob_name = self._start_upload(user_id, file_path, executor or upload_executor)
+        try:
+            wait_for_tasks([upload_task, analyze_task], settings.upload_timeout_seconds, settings.upload_queue_timeout_seconds)
+            url = upload_task.future.result()
+            analyze_result = analyze_task.future.result()[0]
+        except Exception:
+            self._abort_upload(upload_task, analyze_task, blob_name)
+            settle_tasks([upload_task, analyze_task], settings.upload_timeout_seconds)
+            raise
+
+        return self._build_screenshot(user_id, url, analyze_result)
+
+    def _start_upload(self, user_id: str, file_path: str, executor: Executor) -> tuple[StartedTask, StartedTask, str]:
+        blob_name = self._blob_name(user_id, file_path)
+        # blob 저장과 이미지 분석은 서로 의존하지 않으므로 동시에 실행한다
+        upload_task = StartedTask(executor, self.storage.upload_image, file_path, blob_name)
+        analyze_task = StartedTask(executor, self.ai_module.analyze_image, file_path)
+        return upload_task, analyze_task, blob_name
 
+    def _abort_upload(self, upload_task: StartedTask, analyze_task: StartedTask, blob_name: str):
+        analyze_task.future.cancel()
+        upload_task.future.cancel()
+        # 업로드가 끝났거나 나중에 끝나더라도 저장된 blob 은 지운다
+        upload_task.future.add_done_callback(lambda future: self._delete_uploaded_blob(future, blob_name))
+
+    def stream_screenshot_image(
+            self,
+            user_id: str,
+            file_path: str,
+    ) -> Iterator[tuple[str, dict]]:
+        """
+        upload_screenshot_image 의 스트리밍 버전.
+        분석 결과의 필드/아이템을 완성되는 대로 돌려주고, 마지막에 done 이벤트로 스크린샷을 돌려준다.
+        """
+        blob_name = self._blob_name(user_id, file_path)
+        upload_task = StartedTask(upload_executor, self.storage.upload_image, file_path, blob_name)
         try:
-            os.remove(file_path)
+            items = []
+            for event, data in self.ai_module.stream_analyze_image(file_path):
+                if event == "item":
+                    items.append(data["value"])
+                elif event == "error":
+                    raise HTTPException(status_code=502, detail=data["detail"])
+                yield event, data
+            if not items:
+                raise HTTPException(status_code=502, detail="Empty analysis result")
+
+            wait_for_tasks([upload_task], settings.upload_timeout_seconds, settings.upload_queue_timeout_seconds)
+            url = upload_task.future.result()
+            yield "done", asdict(self._build_screenshot(user_id, url, items[0]))
+        except GeneratorExit:
+            # 클라이언트 연결이 끊겨도 scratch 를 정리하기 전에 업로드를 정리한다
+            self._abort_stream_upload(upload_task, blob_name)
+            raise
         except Exception as e:
-            logger.error(f"Failed to remove file: {file_path}")
+            logger.error(f"Streaming upload failed for {file_path}: {e}")
+            self._abort_stream_upload(upload_task, blob_name)
+            status_code = e.status_code if isinstance(e, HTTPException) else 500
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            yield "error", {"status_code": status_code, "detail": detail}
+
+    def _abort_stream_upload(self, upload_task: StartedTask, blob_name: str):
+        upload_task.future.cancel()
+        upload_task.future.add_done_callback(lambda future: self._delete_uploaded_blob(future, blob_name))
+        settle_tasks([upload_task], settings.upload_timeout_seconds)
 
+    def _build_screenshot(self, user_id: str, url: str, analyze_result: dict) -> Screenshot:
         category = self.category_repo.find_by_name(analyze_result.get("category", None))
 
         screenshot = Screenshot(
@@ -317,16 +469,92 @@ class ScreenshotService:
             notifications=[],
         )
         return screenshot
-    
+
+    def upload_screenshot_images(
+            self,
+            user_id: str,
+            file_paths: list[str],
+            max_concurrency: int | None = None,
+    ) -> Iterator[tuple[int, Screenshot | None, Exception | None]]:
+        """
+        여러 이미지를 동시에 업로드/분석하고 끝나는 순서대로 (인덱스, 결과, 오류)를 돌려준다.
+        작업은 일괄 업로드 풀에 바로 넣고, 한 번에 max_concurrency 개 파일까지만 진행한다.
+        """
+        max_concurrency = max(1, max_concurrency or settings.upload_batch_concurrency)
+        timeouts = (settings.upload_timeout_seconds, settings.upload_queue_timeout_seconds)
+        queued = iter(enumerate(file_paths))
+        in_flight = {}
+        aborted = []
+
+        def start_next():
+            for index, file_path in queued:
+                in_flight[index] = self._start_upload(user_id, file_path, batch_upload_executor)
+                return
+
+        for _ in range(max_concurrency):
+            start_next()
+
+        try:
+            while in_flight:
+                finished = False
+                for index, (upload_task, analyze_task, blob_name) in list(in_flight.items()):
+                    try:
+                        if not check_tasks([upload_task, analyze_task], *timeouts):
+                            continue
+                        result = (index, self._build_screenshot(
+                            user_id, upload_task.future.result(), analyze_task.future.result()[0],
+                        ), None)
+                    except Exception as e:
+                        logger.error(f"Batch upload failed for {file_paths[index]}: {e}")
+                        self._abort_upload(upload_task, analyze_task, blob_name)
+                        aborted.extend([upload_task, analyze_task])
+                        result = (index, None, e)
+                    del in_flight[index]
+                    start_next()
+                    finished = True
+                    yield result
+
+                if not finished and in_flight:
+                    tasks = [task for upload_task, analyze_task, _ in in_flight.values() for task in (upload_task, analyze_task)]
+                    wait(
+                        [task.future for task in tasks if not task.future.done()],
+                        timeout=next_check_seconds(tasks, *timeouts),
+                        return_when=FIRST_COMPLETED,
+                    )
+        finally:
+            # 중간에 끊겨도(클라이언트 연결 종료) scratch 를 정리하기 전에 남은 작업을 정리한다
+            for upload_task, analyze_task, blob_name in in_flight.values():
+                self._abort_upload(upload_task, analyze_task, blob_name)
+                aborted.extend([upload_task, analyze_task])
+            settle_tasks(aborted, settings.upload_timeout_seconds)
+
+    def _blob_name(self, user_id: str, file_path: str) -> str:
+        """ user_id/<scratch 디렉터리>/<파일 이름> """
+        return f"{user_id}/{os.path.basename(os.path.dirname(file_path))}/{os.path.basename(file_path)}"
+
+    def _delete_uploaded_blob(self, upload_future, blob_name: str):
+        if upload_future.cancelled() or upload_future.exception():
+            return
+        try:
+            self.storage.delete_image(blob_name)
+        except Exception as e:
+            logger.error(f"Failed to delete blob {blob_name}: {e}")
+
     def set_used(self, user_id, screenshot_id, used=True):
         screenshot = self.get_screenshot(user_id, screenshot_id)
         if screenshot:
             screenshot.is_used = used
             self.screenshot_repo.update(user_id, screenshot)
+            self._invalidate_recommendations(user_id)
         return screenshot
     
     def delete_outdated(self, user_id):
         total_count, screenshots = self.screenshot_repo.get_screenshots(user_id, keywords=None, unused_only=False)
         for screenshot in screenshots:
             if screenshot.is_used or screenshot.end_date < datetime.now():
-                self.screenshot_repo.delete(user_id, screenshot.id)
\ No newline at end of file
+                self.screenshot_repo.delete(user_id, screenshot.id)
+        self._invalidate_recommendations(user_id)
+
+    def _invalidate_recommendations(self, user_id: str):
+        if self.recommendation_cache is not None:
+            self.recommendation_cache.invalidate(user_id)
\ No newline at end of file
@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+@dataclass
+class AnalysisJob:
+    id: str
+    user_id: str
+    status: str
+    file_name: str | None
+    notify: bool
+    result: dict | None
+    error: str | None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: datetime | None = None
+    owner: str | None = None  # 작업을 실행하는 인스턴스 (settings.instance_id)
@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+
+from screenshot.domain.analysis_job import AnalysisJob
+
+
+class IAnalysisJobRepository(ABC):
+    @abstractmethod
+    def save(self, job: AnalysisJob) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_by_id(self, user_id: str, job_id: str) -> AnalysisJob:
+        raise NotImplementedError
+
+    @abstractmethod
+    def update_status(self, job_id: str, status: str, result: dict | None = None, error: str | None = None) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def fail_unfinished(self, owner: str, error: str) -> int:
+        raise NotImplementedError
@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+
+class IImageAnalysisCacheRepository(ABC):
+    @abstractmethod
+    def find(self, image_hash: str, prompt_version: str) -> list | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save(self, image_hash: str, prompt_version: str, result: list, expires_at: datetime):
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_expired(self) -> int:
+        raise NotImplementedError
@@ -8,6 +8,10 @@ class IScreenshotRepository(ABC):
     def get_screenshots(self, user_id: str, keywords: list[str], unused_only: bool) -> tuple[int, list[Screenshot]]:
         raise NotImplementedError
 
+    @abstractmethod
+    def get_unused_screenshots_by_user_ids(self, user_ids: list[str]) -> dict[str, list[Screenshot]]:
+        raise NotImplementedError
+
     @abstractmethod
     def find_by_id(self, user_id: str, screenshot_id: str) -> Screenshot:
         raise NotImplementedError
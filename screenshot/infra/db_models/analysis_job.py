@@ -0,0 +1,26 @@
+from database import Base
+from sqlalchemy import Column, String, DateTime, Text, Boolean, ForeignKey, Index
+from sqlalchemy.sql import func
+
+
+class AnalysisJob(Base):
+    """ 백그라운드 이미지 분석 작업 """
+    __tablename__ = "analysis_job"
+    __table_args__ = (
+        Index("ix_analysis_job_status", "status"),
+    )
+
+    id = Column(String(36), primary_key=True)
+    user_id = Column(String(36), ForeignKey("user.id", ondelete="CASCADE"), nullable=False, index=True)
+    status = Column(String(16), nullable=False)  # pending, running, done, failed
+    file_name = Column(String(255), nullable=True)
+    notify = Column(Boolean, nullable=False, default=False)  # 완료 시 푸시 알림 여부
+    result = Column(Text, nullable=True)  # 분석된 스크린샷 (JSON)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=func.now())
+    updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime, nullable=True)
+    owner = Column(String(255), nullable=True)  # 작업을 실행하는 인스턴스
+
+    def __repr__(self):
+        return f"<AnalysisJob(id={self.id}, user_id={self.user_id}, status={self.status})>"
@@ -0,0 +1,17 @@
+from database import Base
+from sqlalchemy import Column, String, DateTime, Text
+from sqlalchemy.sql import func
+
+
+class ImageAnalysisCache(Base):
+    """ 이미지 내용(SHA-256)과 프롬프트 버전별 analyze_image 결과 """
+    __tablename__ = "image_analysis_cache"
+
+    image_hash = Column(String(64), primary_key=True)
+    prompt_version = Column(String(16), primary_key=True)  # "프롬프트 버전:전처리 버전"
+    result = Column(Text, nullable=False)  # analyze_image 결과 (JSON)
+    created_at = Column(DateTime, nullable=False, default=func.now())
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<ImageAnalysisCache(image_hash={self.image_hash}, prompt_version={self.prompt_version}, expires_at={self.expires_at})>"
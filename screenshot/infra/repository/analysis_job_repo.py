@@ -0,0 +1,73 @@
+import json
+from datetime import datetime
+from database import SessionLocal
+from fastapi import HTTPException
+from screenshot.domain.analysis_job import AnalysisJob as AnalysisJobVO, JOB_PENDING, JOB_RUNNING, JOB_DONE, JOB_FAILED
+from screenshot.domain.repository.analysis_job_repo import IAnalysisJobRepository
+from screenshot.infra.db_models.analysis_job import AnalysisJob
+from utils.db_utils import row_to_dict
+
+
+class AnalysisJobRepository(IAnalysisJobRepository):
+    def save(self, job: AnalysisJobVO) -> None:
+        with SessionLocal() as db:
+            db.add(AnalysisJob(
+                id=job.id,
+                user_id=job.user_id,
+                status=job.status,
+                file_name=job.file_name,
+                notify=job.notify,
+                owner=job.owner,
+                created_at=job.created_at,
+                updated_at=job.updated_at,
+            ))
+            db.commit()
+
+    def find_by_id(self, user_id: str, job_id: str) -> AnalysisJobVO:
+        with SessionLocal() as db:
+            job = (
+                db.query(AnalysisJob)
+                .filter(AnalysisJob.user_id == user_id, AnalysisJob.id == job_id)
+                .first()
+            )
+            if not job:
+                raise HTTPException(status_code=422, detail="Analysis job not found")
+
+            job_dict = row_to_dict(job)
+            job_dict["result"] = json.loads(job.result) if job.result else None
+            return AnalysisJobVO(**job_dict)
+
+    def update_status(self, job_id: str, status: str, result: dict | None = None, error: str | None = None) -> None:
+        with SessionLocal() as db:
+            values = {
+                AnalysisJob.status: status,
+                AnalysisJob.updated_at: datetime.now(),
+            }
+            if result is not None:
+                values[AnalysisJob.result] = json.dumps(result, ensure_ascii=False, default=str)
+            if error is not None:
+                values[AnalysisJob.error] = error
+            if status in (JOB_DONE, JOB_FAILED):
+                values[AnalysisJob.finished_at] = datetime.now()
+            db.query(AnalysisJob).filter(AnalysisJob.id == job_id).update(values, synchronize_session=False)
+            db.commit()
+
+    def fail_unfinished(self, owner: str, error: str) -> int:
+        """ owner 인스턴스가 재시작되어 더 이상 진행되지 않는 작업을 실패로 표시 (다른 인스턴스의 작업은 그대로 둔다) """
+        with SessionLocal() as db:
+            now = datetime.now()
+            failed = (
+                db.query(AnalysisJob)
+                .filter(AnalysisJob.owner == owner, AnalysisJob.status.in_([JOB_PENDING, JOB_RUNNING]))
+                .update(
+                    {
+                        AnalysisJob.status: JOB_FAILED,
+                        AnalysisJob.error: error,
+                        AnalysisJob.updated_at: now,
+                        AnalysisJob.finished_at: now,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return failed
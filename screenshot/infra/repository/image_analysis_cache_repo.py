@@ -0,0 +1,45 @@
+import json
+from datetime import datetime
+from database import SessionLocal
+from screenshot.domain.repository.image_analysis_cache_repo import IImageAnalysisCacheRepository
+from screenshot.infra.db_models.image_analysis_cache import ImageAnalysisCache
+
+
+class ImageAnalysisCacheRepository(IImageAnalysisCacheRepository):
+    def find(self, image_hash: str, prompt_version: str) -> list | None:
+        """ 만료되지 않은 분석 결과 조회 """
+        with SessionLocal() as db:
+            cached = (
+                db.query(ImageAnalysisCache.result)
+                .filter(
+                    ImageAnalysisCache.image_hash == image_hash,
+                    ImageAnalysisCache.prompt_version == prompt_version,
+                    ImageAnalysisCache.expires_at > datetime.now(),
+                )
+                .first()
+            )
+            if not cached:
+                return None
+            return json.loads(cached.result)
+
+    def save(self, image_hash: str, prompt_version: str, result: list, expires_at: datetime):
+        """ 분석 결과 저장 (이미 있으면 덮어쓴다) """
+        with SessionLocal() as db:
+            db.merge(ImageAnalysisCache(
+                image_hash=image_hash,
+                prompt_version=prompt_version,
+                result=json.dumps(result, ensure_ascii=False),
+                created_at=datetime.now(),
+                expires_at=expires_at,
+            ))
+            db.commit()
+
+    def delete_expired(self) -> int:
+        with SessionLocal() as db:
+            deleted = (
+                db.query(ImageAnalysisCache)
+                .filter(ImageAnalysisCache.expires_at <= datetime.now())
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+            return deleted
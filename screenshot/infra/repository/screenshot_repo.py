@@ -2,7 +2,7 @@ from screenshot.infra.db_models.screenshot import Screenshot
 from category.infra.db_models.category import Category
 from notification.infra.db_models.notification import Notification
 from screenshot.domain.repository.screenshot_repo import IScreenshotRepository
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy import or_
 from screenshot.domain.screenshot import Screenshot as ScreenshotVO
 from category.domain.category import Category as CategoryVO
@@ -49,20 +49,37 @@ class ScreenshotRepository(IScreenshotRepository):
             screenshots = query.all()
             total_count = len(screenshots)
             
-            screenshot_vos = []
+            return total_count, [self._to_listed_vo(screenshot) for screenshot in screenshots]
+
+    def get_unused_screenshots_by_user_ids(self, user_ids: list[str]) -> dict[str, list[ScreenshotVO]]:
+        """ 여러 사용자의 미사용 스크린샷을 한 번의 조회로 (사용자 순서/스크린샷 형식은 get_screenshots 와 같다) """
+        if not user_ids:
+            return {}
+        with SessionLocal() as db:
+            screenshots = (
+                db.query(Screenshot)
+                .filter(Screenshot.user_id.in_(user_ids), Screenshot.is_used == False)
+                .options(joinedload(Screenshot.category), selectinload(Screenshot.notifications))
+                .all()
+            )
+            screenshots_by_user = {user_id: [] for user_id in user_ids}
             for screenshot in screenshots:
-                notification_vos = []
-                for notification in screenshot.notifications:
-                    noti = row_to_dict(notification)
-                    noti['time_description'] = get_time_description(notification.notification_time)
-                    notification_vos.append(NotificationVO(**noti))
+                screenshots_by_user[screenshot.user_id].append(self._to_listed_vo(screenshot))
+            return screenshots_by_user
 
-                screenshot_vo = ScreenshotVO(**row_to_dict(screenshot))
-                screenshot_vo.notifications = notification_vos
-                screenshot_vo.date = screenshot_vo.date if screenshot_vo.date else '2099-12-31'
-                screenshot_vo.time = screenshot_vo.time if screenshot_vo.time else '00:00'
-                screenshot_vos.append(screenshot_vo)
-            return total_count, screenshot_vos
+    @staticmethod
+    def _to_listed_vo(screenshot: Screenshot) -> ScreenshotVO:
+        notification_vos = []
+        for notification in screenshot.notifications:
+            noti = row_to_dict(notification)
+            noti['time_description'] = get_time_description(notification.notification_time)
+            notification_vos.append(NotificationVO(**noti))
+
+        screenshot_vo = ScreenshotVO(**row_to_dict(screenshot))
+        screenshot_vo.notifications = notification_vos
+        screenshot_vo.date = screenshot_vo.date if screenshot_vo.date else '2099-12-31'
+        screenshot_vo.time = screenshot_vo.time if screenshot_vo.time else '00:00'
+        return screenshot_vo
 
     
     def find_by_id(self, user_id: str, screenshot_id: str):
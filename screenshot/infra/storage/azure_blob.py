@@ -17,6 +17,10 @@ class AzureBlobStorage:
 
         return blob_client.url
     
+    def delete_image(self, blob_name: str):
+        blob_client = self.container_client.get_blob_client(blob_name)
+        blob_client.delete_blob()
+
     def download_image(self, blob_name: str, file_path: str):
         blob_client = self.container_client.get_blob_client(blob_name)
 
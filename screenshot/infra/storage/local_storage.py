@@ -0,0 +1,23 @@
+import os
+import shutil
+from pathlib import Path
+from config import get_settings
+
+settings = get_settings()
+
+class LocalBlobStorage:
+    """ AzureBlobStorage 와 같은 인터페이스로 로컬 디렉터리에 저장 (오프라인 개발/벤치마크용) """
+    def __init__(self, root: str | None = None):
+        self.root = Path(root or settings.local_storage_root)
+
+    def upload_image(self, file_path: str, blob_name: str):
+        target = self.root / blob_name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(file_path, target)
+        return target.resolve().as_uri()
+
+    def delete_image(self, blob_name: str):
+        os.remove(self.root / blob_name)
+
+    def download_image(self, blob_name: str, file_path: str):
+        shutil.copyfile(self.root / blob_name, file_path)
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel
+from common.auth import CurrentUser, get_admin_user
+from screenshot.application.image_analysis_cache import analysis_cache_stats
+
+router = APIRouter(prefix="/admin/metrics")
+
+
+class AnalysisCacheMetricsResponse(BaseModel):
+    hits: int
+    misses: int
+    errors: int
+    purged: int
+    hit_rate: float
+
+
+@router.get("/analysis-cache", response_model=AnalysisCacheMetricsResponse)
+def get_analysis_cache_metrics(
+        current_user: CurrentUser = Depends(get_admin_user),
+) -> AnalysisCacheMetricsResponse:
+    """ 이미지 분석 결과 캐시 적중률 (현재 프로세스 기준) """
+    return analysis_cache_stats.snapshot()
@@ -1,14 +1,22 @@
+from contextlib import closing
 from dataclasses import asdict
-from fastapi import APIRouter, Depends, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from dependency_injector.wiring import inject, Provide
 from typing import Annotated
 from common.auth import CurrentUser, get_current_user
 from containers import Container
 from screenshot.application.screenshot_service import ScreenshotService
+from screenshot.application.analysis_job_service import AnalysisJobService
 from notification.interface.controllers.notification_controller import NotificationResponse
+from config import get_settings
 from datetime import datetime
-import shutil
+import json
+from utils.scratch import ScratchSpace
+
+
+settings = get_settings()
 
 
 router = APIRouter(prefix="/screenshot")
@@ -65,6 +73,17 @@ class GetScreenshotsResponse(BaseModel):
     screenshots: list[ScreenshotResponse]
 
 
+class AnalysisJobResponse(BaseModel):
+    id: str
+    status: str
+    file_name: str | None
+    result: ScreenshotResponse | None = None
+    error: str | None = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: datetime | None = None
+
+
 class UpdateScreenshotBody(BaseModel):
     title: str | None = Field(default=None, min_length=1, max_length=64)
     category_id: str | None = Field(default=None, min_length=1)
@@ -93,14 +112,125 @@ def upload_screenshot(
         screenshot_service: ScreenshotService = Depends(Provide[Container.screenshot_service]),
         file: UploadFile | None = None
 ) -> ScreenshotResponse:
-    file_path = f"temp/{file.filename}"
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    response = screenshot_service.upload_screenshot_image(current_user.id, file_path)
+    with ScratchSpace() as scratch:
+        file_path = scratch.save_upload(file.file, file.filename)
+        response = screenshot_service.upload_screenshot_image(current_user.id, file_path)
     return response
 
 
+@router.post("/upload/batch")
+@inject
+def upload_screenshots(
+        current_user: Annotated[CurrentUser, Depends(get_current_user)],
+        files: list[UploadFile],
+        screenshot_service: ScreenshotService = Depends(Provide[Container.screenshot_service]),
+) -> StreamingResponse:
+    """
+    여러 스크린샷을 한 번에 업로드/분석한다.
+    결과는 끝나는 순서대로 한 줄에 하나씩 JSON(NDJSON)으로 내려보낸다.
+    """
+    if len(files) > settings.upload_batch_max_files:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Too many files (max {settings.upload_batch_max_files})",
+        )
+
+    scratch = ScratchSpace()
+    try:
+        file_paths = [scratch.save_upload(file.file, file.filename) for file in files]
+    except Exception:
+        scratch.cleanup()
+        raise
+
+    def results():
+        # 생성기를 먼저 닫아서 남은 업로드 작업을 정리한 뒤에 scratch 를 지운다
+        with scratch, closing(screenshot_service.upload_screenshot_images(current_user.id, file_paths)) as uploads:
+            for index, screenshot, error in uploads:
+                line = {"index": index, "filename": files[index].filename}
+                try:
+                    if error:
+                        raise error
+                    line["status"] = "ok"
+                    line["screenshot"] = ScreenshotResponse(**asdict(screenshot)).model_dump(mode="json")
+                except HTTPException as e:
+                    line.update(status="error", status_code=e.status_code, detail=e.detail)
+                except Exception as e:
+                    line.update(status="error", status_code=500, detail=str(e))
+                yield json.dumps(line, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+@router.post("/upload/stream")
+@inject
+def upload_screenshot_stream(
+        current_user: Annotated[CurrentUser, Depends(get_current_user)],
+        file: UploadFile,
+        screenshot_service: ScreenshotService = Depends(Provide[Container.screenshot_service]),
+) -> StreamingResponse:
+    """
+    /upload 의 SSE 버전. 분석 결과를 모델이 만드는 대로 이벤트로 내려보낸다.
+
+    - field: {"index", "key", "value"} 아이템의 필드 하나가 완성됨
+    - item: {"index", "value"} 아이템 하나가 완성됨
+    - done: /upload 와 같은 형태의 스크린샷
+    - error: {"status_code", "detail"}
+    """
+    scratch = ScratchSpace()
+    try:
+        file_path = scratch.save_upload(file.file, file.filename)
+    except Exception:
+        scratch.cleanup()
+        raise
+
+    def events():
+        with scratch, closing(screenshot_service.stream_screenshot_image(current_user.id, file_path)) as stream:
+            for event, data in stream:
+                if event == "done":
+                    try:
+                        data = ScreenshotResponse(**data).model_dump(mode="json")
+                    except Exception as e:
+                        event, data = "error", {"status_code": 500, "detail": str(e)}
+                yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/jobs", status_code=202, response_model=AnalysisJobResponse)
+@inject
+def create_analysis_job(
+        current_user: Annotated[CurrentUser, Depends(get_current_user)],
+        file: UploadFile,
+        notify: bool = False,
+        analysis_job_service: AnalysisJobService = Depends(Provide[Container.analysis_job_service]),
+) -> AnalysisJobResponse:
+    """ 업로드/분석을 백그라운드 작업으로 등록하고 바로 반환한다. 결과는 GET /screenshot/jobs/{job_id} 로 조회 """
+    scratch = ScratchSpace()
+    try:
+        file_path = scratch.save_upload(file.file, file.filename)
+    except Exception:
+        scratch.cleanup()
+        raise
+
+    job = analysis_job_service.submit(current_user.id, scratch, file_path, file.filename, notify)
+    return asdict(job)
+
+
+@router.get("/jobs/{job_id}", response_model=AnalysisJobResponse)
+@inject
+def get_analysis_job(
+        current_user: Annotated[CurrentUser, Depends(get_current_user)],
+        job_id: str,
+        analysis_job_service: AnalysisJobService = Depends(Provide[Container.analysis_job_service]),
+) -> AnalysisJobResponse:
+    job = analysis_job_service.get_job(current_user.id, job_id)
+    return asdict(job)
+
+
 @router.post("", status_code=201, response_model=ScreenshotResponse)
 @inject
 def create_screenshot(
@@ -144,11 +274,7 @@ def audio_search(
         file: UploadFile,
         screenshot_service: ScreenshotService = Depends(Provide[Container.screenshot_service])
 ) -> GetScreenshotsResponse:
-    file_path = f"temp/{current_user.id}.m4a"
-    with open(file_path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
-
-    total_count, screenshots = screenshot_service.get_screenshots_with_audio(current_user.id, file_path)
+    total_count, screenshots = screenshot_service.get_screenshots_with_audio(current_user.id, file.file)
     screenshot_responses = [ asdict(screenshot) for screenshot in screenshots ]
     response = GetScreenshotsResponse(
         total_count=total_count,
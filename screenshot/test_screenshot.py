@@ -1,7 +1,15 @@
+import io
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pytest
 from user.infra.repository.user_repo import UserRepository
 from screenshot.infra.repository.screenshot_repo import ScreenshotRepository
 from screenshot.application.screenshot_service import ScreenshotService
+from screenshot.application.analysis_job_service import AnalysisJobService
+from screenshot.domain.analysis_job import AnalysisJob
+from screenshot.application.image_analysis_cache import ImageAnalysisCache, AnalysisCacheStats
 from category.infra.repository.category_repo import CategoryRepository
 from category.application.category_service import CategoryService
 from notification.application.notification_service import NotificationService
@@ -12,9 +20,17 @@ from user.domain.user import User as UserVO
 from notification.domain.notification import Notification as NotificationVO
 from screenshot.domain.screenshot import Screenshot as ScreenshotVO
 from utils import ai
+from utils.image import prepare_image_for_vision, preprocess_version
+from utils.json_stream import JsonStreamParser
+from utils.audio import transcode_for_speech
+from utils.scratch import ScratchSpace, sweep_scratch_root
+from utils.ai_replay import ReplayAIBackend, ReplayBackendError
+from recommendation.application.recommendation_cache import RecommendationCache
 from fastapi.exceptions import HTTPException
 from user.domain.user import User
 from database import Base, engine
+from PIL import Image
+from pydub import AudioSegment
 
 
 
@@ -209,6 +225,17 @@ def test_set_is_used(testscreenshot, screenshot_service, notification_service):
     assert screenshot.is_used == False
 
 
+def test_set_is_used_invalidates_recommendations(testscreenshot, screenshot_service):
+    user, category, screenshot = testscreenshot
+    screenshot_service.recommendation_cache = RecommendationCache()
+    version = screenshot_service.recommendation_cache.version(user.id)
+
+    screenshot_service.set_used(user.id, screenshot.id)
+    assert screenshot_service.recommendation_cache.version(user.id) == version + 1
+    screenshot_service.delete_screenshot(user.id, screenshot.id)
+    assert screenshot_service.recommendation_cache.version(user.id) == version + 2
+
+
 def test_delete_outdated_screenshot(testscreenshot, screenshot_service, notification_service):
     user, category, screenshot = testscreenshot
     screenshot = screenshot_service.create_screenshot(
@@ -241,6 +268,532 @@ def test_audio_search(testscreenshot, screenshot_service):
     """ testaudio: 다음주에 만료되는 쿠폰 찾아줘 """
     user, category, screenshot = testscreenshot
 
-    total_count, screenshot = screenshot_service.get_screenshots_with_audio(user_id=user.id, file_path='testdata/testaudio.m4a')
+    total_count, screenshot = screenshot_service.get_screenshots_with_audio(user_id=user.id, audio_file='testdata/testaudio.m4a')
     assert len(screenshot) == 1
 
+
+class SlowStorage:
+    def __init__(self):
+        self.deleted = []
+
+    def upload_image(self, file_path, blob_name):
+        time.sleep(0.3)
+        return f"https://example.com/{blob_name}"
+
+    def delete_image(self, blob_name):
+        self.deleted.append(blob_name)
+
+
+class SlowAImodule:
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def analyze_image(self, image):
+        time.sleep(0.3)
+        if self.fail:
+            raise RuntimeError("analysis failed")
+        return [{"category": "쿠폰", "title": "아메리카노"}]
+
+
+class FakeCategoryRepo:
+    def find_by_name(self, name):
+        return None
+
+
+def make_upload_file(tmp_path):
+    file_path = tmp_path / "upload.jpg"
+    file_path.write_bytes(b"image")
+    return str(file_path)
+
+
+def test_upload_screenshot_image_runs_concurrently(tmp_path):
+    service = ScreenshotService(
+        screenshot_repo=None,
+        ai_module=SlowAImodule(),
+        category_repo=FakeCategoryRepo(),
+        notification_repo=None,
+    )
+    service.storage = SlowStorage()
+    file_path = make_upload_file(tmp_path)
+
+    started = time.monotonic()
+    screenshot = service.upload_screenshot_image("user", file_path)
+    assert time.monotonic() - started < 0.55
+    assert screenshot.title == "아메리카노"
+    # 파일은 호출한 쪽(ScratchSpace)이 정리한다
+    assert os.path.exists(file_path)
+
+
+def test_upload_screenshot_image_cleans_up_blob_on_failure(tmp_path):
+    service = ScreenshotService(
+        screenshot_repo=None,
+        ai_module=SlowAImodule(fail=True),
+        category_repo=FakeCategoryRepo(),
+        notification_repo=None,
+    )
+    service.storage = SlowStorage()
+    file_path = make_upload_file(tmp_path)
+
+    with pytest.raises(RuntimeError):
+        service.upload_screenshot_image("user", file_path)
+    time.sleep(0.1)
+    assert service.storage.deleted == [f"user/{tmp_path.name}/upload.jpg"]
+
+
+def test_upload_screenshot_image_timeout_excludes_queue_time(tmp_path, monkeypatch):
+    from screenshot.application import screenshot_service
+
+    monkeypatch.setattr(screenshot_service.settings, "upload_timeout_seconds", 0.5)
+    service = ScreenshotService(
+        screenshot_repo=None,
+        ai_module=SlowAImodule(),
+        category_repo=FakeCategoryRepo(),
+        notification_repo=None,
+    )
+    service.storage = SlowStorage()
+    executor = ThreadPoolExecutor(max_workers=2)
+    # 다른 작업이 풀을 0.4초 동안 차지해서 큐 대기 + 실행(0.3초) 은 제한 시간을 넘는다
+    for _ in range(2):
+        executor.submit(time.sleep, 0.4)
+
+    screenshot = service.upload_screenshot_image("user", make_upload_file(tmp_path), executor)
+    assert screenshot.title == "아메리카노"
+    executor.shutdown(wait=True)
+
+
+class BlockingStorage(SlowStorage):
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.file_existed = None
+
+    def upload_image(self, file_path, blob_name):
+        self.release.wait(5)
+        self.file_existed = os.path.exists(file_path)
+        return f"https://example.com/{blob_name}"
+
+
+class FailingAImodule:
+    def analyze_image(self, image):
+        raise RuntimeError("analysis failed")
+
+
+def test_upload_screenshot_image_keeps_file_until_upload_finishes(tmp_path):
+    service = ScreenshotService(
+        screenshot_repo=None,
+        ai_module=FailingAImodule(),
+        category_repo=FakeCategoryRepo(),
+        notification_repo=None,
+    )
+    service.storage = BlockingStorage()
+    executor = ThreadPoolExecutor(max_workers=2)
+    file_path = make_upload_file(tmp_path)
+    threading.Timer(0.2, service.storage.release.set).start()
+
+    # 분석이 먼저 실패해도 이미 시작한 업로드가 파일을 다 읽은 뒤에 반환한다
+    with pytest.raises(RuntimeError):
+        service.upload_screenshot_image("user", file_path, executor)
+    assert service.storage.file_existed
+    assert os.path.exists(file_path)
+    executor.shutdown(wait=True)
+    assert service.storage.deleted == [f"user/{tmp_path.name}/upload.jpg"]
+
+
+def test_upload_screenshot_image_times_out_in_queue(tmp_path, monkeypatch):
+    from screenshot.application import screenshot_service
+
+    monkeypatch.setattr(screenshot_service.settings, "upload_queue_timeout_seconds", 0.2)
+    service = ScreenshotService(
+        screenshot_repo=None,
+        ai_module=SlowAImodule(),
+        category_repo=FakeCategoryRepo(),
+        notification_repo=None,
+    )
+    service.storage = BlockingStorage()
+    executor = ThreadPoolExecutor(max_workers=1)
+    executor.submit(time.sleep, 0.6)
+
+    started = time.monotonic()
+    with pytest.raises(HTTPException) as exc_info:
+        service.upload_screenshot_image("user", make_upload_file(tmp_path), executor)
+    assert exc_info.value.status_code == 504
+    assert time.monotonic() - started < 0.5
+
+    # 큐에 있던 작업은 취소되어 실행되지 않는다
+    executor.shutdown(wait=True)
+    assert service.storage.file_existed is None
+
+
+class FlakyAImodule:
+    def analyze_image(self, image):
+        return SlowAImodule(fail="bad" in image).analyze_image(image)
+
+
+def test_upload_screenshot_images_in_parallel(tmp_path):
+    service = ScreenshotService(
+        screenshot_repo=None,
+        ai_module=FlakyAImodule(),
+        category_repo=FakeCategoryRepo(),
+        notification_repo=None,
+    )
+    service.storage = SlowStorage()
+    file_paths = []
+    for name in ["a", "b", "bad", "c"]:
+        file_path = tmp_path / f"{name}.jpg"
+        file_path.write_bytes(b"image")
+        file_paths.append(str(file_path))
+
+    started = time.monotonic()
+    results = {index: (screenshot, error) for index, screenshot, error in service.upload_screenshot_images("user", file_paths, max_concurrency=4)}
+    assert time.monotonic() - started < 0.9
+    assert sorted(results) == [0, 1, 2, 3]
+    assert isinstance(results[2][1], RuntimeError)
+    assert all(results[index][0].title == "아메리카노" for index in [0, 1, 3])
+
+
+class CountingStorage(SlowStorage):
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.threads = set()
+
+    def upload_image(self, file_path, blob_name):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.threads.add(threading.current_thread().name)
+        try:
+            return super().upload_image(file_path, blob_name)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def test_upload_screenshot_images_limits_files_in_flight(tmp_path):
+    service = ScreenshotService(
+        screenshot_repo=None,
+        ai_module=SlowAImodule(),
+        category_repo=FakeCategoryRepo(),
+        notification_repo=None,
+    )
+    service.storage = CountingStorage()
+    file_paths = []
+    for name in ["a", "b", "c", "d", "e"]:
+        file_path = tmp_path / f"{name}.jpg"
+        file_path.write_bytes(b"image")
+        file_paths.append(str(file_path))
+
+    threads_before = threading.active_count()
+    results = list(service.upload_screenshot_images("user", file_paths, max_concurrency=2))
+    assert sorted(index for index, _, _ in results) == [0, 1, 2, 3, 4]
+    assert all(error is None for _, _, error in results)
+    # 요청 스레드가 직접 일괄 업로드 풀에 넣으므로 파일마다 기다리는 스레드가 따로 생기지 않는다
+    assert service.storage.max_active == 2
+    assert all(name.startswith("upload-batch") for name in service.storage.threads)
+    assert threading.active_count() - threads_before <= 4
+
+
+class FakeAnalysisCacheRepo:
+    def __init__(self):
+        self.entries = {}
+
+    def find(self, image_hash, prompt_version):
+        entry = self.entries.get((image_hash, prompt_version))
+        if entry and entry[1] > datetime.now():
+            return entry[0]
+        return None
+
+    def save(self, image_hash, prompt_version, result, expires_at):
+        self.entries[(image_hash, prompt_version)] = (result, expires_at)
+
+
+class CountingAImodule:
+    def __init__(self):
+        self.calls = 0
+
+    def analyze_image(self, image):
+        self.calls += 1
+        return [{"category": "쿠폰", "title": "아메리카노"}]
+
+
+def test_image_analysis_cache(tmp_path):
+    inner = CountingAImodule()
+    cache_repo = FakeAnalysisCacheRepo()
+    stats = AnalysisCacheStats()
+    cache = ImageAnalysisCache(ai_module=inner, cache_repo=cache_repo, ttl_hours=1, prompt_version="1", stats=stats)
+
+    first = tmp_path / "first.jpg"
+    first.write_bytes(b"image")
+    copy = tmp_path / "copy.jpg"
+    copy.write_bytes(b"image")
+
+    assert cache.analyze_image(str(first)) == cache.analyze_image(str(copy))
+    assert inner.calls == 1
+    assert stats.snapshot()["hits"] == 1
+
+    # 프롬프트 버전이 바뀌면 다시 분석한다
+    cache.prompt_version = "2"
+    cache.analyze_image(str(first))
+    assert inner.calls == 2
+    assert stats.snapshot()["misses"] == 2
+
+    # 전처리 설정이 바뀌어도 다시 분석한다
+    cache.preprocess_version = preprocess_version(max_edge=1024)
+    cache.analyze_image(str(first))
+    assert inner.calls == 3
+    assert stats.snapshot()["misses"] == 3
+    assert preprocess_version() != preprocess_version(max_edge=1024)
+
+
+class UnparsableAImodule(CountingAImodule):
+    def analyze_image(self, image):
+        self.calls += 1
+        return [None]  # 모델 응답이 JSON 이 아니면 extract_json_from_string 이 None 을 돌려준다
+
+
+def test_image_analysis_cache_skips_failed_results(tmp_path):
+    inner = UnparsableAImodule()
+    cache_repo = FakeAnalysisCacheRepo()
+    cache = ImageAnalysisCache(ai_module=inner, cache_repo=cache_repo, ttl_hours=1, prompt_version="1", stats=AnalysisCacheStats())
+    image = tmp_path / "image.jpg"
+    image.write_bytes(b"image")
+
+    assert cache.analyze_image(str(image)) == [None]
+    assert cache.analyze_image(str(image)) == [None]
+    assert inner.calls == 2
+    assert cache_repo.entries == {}
+
+
+def test_prepare_image_for_vision(tmp_path):
+    # 원본 그대로 보내는 작은 webp 는 MIME 타입만 맞춘다
+    image_bytes, mime_type = prepare_image_for_vision("testdata/japan_disney.webp")
+    assert mime_type == "image/webp"
+
+    # 큰 휴대폰 스크린샷은 긴 변을 줄이고 JPEG 로 다시 압축한다
+    image_bytes, mime_type = prepare_image_for_vision("capture/10.jpg", max_edge=2048, min_edge=1280, max_bytes=300_000)
+    assert mime_type == "image/jpeg"
+    assert len(image_bytes) <= 300_000
+    assert max(Image.open(io.BytesIO(image_bytes)).size) == 2048
+
+    # 바이트 예산이 너무 작아도 최소 해상도 아래로 줄이지 않는다
+    image_bytes, _ = prepare_image_for_vision("capture/10.jpg", max_edge=2048, min_edge=1280, max_bytes=1_000)
+    assert max(Image.open(io.BytesIO(image_bytes)).size) == 1280
+
+    # 투명 PNG 는 RGB JPEG 로 변환된다
+    png_path = tmp_path / "alpha.png"
+    Image.new("RGBA", (3000, 1000), (0, 0, 0, 0)).save(png_path)
+    image_bytes, mime_type = prepare_image_for_vision(str(png_path), max_edge=2048, min_edge=1280, max_bytes=1_000_000)
+    assert mime_type == "image/jpeg"
+    assert Image.open(io.BytesIO(image_bytes)).size == (2048, 683)
+
+
+class FakeAnalysisJobRepo:
+    def __init__(self):
+        self.jobs = {}
+
+    def save(self, job):
+        self.jobs[job.id] = job
+
+    def find_by_id(self, user_id, job_id):
+        return self.jobs[job_id]
+
+    def update_status(self, job_id, status, result=None, error=None):
+        job = self.jobs[job_id]
+        job.status = status
+        job.result = result if result is not None else job.result
+        job.error = error if error is not None else job.error
+
+    def fail_unfinished(self, owner, error):
+        unfinished = [job for job in self.jobs.values() if job.owner == owner and job.status in ("pending", "running")]
+        for job in unfinished:
+            self.update_status(job.id, "failed", error=error)
+        return len(unfinished)
+
+
+def test_analysis_job(tmp_path):
+    screenshot_service = ScreenshotService(
+        screenshot_repo=None,
+        ai_module=FlakyAImodule(),
+        category_repo=FakeCategoryRepo(),
+        notification_repo=None,
+    )
+    screenshot_service.storage = SlowStorage()
+    executor = ThreadPoolExecutor(max_workers=2)
+    job_service = AnalysisJobService(
+        job_repo=FakeAnalysisJobRepo(),
+        screenshot_service=screenshot_service,
+        user_repo=None,
+        executor=executor,
+    )
+    good_scratch, bad_scratch = ScratchSpace(root=str(tmp_path)), ScratchSpace(root=str(tmp_path))
+    good_path = good_scratch.save_upload(io.BytesIO(b"image"), "good.jpg")
+    bad_path = bad_scratch.save_upload(io.BytesIO(b"image"), "bad.jpg")
+
+    # 분석이 끝나기 전에 바로 반환된다
+    started = time.monotonic()
+    good_job = job_service.submit("user", good_scratch, good_path, "good.jpg")
+    bad_job = job_service.submit("user", bad_scratch, bad_path, "bad.jpg")
+    assert time.monotonic() - started < 0.1
+    assert job_service.get_job("user", good_job.id).status in ("pending", "running")
+
+    executor.shutdown(wait=True)
+    good_job = job_service.get_job("user", good_job.id)
+    assert good_job.status == "done"
+    assert good_job.result["title"] == "아메리카노"
+    bad_job = job_service.get_job("user", bad_job.id)
+    assert bad_job.status == "failed"
+    assert bad_job.error == "analysis failed"
+    assert not os.path.exists(good_scratch.path) and not os.path.exists(bad_scratch.path)
+
+
+def test_analysis_job_push_is_injected():
+    class FakeUserRepo:
+        def find_by_id(self, user_id):
+            return UserVO(id=user_id, name="user", email="user@test.com", password=None, memo=None, fcm_token="token", notifications=None, created_at=None, updated_at=None)
+
+    pushes = []
+    job_service = AnalysisJobService(
+        job_repo=FakeAnalysisJobRepo(),
+        screenshot_service=None,
+        user_repo=FakeUserRepo(),
+        send_push=lambda token, notification: pushes.append((token, notification["message"])),
+    )
+    job = AnalysisJob(id="job", user_id="user", status="done", file_name=None, notify=True, result=None, error=None, created_at=None, updated_at=None)
+    job_service.notify_user(job, "아메리카노")
+    assert pushes == [("token", "'아메리카노' 스크린샷 분석이 완료되었습니다.")]
+
+
+class QueuedOnlyExecutor:
+    """ 작업을 실행하지 않는다 (재시작으로 실행되지 못한 작업) """
+
+    def submit(self, fn, *args):
+        return None
+
+
+def test_fail_unfinished_jobs_only_for_own_instance(tmp_path):
+    job_repo = FakeAnalysisJobRepo()
+    services = {
+        instance_id: AnalysisJobService(
+            job_repo=job_repo, screenshot_service=None, user_repo=None,
+            executor=QueuedOnlyExecutor(), instance_id=instance_id,
+        )
+        for instance_id in ("a", "b")
+    }
+    jobs = {}
+    for instance_id, service in services.items():
+        scratch = ScratchSpace(root=str(tmp_path))
+        jobs[instance_id] = service.submit("user", scratch, scratch.save_upload(io.BytesIO(b"image"), "image.jpg"))
+        scratch.cleanup()
+
+    assert services["a"].fail_unfinished_jobs() == 1
+    assert job_repo.jobs[jobs["a"].id].status == "failed"
+    assert job_repo.jobs[jobs["b"].id].status == "pending"  # 다른 인스턴스가 실행 중인 작업은 그대로 둔다
+
+
+def test_json_stream_parser():
+    completion = '```json\n[{"category": "쿠폰", "title": "아메리카노 {L}", "code": "1234\\"5"},\n{"category": "교통", "details": {"seat": [1, 2]}}]\n```'
+    parser = JsonStreamParser()
+    events = []
+    for i in range(0, len(completion), 3):
+        events.extend(parser.feed(completion[i:i + 3]))
+
+    assert events[:3] == [
+        ("field", {"index": 0, "key": "category", "value": "쿠폰"}),
+        ("field", {"index": 0, "key": "title", "value": "아메리카노 {L}"}),
+        ("field", {"index": 0, "key": "code", "value": '1234"5'}),
+    ]
+    assert events[3] == ("item", {"index": 0, "value": {"category": "쿠폰", "title": "아메리카노 {L}", "code": '1234"5'}})
+    assert events[5] == ("field", {"index": 1, "key": "details", "value": {"seat": [1, 2]}})
+    assert events[6][0] == "item"
+    assert parser.feed('{"broken": }')[-1][0] == "error"
+
+
+class StreamingAImodule:
+    def stream_analyze_image(self, image):
+        yield "field", {"index": 0, "key": "category", "value": "쿠폰"}
+        yield "field", {"index": 0, "key": "title", "value": "아메리카노"}
+        yield "item", {"index": 0, "value": {"category": "쿠폰", "title": "아메리카노"}}
+
+
+def test_stream_screenshot_image(tmp_path):
+    service = ScreenshotService(
+        screenshot_repo=None,
+        ai_module=StreamingAImodule(),
+        category_repo=FakeCategoryRepo(),
+        notification_repo=None,
+    )
+    service.storage = SlowStorage()
+    file_path = make_upload_file(tmp_path)
+
+    events = list(service.stream_screenshot_image("user", file_path))
+    assert [event for event, _ in events] == ["field", "field", "item", "done"]
+    assert events[-1][1]["title"] == "아메리카노"
+    assert events[-1][1]["url"] == f"https://example.com/user/{tmp_path.name}/upload.jpg"
+    assert os.path.exists(file_path)
+
+
+def test_openai_clients_are_shared():
+    first, second = ai.AImodule(), ai.AImodule()
+    assert first.client is second.client
+    assert ai.AImodule(subscription_key="other-key").client is not first.client
+
+
+def test_transcode_for_speech():
+    stereo = AudioSegment.silent(duration=1000, frame_rate=44100).set_channels(2)
+    source = io.BytesIO()
+    stereo.export(source, format="wav")
+    source.seek(0)
+
+    wav = transcode_for_speech(source, format="wav")
+    audio = AudioSegment.from_file(io.BytesIO(wav), format="wav")
+    assert (audio.channels, audio.frame_rate, audio.sample_width) == (1, 16000, 2)
+    assert len(wav) * 5 < len(source.getvalue())
+
+
+def test_scratch_space(tmp_path):
+    with ScratchSpace(root=str(tmp_path), max_bytes=10) as first, ScratchSpace(root=str(tmp_path), max_bytes=10) as second:
+        assert first.path != second.path
+        first_path = first.save_upload(io.BytesIO(b"a"), "image.jpg")
+        assert first.save_upload(io.BytesIO(b"b"), "image.jpg") != first_path
+        assert second.save_upload(io.BytesIO(b"c"), "../image.jpg") == os.path.join(second.path, "image.jpg")
+        with pytest.raises(HTTPException) as e:
+            second.save_upload(io.BytesIO(b"x" * 20), "big.jpg")
+        assert e.value.status_code == 413
+    assert os.listdir(tmp_path) == []
+
+    # 정리되지 않은 오래된 디렉터리는 sweep 으로 지운다
+    leaked = ScratchSpace(root=str(tmp_path))
+    assert sweep_scratch_root(str(tmp_path), max_age_seconds=3600) == 0
+    os.utime(leaked.path, (time.time() - 7200, time.time() - 7200))
+    assert sweep_scratch_root(str(tmp_path), max_age_seconds=3600) == 1
+    assert not os.path.exists(leaked.path)
+
+
+def test_replay_ai_backend():
+    backend = ReplayAIBackend(fixtures_path="testdata/ai_fixtures.json", latency_seconds=0, error_rate=0, seed=0)
+    assert backend.analyze_image("testdata/ssgcoupon.jpeg")[0]["code"] == "1023-8167-1826"
+    assert backend.analyze_image("capture/10.jpg")[0]["category"] == "엔터테인먼트"
+    assert backend.analyze_image("testdata/testaudio.m4a")[0]["category"] == "기타"
+    events = list(backend.stream_analyze_image("testdata/ssgcoupon.jpeg"))
+    assert events[-1][0] == "item"
+
+    slow = ReplayAIBackend(fixtures_path="testdata/ai_fixtures.json", latency_seconds=0.2, error_rate=0)
+    started = time.monotonic()
+    slow.analyze_image("testdata/ssgcoupon.jpeg")
+    assert time.monotonic() - started >= 0.2
+
+    # 같은 seed 면 같은 요청에서 실패한다
+    def failures(seed):
+        backend = ReplayAIBackend(fixtures_path="testdata/ai_fixtures.json", latency_seconds=0, error_rate=0.5, seed=seed)
+        results = []
+        for _ in range(20):
+            try:
+                backend.analyze_image("testdata/ssgcoupon.jpeg")
+                results.append(False)
+            except ReplayBackendError:
+                results.append(True)
+        return results
+    assert failures(1) == failures(1)
+    assert any(failures(1)) and not all(failures(1))
@@ -1,11 +1,15 @@
 import json
 import base64
-from openai import AzureOpenAI  
 import re
 import os
 from pathlib import Path
-from typing import BinaryIO
+from typing import BinaryIO, Iterator
 from config import get_settings
+from utils.image import prepare_image_for_vision
+from utils.json_stream import JsonStreamParser
+from utils.openai_clients import get_openai_client
+from utils.ai_backend import AIBackend
+from utils.gpt4audio import azure_audio_request
 from azure.core.credentials import AzureKeyCredential
 from azure.ai.textanalytics import TextAnalyticsClient
 from collections import defaultdict
@@ -13,78 +17,9 @@ from collections import defaultdict
 
 settings = get_settings()
 
-class AImodule:
-    def __init__(self, subscription_key=None):
-        
-        if subscription_key:
-            self.subscription_key = subscription_key
-        else:
-            # .env 파일에서 API 키 가져오기
-            self.subscription_key = settings.azure_api_key
-            if not self.subscription_key:
-                raise ValueError("API 키가 설정되지 않았습니다.")
-                
-        self.endpoint_url = "https://team2openainorthcentralus.openai.azure.com/"
-        self.deployment_name = "gpt-4o"
-        self.client = AzureOpenAI(
-            azure_endpoint=self.endpoint_url,
-            api_key=self.subscription_key,
-            api_version="2024-08-01-preview",
-        )
-
-    def extract_json_from_string(self, input_data):
-        if isinstance(input_data, (list, dict)):
-            return input_data
-        elif isinstance(input_data, str):
-            try:
-                json_pattern = re.compile(r"```json\n([\s\S]*?)\n```")
-                match = json_pattern.search(input_data)
-                if match:
-                    json_str = match.group(1)
-                    return json.loads(json_str)
-                else:
-                    return json.loads(input_data)
-            except json.JSONDecodeError as e:
-                print(f"JSON 파싱 오류: {e}")
-                return None
-        else:
-            print("지원되지 않는 데이터 형식입니다.")
-            return None
-
-    def call_azure_api(self, prompt: str, image: str) -> str:
-        encoded_image = base64.b64encode(open(image, 'rb').read()).decode('ascii')
-        messages = [
-            {
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": prompt},
-                    {
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:image/jpeg;base64,{encoded_image}"
-                        },
-                    },
-                ],
-            }
-        ]
-
-        completion = self.client.chat.completions.create(
-            model=self.deployment_name,
-            messages=messages,
-            max_tokens=800,
-            temperature=0.7,
-            top_p=0.95,
-            frequency_penalty=0,
-            presence_penalty=0,
-            stop=None,
-            stream=False,
-            timeout=50,
-        )
-
-        return completion.choices[0].message.content
-
-    def analyze_image(self, image: str) -> list[str]:
-        unified_prompt = """
+# 프롬프트를 바꾸면 PROMPT_VERSION 도 올려야 이전 분석 결과 캐시가 무효화된다
+PROMPT_VERSION = "1"
+ANALYZE_IMAGE_PROMPT = """
         You are an expert image analyzer and information extractor specialized in schedule-related images. Please analyze the provided image and perform the following tasks:
 
         1. Classify the image into ONE of the following categories:
@@ -167,11 +102,101 @@ class AImodule:
         - If unsure or if the image doesn't clearly fit into the first four categories, classify as "Others"
         """
 
-        answer = self.call_azure_api(unified_prompt, image)
+
+class AImodule(AIBackend):
+    def __init__(self, subscription_key=None):
+        
+        if subscription_key:
+            self.subscription_key = subscription_key
+        else:
+            # .env 파일에서 API 키 가져오기
+            self.subscription_key = settings.azure_api_key
+            if not self.subscription_key:
+                raise ValueError("API 키가 설정되지 않았습니다.")
+                
+        self.endpoint_url = "https://team2openainorthcentralus.openai.azure.com/"
+        self.deployment_name = "gpt-4o"
+        self.client = get_openai_client(
+            endpoint=self.endpoint_url,
+            api_key=self.subscription_key,
+            api_version="2024-08-01-preview",
+        )
+
+    def extract_json_from_string(self, input_data):
+        if isinstance(input_data, (list, dict)):
+            return input_data
+        elif isinstance(input_data, str):
+            try:
+                json_pattern = re.compile(r"```json\n([\s\S]*?)\n```")
+                match = json_pattern.search(input_data)
+                if match:
+                    json_str = match.group(1)
+                    return json.loads(json_str)
+                else:
+                    return json.loads(input_data)
+            except json.JSONDecodeError as e:
+                print(f"JSON 파싱 오류: {e}")
+                return None
+        else:
+            print("지원되지 않는 데이터 형식입니다.")
+            return None
+
+    def build_messages(self, prompt: str, image: str) -> list[dict]:
+        image_bytes, mime_type = prepare_image_for_vision(image)
+        encoded_image = base64.b64encode(image_bytes).decode('ascii')
+        return [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prompt},
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:{mime_type};base64,{encoded_image}"
+                        },
+                    },
+                ],
+            }
+        ]
+
+    def call_azure_api(self, prompt: str, image: str, stream: bool = False):
+        """ stream=True 이면 응답 텍스트 조각을 차례로 돌려주는 제너레이터를 반환 """
+        completion = self.client.chat.completions.create(
+            model=self.deployment_name,
+            messages=self.build_messages(prompt, image),
+            max_tokens=800,
+            temperature=0.7,
+            top_p=0.95,
+            frequency_penalty=0,
+            presence_penalty=0,
+            stop=None,
+            stream=stream,
+            timeout=50,
+        )
+
+        if stream:
+            return (
+                chunk.choices[0].delta.content
+                for chunk in completion
+                if chunk.choices and chunk.choices[0].delta.content
+            )
+        return completion.choices[0].message.content
+
+    def analyze_image(self, image: str) -> list[str]:
+        answer = self.call_azure_api(ANALYZE_IMAGE_PROMPT, image)
         answer_json = self.extract_json_from_string(answer)
 
         return [answer_json]
 
+    def stream_analyze_image(self, image: str) -> Iterator[tuple[str, dict]]:
+        """ analyze_image 의 스트리밍 버전. 필드/아이템이 완성되는 대로 (이벤트, 데이터)를 돌려준다 """
+        parser = JsonStreamParser()
+        for delta in self.call_azure_api(ANALYZE_IMAGE_PROMPT, image, stream=True):
+            yield from parser.feed(delta)
+
+    def transcribe_keywords(self, audio: bytes) -> list[str]:
+        return azure_audio_request(audio)
+
 
 def extract_data_from_screenshots(screenshots):
     keyd ={
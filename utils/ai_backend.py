@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+from typing import Iterator
+
+
+class AIBackend(ABC):
+    """
+    업로드/음성 검색 파이프라인이 사용하는 모델 호출 인터페이스.
+    실제 구현은 utils.ai.AImodule(Azure OpenAI), 오프라인 벤치마크용은 utils.ai_replay.ReplayAIBackend.
+    """
+
+    @abstractmethod
+    def analyze_image(self, image: str) -> list:
+        raise NotImplementedError
+
+    def stream_analyze_image(self, image: str) -> Iterator[tuple[str, dict]]:
+        """ 스트리밍을 지원하지 않는 구현은 analyze_image 결과를 이벤트로 바꿔서 돌려준다 """
+        result = self.analyze_image(image)
+        items = result[0] if result and isinstance(result[0], list) else result
+        for index, item in enumerate(items):
+            for key, value in (item or {}).items():
+                yield "field", {"index": index, "key": key, "value": value}
+            yield "item", {"index": index, "value": item}
+
+    @abstractmethod
+    def transcribe_keywords(self, audio: bytes) -> list[str]:
+        """ 16 kHz 모노 WAV 음성에서 검색 키워드 추출 """
+        raise NotImplementedError
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import random
+import threading
+import time
+from config import get_settings
+from utils.ai_backend import AIBackend
+from utils.logger import logger
+
+
+settings = get_settings()
+
+DEFAULT_IMAGE_RESULT = [{"category": "기타", "description": "등록된 분석 결과가 없는 이미지입니다."}]
+DEFAULT_KEYWORDS = ["쿠폰"]
+
+
+class ReplayBackendError(RuntimeError):
+    """ error_rate 로 주입된 모델 호출 실패 """
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return sha256_bytes(f.read())
+
+
+def load_fixtures(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            fixtures = json.load(f)
+    except FileNotFoundError:
+        fixtures = {}
+    fixtures.setdefault("images", {})
+    fixtures.setdefault("audio", {})
+    return fixtures
+
+
+class ReplayAIBackend(AIBackend):
+    """
+    녹화된 결과를 돌려주는 오프라인 AI 백엔드 (Azure OpenAI 없이 테스트/벤치마크).
+
+    - 이미지/음성 내용의 SHA-256 으로 fixture 를 찾는다. 없으면 기본 결과를 돌려주고, strict 이면 KeyError.
+    - latency_seconds(± latency_jitter_seconds) 만큼 기다려서 모델 응답 시간을 흉내 낸다.
+    - error_rate 확률로 ReplayBackendError 를 던진다. seed 를 주면 같은 순서로 재현된다.
+    """
+
+    def __init__(
+            self,
+            fixtures_path: str | None = None,
+            latency_seconds: float | None = None,
+            latency_jitter_seconds: float | None = None,
+            error_rate: float | None = None,
+            seed: int | None = None,
+            strict: bool = False,
+    ):
+        self.fixtures = load_fixtures(fixtures_path or settings.ai_replay_fixtures)
+        self.latency_seconds = settings.ai_replay_latency_seconds if latency_seconds is None else latency_seconds
+        self.latency_jitter_seconds = (
+            settings.ai_replay_latency_jitter_seconds if latency_jitter_seconds is None else latency_jitter_seconds
+        )
+        self.error_rate = settings.ai_replay_error_rate if error_rate is None else error_rate
+        self.random = random.Random(settings.ai_replay_seed if seed is None else seed)
+        self.random_lock = threading.Lock()
+        self.strict = strict
+
+    def analyze_image(self, image: str) -> list:
+        self._simulate_call()
+        image_hash = sha256_file(image)
+        fixture = self.fixtures["images"].get(image_hash)
+        if fixture is None:
+            if self.strict:
+                raise KeyError(f"No recorded analysis for {image} ({image_hash})")
+            return self.fixtures.get("default_image_result", DEFAULT_IMAGE_RESULT)
+        return fixture["result"]
+
+    def transcribe_keywords(self, audio: bytes) -> list[str]:
+        self._simulate_call()
+        fixture = self.fixtures["audio"].get(sha256_bytes(audio))
+        if fixture is None:
+            if self.strict:
+                raise KeyError("No recorded keywords for audio")
+            return self.fixtures.get("default_keywords", DEFAULT_KEYWORDS)
+        return fixture["keywords"]
+
+    def _simulate_call(self):
+        with self.random_lock:
+            delay = self.latency_seconds + self.random.uniform(-1, 1) * self.latency_jitter_seconds
+            failed = self.random.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            raise ReplayBackendError("Injected AI backend failure")
+
+
+class RecordingAIBackend(AIBackend):
+    """ 실제 백엔드를 호출하면서 결과를 fixture 파일에 기록한다 (ReplayAIBackend 용 데이터 수집) """
+
+    def __init__(self, ai_module: AIBackend, fixtures_path: str | None = None):
+        self.ai_module = ai_module
+        self.fixtures_path = fixtures_path or settings.ai_replay_fixtures
+        self.fixtures = load_fixtures(self.fixtures_path)
+        self.lock = threading.Lock()
+
+    def analyze_image(self, image: str) -> list:
+        result = self.ai_module.analyze_image(image)
+        with self.lock:
+            self.fixtures["images"][sha256_file(image)] = {"file": image, "result": result}
+            self._write()
+        return result
+
+    def transcribe_keywords(self, audio: bytes) -> list[str]:
+        keywords = self.ai_module.transcribe_keywords(audio)
+        with self.lock:
+            self.fixtures["audio"][sha256_bytes(audio)] = {"keywords": keywords}
+            self._write()
+        return keywords
+
+    def _write(self):
+        with open(self.fixtures_path, "w", encoding="utf-8") as f:
+            json.dump(self.fixtures, f, ensure_ascii=False, indent=2)
+        logger.info(f"Recorded AI fixtures to {self.fixtures_path}")
@@ -0,0 +1,24 @@
+import io
+from typing import BinaryIO
+from pydub import AudioSegment
+from config import get_settings
+
+
+settings = get_settings()
+
+
+def transcode_for_speech(audio_file: BinaryIO | str, format: str | None = "m4a") -> bytes:
+    """
+    음성 인식용으로 16 kHz 모노 16-bit WAV 로 변환한다.
+    업로드 스트림(파일 객체)을 그대로 디코딩하고 결과도 메모리에서 만들어 임시 파일을 쓰지 않는다.
+    """
+    audio = AudioSegment.from_file(audio_file, format=format)
+    audio = (
+        audio
+        .set_channels(1)
+        .set_frame_rate(settings.audio_sample_rate)
+        .set_sample_width(2)
+    )
+    buffer = io.BytesIO()
+    audio.export(buffer, format="wav")
+    return buffer.getvalue()
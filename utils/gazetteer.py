@@ -0,0 +1,82 @@
+import difflib
+import re
+import unicodedata
+from functools import lru_cache
+
+from config import get_settings
+from utils.logger import logger
+
+
+settings = get_settings()
+
+FUZZY_CUTOFF = 0.8
+FUZZY_MIN_LENGTH = 4  # 두세 글자 단어(경기, 나라, 서면)는 유사도만으로 지명이라고 보지 않는다
+MAX_TOKENS = 8
+KOREAN_SUFFIXES = ("해수욕장", "터미널", "공항", "역", "시", "군", "구", "동")
+
+_separator = re.compile(r"[\W_]+")
+
+
+def normalize_place(name: str) -> str:
+    """ 대소문자/전각 문자/공백/문장부호 차이를 없앤 검색 키 """
+    return _separator.sub("", unicodedata.normalize("NFKC", name).lower())
+
+
+class Gazetteer:
+    """
+    오프라인 지명 사전. 파일(TSV: 이름, 위도, 경도, 별칭들)을 한 번 읽어 메모리에 둔다.
+
+    정확히 일치하는 이름 → 단어 묶음(긴 것부터) → 행정구역/역 접미사를 뗀 단어 → difflib 유사도 순으로 찾는다.
+    """
+
+    def __init__(self, path: str | None = None, cache_size: int = 4096):
+        self.path = path or settings.gazetteer_path
+        self.places = {}
+        self._load()
+        self.keys = list(self.places)
+        self.lookup = lru_cache(maxsize=cache_size)(self._lookup)
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip() or line.startswith("#"):
+                        continue
+                    name, lat, lon, *aliases = line.rstrip("\n").split("\t")
+                    coords = (float(lat), float(lon))
+                    for alias in [name, *(aliases[0].split(",") if aliases else [])]:
+                        key = normalize_place(alias)
+                        if key:
+                            self.places.setdefault(key, coords)
+        except FileNotFoundError:
+            logger.error(f"Gazetteer file not found: {self.path}")
+
+    def _lookup(self, location: str) -> tuple[float, float] | None:
+        key = normalize_place(location)
+        if not key:
+            return None
+        if key in self.places:
+            return self.places[key]
+
+        tokens = [normalize_place(token) for token in _separator.split(location)]
+        tokens = [token for token in tokens if token][:MAX_TOKENS]
+        for size in range(len(tokens) - 1, 0, -1):
+            for start in range(len(tokens) - size + 1):
+                span = "".join(tokens[start:start + size])
+                if span in self.places:
+                    return self.places[span]
+
+        for token in tokens:
+            for suffix in KOREAN_SUFFIXES:
+                if token.endswith(suffix) and token[:-len(suffix)] in self.places:
+                    return self.places[token[:-len(suffix)]]
+
+        if len(key) < FUZZY_MIN_LENGTH:
+            return None
+        matches = difflib.get_close_matches(key, self.keys, n=1, cutoff=FUZZY_CUTOFF)
+        return self.places[matches[0]] if matches else None
+
+
+@lru_cache
+def get_gazetteer() -> Gazetteer:
+    return Gazetteer()
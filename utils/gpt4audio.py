@@ -1,14 +1,21 @@
 import base64
+import io
 import time
 import json
-from openai import AzureOpenAI
 from config import get_settings
+from utils.openai_clients import get_openai_client
 
 settings = get_settings()
 
 
-def azure_audio_request(file_path):
-    with open(file_path, "rb") as audio_data:
+def _open_audio(audio: bytes | str):
+    """ WAV 바이트면 메모리에서, 경로면 파일에서 읽는다 """
+    return io.BytesIO(audio) if isinstance(audio, bytes) else open(audio, "rb")
+
+
+def azure_audio_request(audio: bytes | str):
+    """ audio: WAV 바이트 또는 WAV 파일 경로 """
+    with _open_audio(audio) as audio_data:
         #wav_bytes = sr.Recognizer().record(audio_data)
         wav_bytes = audio_data.read()
         encoded_string = base64.b64encode(wav_bytes).decode('utf-8')
@@ -16,10 +23,10 @@ def azure_audio_request(file_path):
         # Azure OpenAI 설정
         endpoint = settings.gpt_audio_api
         api_key = settings.gpt_audio_key
-        client = AzureOpenAI(
-            api_version="2025-01-01-preview",
+        client = get_openai_client(
+            endpoint=endpoint,
             api_key=api_key,
-            azure_endpoint=endpoint
+            api_version="2025-01-01-preview",
         )
 
         completion = client.chat.completions.create(
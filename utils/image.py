@@ -0,0 +1,100 @@
+import hashlib
+import io
+import mimetypes
+from PIL import Image, ImageOps
+from config import get_settings
+from utils.logger import logger
+
+
+settings = get_settings()
+
+# 비전 API 가 그대로 받는 형식. 작고 크기 제한 안에 있으면 다시 인코딩하지 않는다
+PASSTHROUGH_FORMATS = {"JPEG": "image/jpeg", "PNG": "image/png", "WEBP": "image/webp"}
+JPEG_QUALITIES = (85, 75, 65)
+DOWNSCALE_STEP = 0.8
+
+
+def _to_rgb(image: Image.Image) -> Image.Image:
+    """ 투명 배경은 흰색으로 채워서 RGB 로 변환 """
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    if image.mode != "RGB":
+        return image.convert("RGB")
+    return image
+
+
+def _resize_long_edge(image: Image.Image, long_edge: int) -> Image.Image:
+    width, height = image.size
+    if max(width, height) <= long_edge:
+        return image
+    scale = long_edge / max(width, height)
+    return image.resize((max(1, round(width * scale)), max(1, round(height * scale))), Image.LANCZOS)
+
+
+def _encode_jpeg(image: Image.Image, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def preprocess_version(
+        max_edge: int | None = None,
+        min_edge: int | None = None,
+        max_bytes: int | None = None,
+) -> str:
+    """ 전처리 설정이 바뀌면 달라지는 짧은 버전. 같은 이미지라도 모델이 보는 입력이 달라지므로 분석 결과 캐시 키에 넣는다 """
+    max_edge = max_edge or settings.vision_image_max_edge
+    min_edge = min(min_edge or settings.vision_image_min_edge, max_edge)
+    max_bytes = max_bytes or settings.vision_image_max_bytes
+    params = (max_edge, min_edge, max_bytes, JPEG_QUALITIES, DOWNSCALE_STEP)
+    return hashlib.sha256(repr(params).encode()).hexdigest()[:8]
+
+
+def prepare_image_for_vision(
+        image_path: str,
+        max_edge: int | None = None,
+        min_edge: int | None = None,
+        max_bytes: int | None = None,
+) -> tuple[bytes, str]:
+    """
+    비전 모델에 보낼 이미지를 JPEG 로 정규화하고 (bytes, MIME 타입)을 반환한다.
+
+    - 긴 변을 max_edge 로 제한한다.
+    - max_bytes 를 넘으면 품질을 낮추고, 그래도 넘으면 긴 변을 줄인다.
+      바코드나 쿠폰 번호를 읽을 수 있도록 긴 변은 min_edge 아래로 줄이지 않는다.
+    - 이미 조건을 만족하는 JPEG/PNG/WEBP 는 원본을 그대로 보낸다 (작은 WEBP 를 JPEG 로 바꾸면 오히려 커진다).
+    """
+    max_edge = max_edge or settings.vision_image_max_edge
+    min_edge = min(min_edge or settings.vision_image_min_edge, max_edge)
+    max_bytes = max_bytes or settings.vision_image_max_bytes
+
+    with open(image_path, "rb") as f:
+        raw = f.read()
+
+    try:
+        image = Image.open(io.BytesIO(raw))
+        source_format = image.format
+        image = ImageOps.exif_transpose(image)
+    except Exception as e:
+        # Pillow 가 읽지 못하는 형식은 원본 그대로 보낸다
+        logger.warning(f"Image preprocessing skipped for {image_path}: {e}")
+        return raw, mimetypes.guess_type(image_path)[0] or "image/jpeg"
+
+    if source_format in PASSTHROUGH_FORMATS and max(image.size) <= max_edge and len(raw) <= max_bytes:
+        return raw, PASSTHROUGH_FORMATS[source_format]
+
+    image = _to_rgb(image)
+    long_edge = min(max(image.size), max_edge)
+    while True:
+        resized = _resize_long_edge(image, long_edge)
+        for quality in JPEG_QUALITIES:
+            encoded = _encode_jpeg(resized, quality)
+            if len(encoded) <= max_bytes:
+                return encoded, "image/jpeg"
+        if long_edge <= min_edge:
+            # 해상도를 지키는 것이 우선이므로 예산을 넘더라도 최소 크기에서 멈춘다
+            return encoded, "image/jpeg"
+        long_edge = max(min_edge, int(long_edge * DOWNSCALE_STEP))
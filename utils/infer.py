@@ -2,15 +2,17 @@ import datetime
 from pathlib import Path
 
 from utils.reco3 import Event, GRPORecommendationAgent, load_config
+from utils.reco_model import RecommendationModel
 
 
-def infer(data=1, days=30):
+def infer(data=1, days=30, model: RecommendationModel | None = None):
     """
     강화학습으로 훈련된 모델을 활용하여 추천 일정과 고정 일정을 추론하는 함수입니다.
 
     인자:
         dataset (int): 사용할 데이터셋 번호 (기본값 1)
         days (int): 추천 기간 (일 단위, 기본값 7)
+        model (RecommendationModel): 공유 모델. 없으면 체크포인트를 직접 읽는다
 
     반환:
         리스트: 추천 일정과 고정 일정 정보가 포함된 리스트
@@ -34,6 +36,36 @@ def infer(data=1, days=30):
     base_date = datetime.date.today()
     end_date = base_date + datetime.timedelta(days=days)
 
+    valid_coupons, fixed_events = build_events(data, base_date, end_date)
+    if not valid_coupons:
+        return []
+
+    agent = build_agent(model)
+    schedule = agent.recommend(valid_coupons, fixed_events, base_date, end_date)
+    return format_results(schedule, valid_coupons, fixed_events)
+
+
+def infer_many(datas: list[dict], days=30, model: RecommendationModel | None = None) -> list[list]:
+    """
+    여러 사용자의 데이터를 한 번에 추론한다 (배치 사전 계산용). 결과 형식과 순서는 infer 를 사용자마다 부른 것과 같다.
+    """
+    base_date = datetime.date.today()
+    end_date = base_date + datetime.timedelta(days=days)
+
+    events = [build_events(data, base_date, end_date) for data in datas]
+    requests = [(valid_coupons, fixed_events) for valid_coupons, fixed_events in events if valid_coupons]
+    if not requests:
+        return [[] for _ in datas]
+
+    schedules = iter(build_agent(model).recommend_many(requests, base_date, end_date))
+    return [
+        format_results(next(schedules), valid_coupons, fixed_events) if valid_coupons else []
+        for valid_coupons, fixed_events in events
+    ]
+
+
+def build_events(data: dict, base_date: datetime.date, end_date: datetime.date) -> tuple[list[Event], list[Event]]:
+    """ 기간 안의 (쿠폰, 고정 일정) """
     fixed_events = []
     for key, events in data.items():
         if key in ["쿠폰", "불명", "기타"]:
@@ -54,11 +86,18 @@ def infer(data=1, days=30):
                 valid_coupons.append(coupon)
         except Exception as e:
             continue
+    return valid_coupons, fixed_events
 
-    if not valid_coupons:
-        return []
 
+def build_agent(model: RecommendationModel | None = None) -> GRPORecommendationAgent:
     config = load_config()
+    if model is not None:
+        return GRPORecommendationAgent(
+            window_days=config["window_days"],
+            model=model.get(),
+            feature_extractor=model.feature_extractor,
+        )
+
     agent = GRPORecommendationAgent(window_days=config["window_days"])
     model_dir = Path(config["model_dir"])
     model_path = model_dir / "grpo_recommendation_model.pth"
@@ -67,9 +106,10 @@ def infer(data=1, days=30):
             agent.load(str(model_path))
         except Exception as e:
             pass
+    return agent
 
-    schedule = agent.recommend(valid_coupons, fixed_events, base_date, end_date)
 
+def format_results(schedule: list[dict], valid_coupons: list[Event], fixed_events: list[Event]) -> list:
     result = []
     for rec in schedule:
         coupon_title = rec.get("coupon", "")
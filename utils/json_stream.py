@@ -0,0 +1,76 @@
+import json
+
+
+class JsonStreamParser:
+    """
+    모델이 토큰 단위로 내보내는 JSON 을 받아서 완성되는 즉시 이벤트로 돌려주는 파서.
+
+    응답은 객체 하나, 객체 배열, 또는 ```json 블록으로 감싼 형태일 수 있다.
+    최상위 객체(아이템) 안에서 "key": value 쌍이 끝날 때마다 field 이벤트를,
+    객체가 닫히면 item 이벤트를 만든다. JSON 으로 읽을 수 없는 아이템은 error 이벤트가 된다.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.stack = []  # 아이템 안에서 열려 있는 괄호
+        self.in_string = False
+        self.escape = False
+        self.item_start = None
+        self.field_start = None
+        self.index = 0  # 현재 아이템 번호
+
+    def feed(self, chunk: str) -> list[tuple[str, dict]]:
+        self.buffer += chunk
+        events = []
+        while self.pos < len(self.buffer):
+            ch = self.buffer[self.pos]
+            if self.item_start is None:
+                # 아이템 밖의 텍스트(```json, 배열 괄호, 쉼표 등)는 무시한다
+                if ch == "{":
+                    self.item_start = self.pos
+                    self.field_start = self.pos + 1
+                    self.stack = ["{"]
+            elif self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch in "{[":
+                self.stack.append(ch)
+            elif ch in "}]":
+                self.stack.pop()
+                if not self.stack:
+                    events.extend(self._field_events(self.pos))
+                    events.append(self._item_event(self.buffer[self.item_start:self.pos + 1]))
+                    self.buffer = self.buffer[self.pos + 1:]
+                    self.pos = 0
+                    self.item_start = None
+                    self.index += 1
+                    continue
+            elif ch == "," and len(self.stack) == 1:
+                events.extend(self._field_events(self.pos))
+                self.field_start = self.pos + 1
+            self.pos += 1
+        return events
+
+    def _field_events(self, end: int) -> list[tuple[str, dict]]:
+        segment = self.buffer[self.field_start:end].strip()
+        if not segment:
+            return []
+        try:
+            fields = json.loads("{" + segment + "}")
+        except json.JSONDecodeError:
+            # 잘못된 필드는 아이템 전체를 파싱할 때 error 이벤트로 알린다
+            return []
+        return [("field", {"index": self.index, "key": key, "value": value}) for key, value in fields.items()]
+
+    def _item_event(self, text: str) -> tuple[str, dict]:
+        try:
+            return "item", {"index": self.index, "value": json.loads(text)}
+        except json.JSONDecodeError as e:
+            return "error", {"index": self.index, "detail": f"JSON 파싱 오류: {e}"}
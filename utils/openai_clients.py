@@ -0,0 +1,47 @@
+import threading
+import httpx
+from openai import AzureOpenAI
+from config import get_settings
+
+
+settings = get_settings()
+
+# (엔드포인트, API 버전, 키) 별로 하나씩 만들어 프로세스 전체에서 공유한다
+_clients = {}
+_lock = threading.Lock()
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.openai_max_connections,
+        max_keepalive_connections=settings.openai_max_keepalive_connections,
+        keepalive_expiry=settings.openai_keepalive_expiry_seconds,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    # 호출마다 timeout 을 넘기면 read 타임아웃은 그 값으로 덮어쓴다
+    return httpx.Timeout(settings.openai_timeout_seconds, connect=settings.openai_connect_timeout_seconds)
+
+
+def get_openai_client(endpoint: str, api_key: str, api_version: str) -> AzureOpenAI:
+    """ 커넥션 풀을 공유하는 동기 AzureOpenAI 클라이언트 """
+    key = (endpoint, api_version, api_key)
+    with _lock:
+        if key not in _clients:
+            _clients[key] = AzureOpenAI(
+                azure_endpoint=endpoint,
+                api_key=api_key,
+                api_version=api_version,
+                http_client=httpx.Client(limits=_limits(), timeout=_timeout()),
+            )
+        return _clients[key]
+
+
+async def close_openai_clients():
+    """ 종료 시 열려 있는 커넥션을 정리한다 """
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
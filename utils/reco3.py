@@ -1,14 +1,16 @@
-import random
 import datetime
-import math
+import hashlib
 import logging
+from functools import lru_cache
 from typing import List, Dict, Optional
 from pathlib import Path
 
+import numpy as np
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from geopy.geocoders import Nominatim
+
+from utils.gazetteer import get_gazetteer
 
 logging.basicConfig(
     level=logging.INFO,
@@ -28,10 +30,48 @@ def load_config():
         "learning_rate": 0.01,
         "model_dir": "models",
         "batch_size": 32,
-        "memory_limit": 1000
+        "memory_limit": 1000,
+        "word_vector_cache_size": 65536,
+        "slot_seed": 0
     }
 
 CONFIG = load_config()
+WORD_VECTOR_SIZE = 10
+
+SLOT_START = 9 * 60     # 09:00 -> 540분
+SLOT_END = 21 * 60      # 21:00 -> 1260분
+SLOT_STEP = 15
+SLOT_BUFFER = 120       # 고정 일정 앞뒤로 비워 둘 시간 (분)
+SLOT_TIMES = np.arange(SLOT_START, SLOT_END + 1, SLOT_STEP)
+
+def parse_minutes(value: str) -> Optional[int]:
+    """ "HH:MM" -> 0시부터의 분. 형식이 맞지 않으면 None """
+    try:
+        t = datetime.datetime.strptime(value, "%H:%M")
+    except (TypeError, ValueError):
+        return None
+    return t.hour * 60 + t.minute
+
+def merge_intervals(intervals: List[tuple]) -> List[tuple]:
+    merged = []
+    for start, end in sorted(interval for interval in intervals if interval[0] <= interval[1]):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def free_slots(fixed_minutes: List[int]) -> List[int]:
+    """ 15분 격자에서 고정 일정 ±SLOT_BUFFER 와 겹치지 않는 시각들. 빈 시간이 없으면 격자 전체 """
+    intervals = merge_intervals([
+        (max(SLOT_START, minutes - SLOT_BUFFER), min(SLOT_END, minutes + SLOT_BUFFER))
+        for minutes in fixed_minutes
+    ])
+    free = np.ones(len(SLOT_TIMES), dtype=bool)
+    for start, end in intervals:
+        free[np.searchsorted(SLOT_TIMES, start, "left"):np.searchsorted(SLOT_TIMES, end, "right")] = False
+    slots = SLOT_TIMES[free]
+    return (slots if slots.size else SLOT_TIMES).tolist()
 
 class Event:
     def __init__(self, data: dict):
@@ -42,6 +82,7 @@ class Event:
         except Exception as e:
             self.date = datetime.date.today()
         self.time = data.get("time", "")
+        self.minutes = parse_minutes(self.time) if self.time else None
         self.title = data.get("title", data.get("item", ""))
         self.description = data.get("description", "")
     
@@ -49,87 +90,123 @@ class Event:
     def from_dict(cls, data: dict):
         return cls(data)
 
+@lru_cache(maxsize=CONFIG["word_vector_cache_size"])
+def word_vector(word: str) -> np.ndarray:
+    """ 단어의 blake2b 해시로 만든 단위 벡터. PYTHONHASHSEED/프로세스와 관계없이 같고 전역 random 을 건드리지 않는다 """
+    digest = hashlib.blake2b(word.encode("utf-8"), digest_size=4 * WORD_VECTOR_SIZE).digest()
+    vector = np.frombuffer(digest, dtype="<u4") / np.iinfo(np.uint32).max * 2.0 - 1.0
+    magnitude = np.linalg.norm(vector)
+    if magnitude > 0:
+        vector = vector / magnitude
+    vector.setflags(write=False)
+    return vector
+
 class FeatureExtractor:
     def __init__(self):
-        self.location_cache = {}
-        self.geolocator = Nominatim(user_agent="my_agent")
-        self.word_vectors = {}
-        self.vector_size = 10
+        self.gazetteer = get_gazetteer()
+        self.vector_size = WORD_VECTOR_SIZE
         self.key_vector_size = 5
         self.fixed_keys = [
             "category", "brand", "type", "title", "item", "code",
             "location", "from_location", "to_location",
             "details", "date", "time"
         ]
+        self.location_keys = ["location", "from_location", "to_location"]
+        self.text_keys = [key for key in self.fixed_keys if key not in self.location_keys + ["date", "time"]]
         self.output_dim = 57
 
     def _get_word_vector(self, word: str) -> List[float]:
-        if word not in self.word_vectors:
-            word_hash = hash(word)
-            random.seed(word_hash)
-            vector = [random.uniform(-1, 1) for _ in range(self.vector_size)]
-            magnitude = math.sqrt(sum(x * x for x in vector))
-            if magnitude > 0:
-                vector = [x / magnitude for x in vector]
-            self.word_vectors[word] = vector
-        return self.word_vectors[word]
+        return word_vector(word).tolist()
 
-    def _text_to_vector(self, text: str, vector_size: Optional[int] = None) -> List[float]:
+    def _texts_to_matrix(self, texts: List[str], vector_size: Optional[int] = None) -> np.ndarray:
+        """ 여러 텍스트의 평균 단어 벡터를 한 번에 계산한다 (행 = 텍스트) """
         vector_size = vector_size if vector_size is not None else self.vector_size
-        if not text:
-            return [0.0] * vector_size
-        words = text.lower().split()
-        if not words:
-            return [0.0] * vector_size
-        vectors = [self._get_word_vector(word) for word in words]
-        avg_vector = [sum(x) / len(vectors) for x in zip(*vectors)]
-        if len(avg_vector) > vector_size:
-            avg_vector = avg_vector[:vector_size]
-        elif len(avg_vector) < vector_size:
-            avg_vector.extend([0.0] * (vector_size - len(avg_vector)))
-        return avg_vector
+        words, rows = [], []
+        for i, text in enumerate(texts):
+            for word in (text.lower().split() if text else []):
+                words.append(word)
+                rows.append(i)
+        matrix = np.zeros((len(texts), self.vector_size))
+        if words:
+            np.add.at(matrix, rows, np.stack([word_vector(word) for word in words]))
+            counts = np.bincount(rows, minlength=len(texts))
+            matrix /= np.maximum(counts, 1)[:, None]
+        if vector_size <= self.vector_size:
+            return matrix[:, :vector_size]
+        return np.pad(matrix, ((0, 0), (0, vector_size - self.vector_size)))
+
+    def _text_to_vector(self, text: str, vector_size: Optional[int] = None) -> List[float]:
+        return self._texts_to_matrix([text], vector_size)[0].tolist()
 
     def _get_location_vector(self, location: str) -> List[float]:
         if not location or location == "N/A":
             return [0.0, 0.0]
-        try:
-            if location not in self.location_cache:
-                loc = self.geolocator.geocode(location)
-                if loc:
-                    self.location_cache[location] = [loc.latitude / 90.0, loc.longitude / 180.0]
-                else:
-                    self.location_cache[location] = [0.0, 0.0]
-            return self.location_cache[location]
-        except Exception as e:
+        coords = self.gazetteer.lookup(location)
+        if coords is None:
             return [0.0, 0.0]
+        return [coords[0] / 90.0, coords[1] / 180.0]
 
     def extract_features(self, event: Event) -> List[float]:
-        features = []
-        for key in self.fixed_keys:
-            val = event.data.get(key, "")
-            if key == "date":
-                try:
-                    d = datetime.datetime.strptime(val, "%Y-%m-%d")
-                    features.extend([d.year / 3000.0, d.month / 12.0, d.day / 31.0])
-                except Exception as e:
-                    features.extend([0.0, 0.0, 0.0])
-            elif key == "time":
-                if val:
+        return self.extract_features_batch([event])[0]
+
+    def extract_features_batch(self, events: List[Event]) -> List[List[float]]:
+        texts = [event.data.get(key, "") for event in events for key in self.text_keys]
+        text_vectors = iter(self._texts_to_matrix(texts, self.key_vector_size).tolist())
+
+        batch = []
+        for event in events:
+            features = []
+            for key in self.fixed_keys:
+                val = event.data.get(key, "")
+                if key == "date":
                     try:
-                        t = datetime.datetime.strptime(val, "%H:%M")
-                        features.extend([t.hour / 24.0, t.minute / 60.0])
+                        d = datetime.datetime.strptime(val, "%Y-%m-%d")
+                        features.extend([d.year / 3000.0, d.month / 12.0, d.day / 31.0])
                     except Exception as e:
+                        features.extend([0.0, 0.0, 0.0])
+                elif key == "time":
+                    if val:
+                        try:
+                            t = datetime.datetime.strptime(val, "%H:%M")
+                            features.extend([t.hour / 24.0, t.minute / 60.0])
+                        except Exception as e:
+                            features.extend([0.0, 0.0])
+                    else:
                         features.extend([0.0, 0.0])
+                elif key in self.location_keys:
+                    features.extend(self._get_location_vector(val))
                 else:
-                    features.extend([0.0, 0.0])
-            elif key in ["location", "from_location", "to_location"]:
-                features.extend(self._get_location_vector(val))
-            else:
-                vec = self._text_to_vector(val, vector_size=self.key_vector_size)
-                features.extend(vec)
-        if len(features) < self.output_dim:
-            features.extend([0.0] * (self.output_dim - len(features)))
-        return features
+                    features.extend(next(text_vectors))
+            if len(features) < self.output_dim:
+                features.extend([0.0] * (self.output_dim - len(features)))
+            batch.append(features)
+        return batch
+
+class ReplayBuffer:
+    """ 고정 크기 numpy 배열에 (feature, target) 을 순환하며 저장한다. 가득 차면 가장 오래된 것부터 덮어쓴다 """
+
+    def __init__(self, capacity: int, feature_dim: int = 57, target_dim: int = 4):
+        self.capacity = capacity
+        self.features = np.zeros((capacity, feature_dim), dtype=np.float32)
+        self.targets = np.zeros((capacity, target_dim), dtype=np.float32)
+        self.position = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, features, targets):
+        features = np.asarray(features, dtype=np.float32)[-self.capacity:]
+        targets = np.asarray(targets, dtype=np.float32)[-self.capacity:]
+        indices = (self.position + np.arange(len(features))) % self.capacity
+        self.features[indices] = features
+        self.targets[indices] = targets
+        self.position = (self.position + len(features)) % self.capacity
+        self.size = min(self.capacity, self.size + len(features))
+
+    def sample(self, batch_size: int, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+        indices = rng.choice(self.size, size=min(batch_size, self.size), replace=False)
+        return self.features[indices], self.targets[indices]
 
 class GRPOModel(nn.Module):
     def __init__(self, total_input_dim=57, hidden_dim=32):
@@ -182,93 +259,144 @@ class GRPOModel(nn.Module):
         return outputs
 
 class GRPORecommendationAgent:
-    def __init__(self, window_days=30):
+    def __init__(self, window_days=30, model=None,
+                 feature_extractor: Optional[FeatureExtractor] = None, seed: Optional[int] = None):
         self.window_days = window_days
-        self.model = GRPOModel(total_input_dim=57, hidden_dim=32)
-        self.optimizer = optim.Adam(self.model.parameters(), lr=CONFIG["learning_rate"])
-        self.feature_extractor = FeatureExtractor()
+        self.seed = CONFIG["slot_seed"] if seed is None else seed
+        self.model = model if model is not None else GRPOModel(total_input_dim=57, hidden_dim=32)
+        self._optimizer = None
+        self.feature_extractor = feature_extractor if feature_extractor is not None else FeatureExtractor()
         self.used_coupons_global = set()
-        self.memory = []
+        self.memory = ReplayBuffer(CONFIG["memory_limit"])
+        self.rng = np.random.default_rng(seed)
+
+    @property
+    def optimizer(self) -> optim.Optimizer:
+        # 추론만 할 때는 필요 없으므로 학습할 때 만든다
+        if self._optimizer is None:
+            self._optimizer = optim.Adam(self.model.parameters(), lr=CONFIG["learning_rate"])
+        return self._optimizer
 
     def reset_used_coupons(self):
         self.used_coupons_global = set()
 
     def compute_recommended_time(self, coupon: Event, fixed_events: List[Event]) -> str:
-        start_range = 9 * 60    # 09:00 -> 540분
-        end_range = 21 * 60     # 21:00 -> 1260분
-        candidate_times = list(range(start_range, end_range + 1, 15))
-        
-        forbidden_intervals = []
-        for event in fixed_events:
-            if event.time:
-                try:
-                    t = datetime.datetime.strptime(event.time, "%H:%M")
-                    fixed_minutes = t.hour * 60 + t.minute
-                    forbidden_start = max(start_range, fixed_minutes - 120)
-                    forbidden_end = min(end_range, fixed_minutes + 120)
-                    forbidden_intervals.append((forbidden_start, forbidden_end))
-                except Exception:
-                    continue
-        
-        allowed_candidates = []
-        for cand in candidate_times:
-            conflict = False
-            for (fstart, fend) in forbidden_intervals:
-                if fstart <= cand <= fend:
-                    conflict = True
-                    break
-            if not conflict:
-                allowed_candidates.append(cand)
-        
-        if allowed_candidates:
-            chosen = random.choice(allowed_candidates)
-        else:
-            chosen = random.choice(candidate_times)
+        return self._choose_time(self._allowed_times(fixed_events), coupon)
+
+    @staticmethod
+    def _allowed_times(fixed_events: List[Event]) -> List[int]:
+        return free_slots([event.minutes for event in fixed_events if event.minutes is not None])
+
+    def _choose_time(self, allowed_times: List[int], coupon: Event) -> str:
+        # 같은 쿠폰은 요청/워커가 달라도 같은 시간을 받도록 seed 와 쿠폰으로 고른다 (전역 random 미사용)
+        key = f"{self.seed}|{coupon.title}|{coupon.date.isoformat()}".encode("utf-8")
+        index = int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big") % len(allowed_times)
+        chosen = allowed_times[index]
         new_hour = chosen // 60
         new_minute = chosen % 60
         return f"{new_hour:02d}:{new_minute:02d}"
 
     def recommend(self, valid_coupons: List[Event], fixed_events: List[Event],
                   base_date: datetime.date, end_date: datetime.date) -> List[Dict]:
-        recommendations = []
+        coupons = self._select_coupons(valid_coupons, base_date, self.used_coupons_global)
+        return self._recommend_batch([(coupons, fixed_events)], base_date)[0]
+
+    def recommend_many(self, requests: List[tuple], base_date: datetime.date,
+                       end_date: datetime.date) -> List[List[Dict]]:
+        """ 여러 사용자의 (쿠폰, 고정 일정) 을 한 번의 forward 로 추천한다. 사용한 쿠폰 이름은 사용자마다 따로 본다 """
+        return self._recommend_batch(
+            [(self._select_coupons(valid_coupons, base_date, set()), fixed_events)
+             for valid_coupons, fixed_events in requests],
+            base_date,
+        )
+
+    @staticmethod
+    def _select_coupons(valid_coupons: List[Event], base_date: datetime.date, used_titles: set) -> List[Event]:
+        coupons = []
         for coupon in valid_coupons:
-            if coupon.title in self.used_coupons_global:
+            if coupon.title in used_titles:
                 continue
-            days_remaining = (coupon.date - base_date).days
-            if days_remaining <= 0:
+            if (coupon.date - base_date).days <= 0:
                 continue
-            features = self.feature_extractor.extract_features(coupon)
-            feat_tensor = torch.tensor(features, dtype=torch.float32).unsqueeze(0)
+            coupons.append(coupon)
+            used_titles.add(coupon.title)
+        return coupons
+
+    def _recommend_batch(self, requests: List[tuple], base_date: datetime.date) -> List[List[Dict]]:
+        all_coupons = [coupon for coupons, _ in requests for coupon in coupons]
+        if not all_coupons:
+            return [[] for _ in requests]
+
+        # 쿠폰 전체를 한 번의 forward 로 평가하고, 정렬도 배열 연산으로 한다
+        features = self.feature_extractor.extract_features_batch(all_coupons)
+        outputs = self._forward(features)
+        scores = outputs.mean(axis=1)
+        orders = []
+        offset = 0
+        for coupons, _ in requests:
+            order = np.argsort(-scores[offset:offset + len(coupons)], kind="stable")
+            orders.append((order + offset).tolist())
+            offset += len(coupons)
+        predicted = outputs.tolist()
+        scores = scores.tolist()
+
+        results = []
+        offset = 0
+        for (coupons, fixed_events), order in zip(requests, orders):
+            times = self._recommended_times(coupons, fixed_events)
+            recommendations = []
+            for i in order:
+                coupon = coupons[i - offset]
+                recommendations.append({
+                    "type": "추천 일정",
+                    "coupon": coupon.title,
+                    "time": times[i - offset],
+                    "date": coupon.date,
+                    "brand": coupon.data.get("brand", ""),
+                    "coupon_type": coupon.data.get("type", ""),
+                    "predicted_value": scores[i],
+                    "predicted_criteria": predicted[i],
+                    "days_remaining": (coupon.date - base_date).days,
+                    "features": features[i]
+                })
+            results.append(recommendations)
+            offset += len(coupons)
+        return results
+
+    def _forward(self, features: List[List[float]]) -> np.ndarray:
+        """ torch 모델과 NumPy 런타임(utils.reco_runtime) 모두 (쿠폰 수, 4) 배열을 돌려준다 """
+        if isinstance(self.model, nn.Module):
             with torch.no_grad():
-                predicted_values = self.model(feat_tensor).squeeze(0).tolist()
-            fixed_for_coupon = [fe for fe in fixed_events if fe.date == coupon.date and fe.time]
-            recommended_time = self.compute_recommended_time(coupon, fixed_for_coupon)
-            recommendations.append({
-                "type": "추천 일정",
-                "coupon": coupon.title,
-                "time": recommended_time,
-                "date": coupon.date,
-                "brand": coupon.data.get("brand", ""),
-                "coupon_type": coupon.data.get("type", ""),
-                "predicted_value": sum(predicted_values) / len(predicted_values),
-                "predicted_criteria": predicted_values,
-                "days_remaining": days_remaining,
-                "features": features
-            })
-            self.used_coupons_global.add(coupon.title)
-        recommendations = sorted(recommendations, key=lambda x: x["predicted_value"], reverse=True)
-        return recommendations
+                return self.model(torch.tensor(features, dtype=torch.float32)).numpy()
+        return np.asarray(self.model(features), dtype=np.float32)
+
+    def _recommended_times(self, coupons: List[Event], fixed_events: List[Event]) -> List[str]:
+        # 고정 일정은 날짜별 분 단위로 한 번만 모으고, 빈 시간대도 쿠폰 날짜마다 한 번만 계산한다
+        minutes_by_date = {}
+        for event in fixed_events:
+            if event.minutes is not None:
+                minutes_by_date.setdefault(event.date, []).append(event.minutes)
+        allowed_by_date = {}
+        times = []
+        for coupon in coupons:
+            if coupon.date not in allowed_by_date:
+                allowed_by_date[coupon.date] = free_slots(minutes_by_date.get(coupon.date, []))
+            times.append(self._choose_time(allowed_by_date[coupon.date], coupon))
+        return times
 
     def train(self, features: List[float], target: List[float]):
-        self.memory.append((features, target))
-        if len(self.memory) > CONFIG["memory_limit"]:
-            self.memory.pop(0)
+        self.memory.add([features], [target])
         if len(self.memory) < CONFIG["batch_size"]:
             return
-        mini_batch = random.sample(self.memory, CONFIG["batch_size"])
-        batch_features = torch.tensor([x for x, _ in mini_batch], dtype=torch.float32)
-        batch_targets = torch.tensor([t for _, t in mini_batch], dtype=torch.float32)
-        
+        self.update(CONFIG["batch_size"])
+
+    def update(self, batch_size: int, verbose: bool = True) -> float:
+        """ replay buffer 에서 batch_size 개를 뽑아 한 번 학습하고 loss 를 돌려준다 """
+        features, targets = self.memory.sample(batch_size, self.rng)
+        batch_features = torch.from_numpy(features)
+        batch_targets = torch.from_numpy(targets)
+
+        self.model.train()
         self.optimizer.zero_grad()
         outputs = self.model(batch_features)
         exploration_std = 0.01
@@ -278,7 +406,10 @@ class GRPORecommendationAgent:
         loss = torch.mean(((outputs_noisy - batch_targets) ** 2) * weight_tensor)
         loss.backward()
         self.optimizer.step()
-        
+        if not verbose:
+            return loss.item()
+
+        outputs = outputs.detach()
         baseline = batch_targets.mean(dim=0)
         advantage = batch_targets - baseline
         rmse = torch.sqrt(torch.mean((outputs - batch_targets) ** 2, dim=0))
@@ -288,6 +419,7 @@ class GRPORecommendationAgent:
         logger.info(f"Mini-batch update: Loss={loss.item():.4f}, Overall RMSE={overall_rmse.item():.4f}, Overall MAE={overall_mae.item():.4f}")
         logger.info(f"Criterion-wise RMSE: {rmse.tolist()}, MAE: {mae.tolist()}")
         logger.info(f"Baseline: {baseline.tolist()}, Mean Advantage: {advantage.mean(dim=0).tolist()}")
+        return loss.item()
 
     def save(self, model_path: str):
         torch.save(self.model.state_dict(), model_path)
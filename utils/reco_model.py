@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+
+import torch
+
+from config import get_settings
+from utils.reco3 import FeatureExtractor, GRPOModel
+from utils.reco_runtime import NumpyGRPOModel, checkpoint_digest, exported_checkpoint_digest, numpy_model_path
+from utils.logger import logger
+
+
+settings = get_settings()
+
+
+class RecommendationModel:
+    """
+    프로세스 전체에서 공유하는 추천 모델 (eval 모드, optimizer 없음).
+
+    처음 사용할 때 한 번만 체크포인트를 읽고, 이후에는 check_interval_seconds 마다
+    파일의 mtime 을 확인해서 바뀌었으면 새 모델을 만들어 교체한다.
+    읽기에 실패하면 기존 모델을 그대로 쓴다.
+
+    runtime 이 numpy 이면 체크포인트 옆의 .npz (python -m utils.reco_runtime 으로 생성) 를
+    NumpyGRPOModel 로 읽는다. .npz 가 없거나 다른 체크포인트에서 만들어졌으면 torch 체크포인트를 쓴다.
+    """
+
+    def __init__(
+            self,
+            model_path: str | None = None,
+            check_interval_seconds: float | None = None,
+            runtime: str | None = None,
+    ):
+        self.model_path = model_path or settings.recommendation_model_path
+        self.runtime = runtime or settings.recommendation_runtime
+        self.check_interval_seconds = (
+            settings.recommendation_model_check_interval_seconds
+            if check_interval_seconds is None else check_interval_seconds
+        )
+        self.feature_extractor = FeatureExtractor()
+        self.model = None
+        self.loaded_mtime = None
+        self.checked_at = 0.0
+        self.checkpoint_digest = None
+        self.checkpoint_digest_key = None
+        self.lock = threading.Lock()
+
+    def get(self) -> GRPOModel | NumpyGRPOModel:
+        now = time.monotonic()
+        if self.model is None or now - self.checked_at >= self.check_interval_seconds:
+            with self.lock:
+                if self.model is None or now - self.checked_at >= self.check_interval_seconds:
+                    self._reload_if_changed()
+                    self.checked_at = now
+        return self.model
+
+    def _artifact_path(self) -> str:
+        # .npz 가 지금 체크포인트에서 export 된 것일 때만 쓴다 (다시 학습된 뒤 export 하지 않았으면 체크포인트)
+        if self.runtime == "numpy":
+            numpy_path = numpy_model_path(self.model_path)
+            try:
+                if exported_checkpoint_digest(numpy_path) == self._checkpoint_digest():
+                    return numpy_path
+            except Exception as e:
+                if os.path.exists(numpy_path):
+                    logger.error(f"Failed to read recommendation model {numpy_path}: {e}")
+        return self.model_path
+
+    def _checkpoint_digest(self) -> str:
+        stat = os.stat(self.model_path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        if self.checkpoint_digest_key != key:
+            self.checkpoint_digest = checkpoint_digest(self.model_path)
+            self.checkpoint_digest_key = key
+        return self.checkpoint_digest
+
+    def _reload_if_changed(self):
+        path = self._artifact_path()
+        try:
+            mtime = (path, os.stat(path).st_mtime_ns)
+        except FileNotFoundError:
+            mtime = None
+        if self.model is not None and mtime == self.loaded_mtime:
+            return
+
+        model = None
+        if mtime is not None:
+            try:
+                model = self._load(path)
+                logger.info(f"Loaded recommendation model from {path}")
+            except Exception as e:
+                logger.error(f"Failed to load recommendation model {path}: {e}")
+                if self.model is not None:
+                    return
+        if model is None:
+            model = GRPOModel(total_input_dim=57, hidden_dim=32).eval()
+        self.model = model
+        self.loaded_mtime = mtime
+
+    @staticmethod
+    def _load(path: str) -> GRPOModel | NumpyGRPOModel:
+        if path.endswith(".npz"):
+            return NumpyGRPOModel.load(path)
+        model = GRPOModel(total_input_dim=57, hidden_dim=32)
+        state_dict = torch.load(path, map_location="cpu", weights_only=True)
+        # 키가 맞지 않는 체크포인트는 읽기 실패로 보고 기존 모델을 유지한다 (일부만 초기화된 모델을 서빙하지 않는다)
+        model.load_state_dict(state_dict, strict=True)
+        return model.eval()
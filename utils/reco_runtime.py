@@ -0,0 +1,122 @@
+"""
+GRPOModel 의 NumPy 추론 런타임과 export 명령.
+
+학습된 체크포인트(.pth)의 가중치를 .npz 로 내보내고, 같은 forward 를 NumPy 로 계산한다.
+추론에는 torch 가 필요 없고 autograd/optimizer 상태도 만들지 않는다.
+
+    python -m utils.reco_runtime --checkpoint models/grpo_recommendation_model.pth
+"""
+import argparse
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+
+
+LAYER_NORM_EPS = 1e-5
+COUPON_INPUT_DIM = 28
+ENCODERS = ("coupon_encoder", "fixed_encoder", "combined_layer")
+HEADS = ("out_date", "out_time", "out_schedule", "out_weekday")
+PARAMETER_NAMES = tuple(
+    f"{encoder}.{layer}.{kind}" for encoder in ENCODERS for layer in (0, 2) for kind in ("weight", "bias")
+) + tuple(f"{head}.{kind}" for head in HEADS for kind in ("weight", "bias"))
+CHECKPOINT_DIGEST_KEY = "checkpoint_sha256"
+
+
+def numpy_model_path(checkpoint_path: str) -> str:
+    return str(Path(checkpoint_path).with_suffix(".npz"))
+
+
+def checkpoint_digest(checkpoint_path: str) -> str:
+    with open(checkpoint_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def exported_checkpoint_digest(numpy_path: str) -> str | None:
+    """ .npz 를 만든 체크포인트의 sha256 """
+    with np.load(numpy_path) as weights:
+        return str(weights[CHECKPOINT_DIGEST_KEY]) if CHECKPOINT_DIGEST_KEY in weights else None
+
+
+class NumpyGRPOModel:
+    """ GRPOModel(eval 모드) 과 같은 계산을 하는 NumPy 구현 """
+
+    def __init__(self, weights: dict[str, np.ndarray]):
+        missing = [name for name in PARAMETER_NAMES if name not in weights]
+        if missing:
+            raise ValueError(f"Missing GRPOModel parameters: {missing}")
+        self.weights = {name: np.asarray(weights[name], dtype=np.float32) for name in PARAMETER_NAMES}
+        # 네 개의 출력 head 는 하나의 행렬곱으로 계산한다
+        self.head_weight = np.concatenate([self.weights[f"{head}.weight"] for head in HEADS]).T
+        self.head_bias = np.concatenate([self.weights[f"{head}.bias"] for head in HEADS])
+
+    @classmethod
+    def load(cls, path: str) -> "NumpyGRPOModel":
+        with np.load(path) as weights:
+            return cls(dict(weights))
+
+    def __call__(self, features) -> np.ndarray:
+        x = np.asarray(features, dtype=np.float32)
+        coupon = self._encode("coupon_encoder", x[:, :COUPON_INPUT_DIM])
+        fixed = self._encode("fixed_encoder", x[:, COUPON_INPUT_DIM:])
+        combined = self._encode("combined_layer", np.concatenate([coupon, fixed], axis=1))
+        return combined @ self.head_weight + self.head_bias
+
+    def _encode(self, name: str, x: np.ndarray) -> np.ndarray:
+        # Linear -> ReLU -> LayerNorm (Dropout 은 eval 에서 항등)
+        x = np.maximum(x @ self.weights[f"{name}.0.weight"].T + self.weights[f"{name}.0.bias"], 0)
+        mean = x.mean(axis=1, keepdims=True)
+        var = x.var(axis=1, keepdims=True)
+        x = (x - mean) / np.sqrt(var + LAYER_NORM_EPS)
+        return x * self.weights[f"{name}.2.weight"] + self.weights[f"{name}.2.bias"]
+
+
+def export_numpy(checkpoint_path: str, output_path: str | None = None) -> str:
+    """ 체크포인트를 strict 하게 읽어 .npz 로 저장한다 (체크포인트 sha256 포함). 파일은 임시 파일에 쓰고 교체한다 """
+    import torch
+    from utils.reco3 import GRPOModel
+
+    model = GRPOModel(total_input_dim=57, hidden_dim=32)
+    model.load_state_dict(torch.load(checkpoint_path, map_location="cpu", weights_only=True), strict=True)
+    output_path = output_path or numpy_model_path(checkpoint_path)
+    tmp_path = f"{output_path}.tmp.npz"
+    np.savez(
+        tmp_path,
+        **{name: tensor.detach().cpu().numpy() for name, tensor in model.state_dict().items()},
+        **{CHECKPOINT_DIGEST_KEY: np.array(checkpoint_digest(checkpoint_path))},
+    )
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def max_abs_difference(checkpoint_path: str, numpy_path: str, samples: int = 256, seed: int = 0) -> float:
+    """ 임의의 입력에서 torch 모델과 NumPy 모델의 출력 차이 """
+    import torch
+    from utils.reco3 import GRPOModel
+
+    model = GRPOModel(total_input_dim=57, hidden_dim=32)
+    model.load_state_dict(torch.load(checkpoint_path, map_location="cpu", weights_only=True), strict=True)
+    model.eval()
+    features = np.random.default_rng(seed).uniform(-1, 1, size=(samples, 57)).astype(np.float32)
+    with torch.inference_mode():
+        expected = model(torch.from_numpy(features)).numpy()
+    return float(np.abs(NumpyGRPOModel.load(numpy_path)(features) - expected).max())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export GRPOModel weights for the NumPy runtime")
+    parser.add_argument("--checkpoint", default="models/grpo_recommendation_model.pth")
+    parser.add_argument("--output")
+    parser.add_argument("--tolerance", type=float, default=1e-5)
+    args = parser.parse_args()
+
+    output_path = export_numpy(args.checkpoint, args.output)
+    difference = max_abs_difference(args.checkpoint, output_path)
+    print(f"Exported {output_path} (max abs difference {difference:.2e})")
+    if difference > args.tolerance:
+        raise SystemExit(f"NumPy runtime differs from torch model by {difference} > {args.tolerance}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import asyncio
+import os
+import shutil
+import time
+import uuid
+from typing import BinaryIO
+from fastapi import HTTPException
+from fastapi_utilities import repeat_every
+from config import get_settings
+from utils.logger import logger
+
+
+settings = get_settings()
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class ScratchSpace:
+    """
+    요청마다 scratch_root 아래에 고유한 디렉터리를 만들어 업로드 파일을 저장한다.
+    같은 이름의 파일이 동시에 올라와도 서로 덮어쓰지 않고, 디렉터리 단위로 정리한다.
+
+        with ScratchSpace() as scratch:
+            file_path = scratch.save_upload(file.file, file.filename)
+    """
+
+    def __init__(self, root: str | None = None, max_bytes: int | None = None):
+        self.id = uuid.uuid4().hex
+        self.path = os.path.join(root or settings.scratch_root, self.id)
+        self.max_bytes = max_bytes or settings.scratch_max_bytes
+        self.used_bytes = 0
+        os.makedirs(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cleanup()
+
+    def save_upload(self, file: BinaryIO, filename: str | None) -> str:
+        """ 파일을 스트림으로 복사하면서 용량 제한(요청 단위)을 넘으면 413 """
+        file_path = self._unique_path(filename)
+        with open(file_path, "wb") as buffer:
+            while chunk := file.read(CHUNK_SIZE):
+                self.used_bytes += len(chunk)
+                if self.used_bytes > self.max_bytes:
+                    raise HTTPException(status_code=413, detail=f"Upload too large (max {self.max_bytes} bytes)")
+                buffer.write(chunk)
+        return file_path
+
+    def cleanup(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def _unique_path(self, filename: str | None) -> str:
+        # 경로 조작을 막기 위해 파일 이름만 사용한다
+        name = os.path.basename(filename or "") or "upload"
+        file_path = os.path.join(self.path, name)
+        counter = 1
+        while os.path.exists(file_path):
+            stem, ext = os.path.splitext(name)
+            file_path = os.path.join(self.path, f"{stem}_{counter}{ext}")
+            counter += 1
+        return file_path
+
+
+def sweep_scratch_root(root: str | None = None, max_age_seconds: int | None = None) -> int:
+    """ 정리되지 않고 남은 오래된 scratch 디렉터리를 지운다 """
+    root = root or settings.scratch_root
+    max_age_seconds = max_age_seconds or settings.scratch_max_age_seconds
+    if not os.path.isdir(root):
+        return 0
+
+    removed = 0
+    cutoff = time.time() - max_age_seconds
+    for entry in os.scandir(root):
+        try:
+            if entry.stat().st_mtime >= cutoff:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.remove(entry.path)
+            removed += 1
+        except OSError as e:
+            logger.error(f"Failed to sweep scratch entry {entry.path}: {e}")
+    return removed
+
+
+@repeat_every(seconds=10 * 60, logger=logger)
+async def sweep_scratch_space():
+    removed = await asyncio.to_thread(sweep_scratch_root)
+    if removed:
+        print(f"🧹 Swept {removed} stale scratch entries.")